@@ -0,0 +1,144 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Iterator
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AbstractBaseUser
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.http import HttpRequest, HttpResponse
+from django.urls import URLPattern
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from users.authentication import ClaimsJWTAuthentication
+
+AsyncView = Callable[..., Awaitable[HttpResponse | None]]
+
+DATABASE_SLOTS = asyncio.Semaphore(settings.ASYNC_DB_CONCURRENCY)
+
+
+@asynccontextmanager
+async def database_slot() -> AsyncIterator[None]:
+    """
+    Bound the number of requests of this process using the database at once.
+
+    Each ASGI request gets its own database connection, so without a bound
+    a burst of clients exhausts the server's connection limit. The
+    connection is released before the slot is, keeping the number of
+    open connections within ASYNC_DB_CONCURRENCY.
+    """
+    async with DATABASE_SLOTS:
+        try:
+            yield
+        finally:
+            await sync_to_async(close_old_connections)()
+
+
+def accepts_json(request: HttpRequest) -> bool:
+    """
+    Return True if DRF content negotiation would pick the JSON renderer.
+    """
+    return 'format' not in request.GET and 'text/html' not in request.headers.get('Accept', '')
+
+
+async def authenticate(request: HttpRequest) -> AbstractBaseUser | None:
+    """
+    Return the user authenticated by the request's JWT, or None.
+
+    Mirrors ClaimsJWTAuthentication for GETs: tokens carrying the user
+    claims are resolved without I/O. None covers anonymous requests and
+    invalid credentials alike; the caller then hands the request to the
+    DRF view, which builds the proper error response.
+    """
+    authentication = ClaimsJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+        user = authentication.get_claims_user(token)
+        if user is None:
+            async with database_slot():
+                user = await sync_to_async(authentication.get_user)(token)
+        return user
+    except exceptions.APIException:
+        return None
+
+
+def json_response(data: dict | list | None, status: int = 200, headers: dict | None = None) -> HttpResponse:
+    """
+    Render data exactly like a DRF JSON response.
+    """
+    body = JSONRenderer().render(data) if data is not None else b''
+    return HttpResponse(body, status=status, headers=headers, content_type='application/json')
+
+
+def cached_json_response(request: HttpRequest, entry: dict) -> HttpResponse:
+    """
+    Serve a response cache entry, answering If-None-Match with 304.
+    """
+    headers = {'ETag': entry['etag']}
+    if request.headers.get('If-None-Match') == entry['etag']:
+        return json_response(None, status=304, headers=headers)
+    return json_response(entry['data'], headers=headers)
+
+
+def streaming_content(request: HttpRequest, chunks: Iterator) -> Iterator | AsyncIterator:
+    """
+    Return chunks in the form the serving handler streams without buffering.
+
+    The ASGI handler reads a synchronous iterator to the end before
+    sending anything, so under ASGI the chunks are pulled one at a time in
+    the request's worker thread, where its database connection lives.
+    """
+    if not isinstance(request, ASGIRequest):
+        return chunks
+
+    async def pull() -> AsyncIterator:
+        next_chunk = sync_to_async(next)
+        done = object()
+        while (chunk := await next_chunk(chunks, done)) is not done:
+            yield chunk
+
+    return pull()
+
+
+def async_read_view(async_view: AsyncView, sync_view: Callable[..., HttpResponse]) -> AsyncView:
+    """
+    Serve JSON GETs with async_view and every other request with the DRF view.
+
+    async_view returns None for requests it does not handle (anonymous,
+    cache miss of a list, missing object, ...), which then fall through
+    to the DRF view running in a worker thread. async_view takes a
+    database slot around its own queries; the DRF view runs in one.
+    """
+    sync_fallback = sync_to_async(sync_view)
+
+    @csrf_exempt
+    async def view(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        if request.method == 'GET' and 'format' not in kwargs and accepts_json(request):
+            response = await async_view(request, *args, **kwargs)
+            if response is not None:
+                return response
+        async with database_slot():
+            return await sync_fallback(request, *args, **kwargs)
+
+    return view
+
+
+def with_async_reads(urlpatterns: list, async_views: dict[str, AsyncView]) -> list:
+    """
+    Wrap the router URL patterns named in async_views with async_read_view.
+    """
+    return [
+        URLPattern(
+            pattern.pattern,
+            async_read_view(async_views[pattern.name], pattern.callback),
+            pattern.default_args,
+            pattern.name,
+        )
+        if isinstance(pattern, URLPattern) and pattern.name in async_views else pattern
+        for pattern in urlpatterns
+    ]
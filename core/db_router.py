@@ -0,0 +1,158 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.models import Model
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+STICKY_KEY = 'db:sticky:{user_id}'
+
+# Alias of the replica the current request reads from; None reads the primary
+read_alias: ContextVar[str | None] = ContextVar('read_alias', default=None)
+
+# Monotonic time until which each unreachable replica is skipped, per process
+_replica_down_until: dict[str, float] = {}
+
+
+def replica_aliases() -> list[str]:
+    """
+    Return the aliases of the configured read replicas.
+    """
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+def pick_replica() -> str | None:
+    """
+    Return a random reachable replica, or None to read from the primary.
+
+    The replica's connection is health checked and opened here, before
+    the request's first query, so a replica that is down costs one failed
+    connect and is then skipped for REPLICA_RETRY_AFTER seconds.
+    """
+    now = time.monotonic()
+    replicas = [alias for alias in replica_aliases() if _replica_down_until.get(alias, 0) <= now]
+    random.shuffle(replicas)
+    for alias in replicas:
+        connection = connections[alias]
+        try:
+            connection.close_if_health_check_failed()
+            connection.ensure_connection()
+        except DatabaseError:
+            _replica_down_until[alias] = now + settings.REPLICA_RETRY_AFTER
+            continue
+        return alias
+    return None
+
+
+def mirror_replicas() -> None:
+    """
+    Point every replica at the primary's database, as the test runner
+    does for TEST MIRROR, so benchmarks in a test database read from it.
+    """
+    for alias in replica_aliases():
+        connections[alias].close()
+        connections[alias].creation.set_as_test_mirror(connections[DEFAULT_DB_ALIAS].settings_dict)
+
+
+@contextmanager
+def reads_from(alias: str | None) -> Iterator[None]:
+    """
+    Route the reads made inside the block to alias (None for the primary).
+    """
+    token = read_alias.set(alias)
+    try:
+        yield
+    finally:
+        read_alias.reset(token)
+
+
+def stick_to_primary(user_id: int) -> None:
+    """
+    Keep a user's reads on the primary for REPLICA_STICKY_SECONDS.
+    """
+    cache.set(STICKY_KEY.format(user_id=user_id), True, timeout=settings.REPLICA_STICKY_SECONDS)
+
+
+def is_sticky(user_id: int) -> bool:
+    """
+    Return True if the user wrote recently enough to read from the primary.
+    """
+    return cache.get(STICKY_KEY.format(user_id=user_id)) is not None
+
+
+class ReplicaRouter:
+    """
+    Send the reads of ReplicaReadsMixin requests to their replica and
+    everything else to the primary.
+
+    Reads outside such requests are routed to the primary explicitly, so
+    an instance loaded from a replica never pulls its relations from it.
+    """
+    def db_for_read(self, model: type[Model], **hints) -> str:
+        """
+        Return the replica of the current request, or the primary.
+        """
+        return read_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model: type[Model], **hints) -> str:
+        """
+        Send every write to the primary.
+        """
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints) -> bool:
+        """
+        Allow relations between rows of any alias: they are one database.
+        """
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, model_name: str | None = None, **hints) -> bool:
+        """
+        Only migrate the primary; replicas follow it.
+        """
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaReadsMixin:
+    """
+    Serve the safe requests of a view set from a read replica.
+
+    A user's successful writes through such view sets (register, cancel,
+    profile updates, ...) keep their reads on the primary for
+    REPLICA_STICKY_SECONDS, so they see their own changes at once.
+    """
+    def initial(self, request: Request, *args, **kwargs) -> None:
+        """
+        Pick the request's replica once it is authenticated.
+        """
+        super().initial(request, *args, **kwargs)
+        if request.method not in SAFE_METHODS or not replica_aliases():
+            return
+        if request.user.is_authenticated and is_sticky(request.user.id):
+            return
+        alias = pick_replica()
+        if alias is not None:
+            self.replica_token = read_alias.set(alias)
+
+    def finalize_response(self, request: Request, response: Response, *args, **kwargs) -> Response:
+        """
+        Restore primary reads and make a writing user sticky.
+        """
+        token = getattr(self, 'replica_token', None)
+        if token is not None:
+            read_alias.reset(token)
+            self.replica_token = None
+        if (
+            response.status_code < 400
+            and request.method not in SAFE_METHODS
+            and replica_aliases()
+            and request.user.is_authenticated
+        ):
+            stick_to_primary(request.user.id)
+        return super().finalize_response(request, response, *args, **kwargs)
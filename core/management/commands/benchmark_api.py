@@ -0,0 +1,245 @@
+import json
+import random
+import time
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from core.db_router import mirror_replicas
+from core.middleware import RequestMetrics
+from event_management.celery import app as celery_app
+from events.models import Event, EventRegistration
+from events.seeding import TOPICS, seed_events, seed_users
+from users.serializers import CustomTokenObtainPairSerializer
+from users.tokens import outstanding_tokens
+
+User = get_user_model()
+
+# (name, weight, method, path) of the replayed traffic. Paths are filled
+# with the user, an event, an event organized by the user and one of the
+# user's registrations.
+SCENARIOS = [
+    ('events.list', 20, 'get', '/api/events/'),
+    ('events.list_cursor', 10, 'get', '/api/events/?pagination=cursor'),
+    ('events.filter', 8, 'get', '/api/events/?upcoming=true&has_available_seats=true&pagination=cursor'),
+    ('events.search', 6, 'get', '/api/events/?q={topic}&pagination=cursor'),
+    ('events.detail', 20, 'get', '/api/events/{event}/'),
+    ('events.registrations', 4, 'get', '/api/events/{own_event}/registrations/?pagination=cursor'),
+    ('events.register', 4, 'post', '/api/events/{event}/register/'),
+    ('registrations.list', 12, 'get', '/api/registrations/'),
+    ('registrations.detail', 4, 'get', '/api/registrations/{registration}/'),
+    ('registrations.cancel', 2, 'post', '/api/registrations/{registration}/cancel/'),
+    ('users.me', 8, 'get', '/api/users/me/'),
+    ('users.list', 2, 'get', '/api/users/'),
+    ('users.refresh', 4, 'post', '/api/token/refresh/'),
+]
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    Return the nearest-rank percentile of values.
+    """
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    """
+    Seed a throwaway database, replay API traffic and compare the results with a baseline.
+    """
+    help = (
+        'Seed a test database, replay a weighted mix of API requests in-process and report '
+        'p50/p99 latency, throughput and query counts per endpoint.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument('--users', type=int, default=2000, help='Number of seeded users.')
+        parser.add_argument('--events', type=int, default=5000, help='Number of seeded events.')
+        parser.add_argument(
+            '--registrations-per-event', type=int, default=20,
+            help='Registrations seeded per event.'
+        )
+        parser.add_argument('--requests', type=int, default=2000, help='Number of measured requests.')
+        parser.add_argument('--warmup', type=int, default=200, help='Requests replayed before measuring.')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed of the traffic.')
+        parser.add_argument('--output', help='Write the results as JSON to this file.')
+        parser.add_argument('--baseline', help='Fail if the results regress from this JSON file.')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.5,
+            help='Allowed relative slowdown of p50 latency and throughput against the baseline.'
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Run the benchmark in a test database that is destroyed afterwards.
+        """
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        mirror_replicas()
+        eager = celery_app.conf.task_always_eager
+        celery_app.conf.task_always_eager = True
+        try:
+            # Outstanding tokens are flushed by count only, so query counts do not depend on speed
+            with override_settings(
+                ALLOWED_HOSTS=['*'],
+                EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+                TOKEN_WRITE_INTERVAL=3600,
+            ):
+                results = self.run_benchmark(options)
+        finally:
+            celery_app.conf.task_always_eager = eager
+            outstanding_tokens.flush()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+                output.write('\n')
+        if options['baseline']:
+            self.compare(results, options['baseline'], options['tolerance'])
+
+    def run_benchmark(self, options: dict) -> dict:
+        """
+        Seed the data, replay the traffic and return the measurements.
+        """
+        self.stdout.write('Seeding...')
+        first_user, last_user = seed_users(options['users'])
+        seed_events(options['events'], options['registrations_per_event'], (first_user, last_user))
+        cache.clear()
+
+        rng = random.Random(options['seed'])
+        clients = {}
+        refresh_tokens = {}
+        names = [scenario[0] for scenario in SCENARIOS]
+        weights = [scenario[1] for scenario in SCENARIOS]
+        scenarios = {scenario[0]: scenario for scenario in SCENARIOS}
+        event_ids = Event.objects.order_by('id').values_list('id', flat=True)
+        first_event, last_event = event_ids.first(), event_ids.last()
+
+        def client_for(user_id: int) -> APIClient:
+            client = clients.get(user_id)
+            if client is None:
+                client = clients[user_id] = APIClient()
+                refresh = CustomTokenObtainPairSerializer.get_token(User.objects.get(id=user_id))
+                refresh_tokens[user_id] = str(refresh)
+                client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+            return client
+
+        def build_request(name: str) -> tuple[int, APIClient, str, str, dict | None]:
+            _, _, method, path = scenarios[name]
+            user_id = rng.randint(first_user, last_user)
+            client = client_for(user_id)
+            data = {'refresh': refresh_tokens[user_id]} if name == 'users.refresh' else None
+            params = {'event': rng.randint(first_event, last_event), 'topic': rng.choice(TOPICS).split()[0]}
+            if '{own_event}' in path:
+                params['own_event'] = Event.objects.filter(organizer_id=user_id).values_list('id', flat=True).first() or first_event
+            if '{registration}' in path:
+                registration_ids = list(EventRegistration.objects.filter(user_id=user_id).values_list('id', flat=True)[:50])
+                params['registration'] = rng.choice(registration_ids) if registration_ids else 0
+            return user_id, client, method, path.format(**params), data
+
+        samples = {name: {'latency': [], 'queries': [], 'errors': 0} for name in names}
+        self.stdout.write(f'Replaying {options["warmup"]} warm-up and {options["requests"]} measured requests...')
+        elapsed = 0.0
+        for index in range(options['warmup'] + options['requests']):
+            name = rng.choices(names, weights)[0]
+            user_id, client, method, url, data = build_request(name)
+            request_metrics = RequestMetrics()
+            with connection.execute_wrapper(request_metrics):
+                start = time.perf_counter()
+                response = getattr(client, method)(url, data)
+                duration = time.perf_counter() - start
+            if name == 'users.refresh' and response.status_code == 200:
+                refresh_tokens[user_id] = response.data['refresh']
+            if index < options['warmup']:
+                continue
+            elapsed += duration
+            sample = samples[name]
+            sample['latency'].append(duration * 1000)
+            sample['queries'].append(request_metrics.queries)
+            if response.status_code >= 500:
+                sample['errors'] += 1
+
+        endpoints = {
+            name: {
+                'requests': len(sample['latency']),
+                'p50_ms': round(percentile(sample['latency'], 0.50), 3),
+                'p99_ms': round(percentile(sample['latency'], 0.99), 3),
+                'mean_queries': round(sum(sample['queries']) / len(sample['queries']), 2),
+                'max_queries': max(sample['queries']),
+                'errors': sample['errors'],
+            }
+            for name, sample in samples.items() if sample['latency']
+        }
+        return {
+            'config': {
+                'vendor': connection.vendor,
+                'users': options['users'],
+                'events': options['events'],
+                'registrations_per_event': options['registrations_per_event'],
+                'requests': options['requests'],
+                'seed': options['seed'],
+            },
+            'throughput_rps': round(options['requests'] / elapsed, 1),
+            'endpoints': endpoints,
+        }
+
+    def report(self, results: dict) -> None:
+        """
+        Print the per-endpoint measurements.
+        """
+        self.stdout.write(
+            f'{"endpoint":<24}{"requests":>9}{"p50 ms":>9}{"p99 ms":>9}'
+            f'{"queries":>9}{"max q":>7}{"5xx":>6}'
+        )
+        for name, endpoint in sorted(results['endpoints'].items()):
+            self.stdout.write(
+                f'{name:<24}{endpoint["requests"]:>9}{endpoint["p50_ms"]:>9.2f}{endpoint["p99_ms"]:>9.2f}'
+                f'{endpoint["mean_queries"]:>9.2f}{endpoint["max_queries"]:>7}{endpoint["errors"]:>6}'
+            )
+        self.stdout.write(f'Throughput: {results["throughput_rps"]:,.1f} requests/s')
+
+    def compare(self, results: dict, path: str, tolerance: float) -> None:
+        """
+        Raise CommandError if the results regress from the baseline file.
+
+        Query counts must not grow at all; median latency and throughput
+        may move by the tolerance, since they depend on the machine. p99 is
+        only reported: with a few dozen samples per endpoint it is too noisy
+        to gate on.
+        """
+        try:
+            with open(path) as baseline_file:
+                baseline = json.load(baseline_file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read baseline {path}: {e}')
+
+        if baseline['config'] != results['config']:
+            self.stdout.write(self.style.WARNING('Baseline was recorded with a different configuration.'))
+
+        regressions = []
+        if results['throughput_rps'] < baseline['throughput_rps'] * (1 - tolerance):
+            regressions.append(
+                f'throughput {results["throughput_rps"]} < baseline {baseline["throughput_rps"]} requests/s'
+            )
+        for name, expected in baseline['endpoints'].items():
+            actual = results['endpoints'].get(name)
+            if actual is None:
+                continue
+            if actual['errors']:
+                regressions.append(f'{name}: {actual["errors"]} server error(s)')
+            if actual['max_queries'] > expected['max_queries']:
+                regressions.append(f'{name}: {actual["max_queries"]} queries > baseline {expected["max_queries"]}')
+            if actual['p50_ms'] > expected['p50_ms'] * (1 + tolerance):
+                regressions.append(f'{name}: p50 {actual["p50_ms"]} ms > baseline {expected["p50_ms"]} ms')
+
+        if regressions:
+            raise CommandError('Performance regressions:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {path}.'))
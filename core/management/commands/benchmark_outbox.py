@@ -0,0 +1,157 @@
+import time
+from datetime import timedelta
+from queue import Empty
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.utils import timezone
+from core.models import OutboxMessage
+from core.outbox import drain_outbox, enqueue
+from event_management.celery import app as celery_app
+from events.models import Event, EventRegistration
+from events.seeding import seed_users
+from events.services import register_user
+from notifications.tasks import send_event_registration_email
+from .benchmark_api import percentile
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    """
+    Raised to roll back a registration on purpose.
+    """
+
+
+class Command(BaseCommand):
+    """
+    Measure and check registration notifications going through the outbox.
+    """
+    help = (
+        'In a test database with an in-memory broker, compare the cost of the outbox insert '
+        'with a direct broker publish, and check that registrations never publish from the '
+        'request path and that the relay delivers one message per committed registration.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument('--registrations', type=int, default=500, help='Committed registrations.')
+        parser.add_argument('--rollbacks', type=int, default=100, help='Rolled back registrations.')
+        parser.add_argument('--batch-size', type=int, default=100, help='Messages relayed per transaction.')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Run the checks in a test database that is destroyed afterwards.
+        """
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        broker_url, eager = celery_app.conf.broker_url, celery_app.conf.task_always_eager
+        celery_app.conf.broker_url = 'memory://'
+        celery_app.conf.task_always_eager = False
+        try:
+            self.run_checks(options)
+        finally:
+            celery_app.conf.broker_url, celery_app.conf.task_always_eager = broker_url, eager
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def take_messages(self) -> list[dict]:
+        """
+        Remove every message from the in-memory queue and return their task kwargs.
+        """
+        messages = []
+        with celery_app.connection_for_write() as conn:
+            queue = conn.SimpleQueue(celery_app.conf.task_default_queue, no_ack=True)
+            while True:
+                try:
+                    message = queue.get_nowait()
+                except Empty:
+                    return messages
+                messages.append(message.payload[1])
+
+    def report(self, name: str, latencies: list[float]) -> None:
+        """
+        Print the p50/p99 of latencies in milliseconds.
+        """
+        self.stdout.write(
+            f'{name:<28}p50 {percentile(latencies, 0.5) * 1000:7.3f} ms'
+            f'  p99 {percentile(latencies, 0.99) * 1000:7.3f} ms'
+        )
+
+    def run_checks(self, options: dict) -> None:
+        """
+        Measure the request path, then check rollbacks and the relay.
+        """
+        committed, rollbacks = options['registrations'], options['rollbacks']
+        first_user, _ = seed_users(committed + rollbacks + 1)
+        event = Event.objects.create(
+            title='Outbox benchmark',
+            description='Outbox benchmark',
+            date=timezone.now() + timedelta(days=30),
+            location='Online',
+            organizer_id=first_user,
+            capacity=committed + rollbacks,
+        )
+        users = list(User.objects.filter(id__gt=first_user).order_by('id')[:committed + rollbacks])
+
+        publish, insert = [], []
+        for _ in range(committed):
+            start = time.perf_counter()
+            send_event_registration_email.delay(user_id=first_user, event_id=event.id, registration_id=0)
+            publish.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            with transaction.atomic():
+                enqueue(send_event_registration_email, user_id=first_user, event_id=event.id, registration_id=0)
+            insert.append(time.perf_counter() - start)
+        self.take_messages()
+        OutboxMessage.objects.all().delete()
+
+        register = []
+        for user in users[:committed]:
+            start = time.perf_counter()
+            register_user(event, user)
+            register.append(time.perf_counter() - start)
+        published = len(self.take_messages())
+
+        for user in users[committed:]:
+            try:
+                with transaction.atomic():
+                    register_user(event, user)
+                    raise Rollback()
+            except Rollback:
+                pass
+
+        queued = OutboxMessage.objects.count()
+        start = time.perf_counter()
+        relayed = drain_outbox(options['batch_size'])
+        relay_seconds = time.perf_counter() - start
+        delivered = sorted(message['registration_id'] for message in self.take_messages())
+        registration_ids = sorted(EventRegistration.objects.filter(event=event).values_list('id', flat=True))
+
+        self.report('broker publish (.delay)', publish)
+        self.report('outbox insert', insert)
+        self.report('register (with outbox)', register)
+        self.stdout.write(
+            f'relayed {relayed} messages in {relay_seconds * 1000:.1f} ms '
+            f'({relayed / relay_seconds if relay_seconds else 0:.0f} msg/s)'
+        )
+
+        failures = []
+        if published:
+            failures.append(f'{published} messages were published from the request path')
+        if queued != committed:
+            failures.append(f'{queued} outbox messages for {committed} committed registrations')
+        if delivered != registration_ids:
+            lost = len(set(registration_ids) - set(delivered))
+            phantom = len(set(delivered) - set(registration_ids))
+            duplicates = len(delivered) - len(set(delivered))
+            failures.append(f'{lost} lost, {phantom} phantom and {duplicates} duplicate messages')
+        if OutboxMessage.objects.exists():
+            failures.append('messages were left in the outbox')
+        if failures:
+            raise CommandError('; '.join(failures))
+        self.stdout.write(self.style.SUCCESS(
+            f'OK: {committed} committed and {rollbacks} rolled back registrations, '
+            f'{len(delivered)} messages delivered, none lost, phantom or duplicated'
+        ))
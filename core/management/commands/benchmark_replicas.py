@@ -0,0 +1,174 @@
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connection, connections
+from django.db.models import F
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from core.db_router import mirror_replicas, replica_aliases
+from events.models import Event, EventRegistration
+from events.seeding import seed_events, seed_users
+from users.serializers import CustomTokenObtainPairSerializer
+from .benchmark_api import percentile
+
+User = get_user_model()
+
+# Alias of the replica added for the routing checks when none is configured
+CHECK_REPLICA = 'replica_check'
+
+
+class Command(BaseCommand):
+    """
+    Measure connection reuse and check read routing between primary and replicas.
+    """
+    help = (
+        'Time per-request connection setup with and without connection reuse on every '
+        'configured database, then check in a test database (replicas mirror the primary) '
+        'that safe reads go to a replica, writes and sticky reads to the primary, and that '
+        'an unreachable replica falls back to the primary.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument('--requests', type=int, default=200, help='Simulated requests per setting.')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Run the measurements, then the routing checks in a throwaway test database.
+        """
+        for alias in [DEFAULT_DB_ALIAS, *replica_aliases()]:
+            self.measure_connections(alias, options['requests'])
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        if not replica_aliases():
+            settings.DATABASES[CHECK_REPLICA] = dict(connection.settings_dict)
+        mirror_replicas()
+        try:
+            with override_settings(ALLOWED_HOSTS=['*']):
+                self.check_routing()
+        finally:
+            self.close_connections(list(settings.DATABASES))
+            settings.DATABASES.pop(CHECK_REPLICA, None)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def close_connections(self, aliases: list[str]) -> None:
+        """
+        Close the connections of aliases, and their pools.
+        """
+        for alias in aliases:
+            connections[alias].close()
+            if 'pool' in connections[alias].settings_dict.get('OPTIONS', {}):
+                connections[alias].close_pool()
+
+    def measure_connections(self, alias: str, requests: int) -> None:
+        """
+        Time a one-query request cycle with a new connection per request
+        and with the alias's configured persistence or pool.
+        """
+        configured = connections[alias].settings_dict
+        fresh = {**configured, 'CONN_MAX_AGE': 0, 'OPTIONS': {
+            key: value for key, value in configured.get('OPTIONS', {}).items() if key != 'pool'
+        }}
+        results = {}
+        for name, config in (('new connection', fresh), ('configured', configured)):
+            temporary = f'{alias}_benchmark'
+            settings.DATABASES[temporary] = dict(config)
+            latencies = []
+            try:
+                for _ in range(requests):
+                    start = time.perf_counter()
+                    close_old_connections()
+                    with connections[temporary].cursor() as cursor:
+                        cursor.execute('SELECT 1')
+                    close_old_connections()
+                    latencies.append(time.perf_counter() - start)
+            finally:
+                self.close_connections([temporary])
+                del connections[temporary]
+                settings.DATABASES.pop(temporary)
+            results[name] = percentile(latencies, 0.5) * 1000
+        mode = 'pool' if 'pool' in configured.get('OPTIONS', {}) else f'CONN_MAX_AGE={configured["CONN_MAX_AGE"]}'
+        self.stdout.write(
+            f'{alias}: p50 per request {results["new connection"]:.3f} ms with a new connection, '
+            f'{results["configured"]:.3f} ms with {mode}'
+        )
+
+    def check_routing(self) -> None:
+        """
+        Replay reads and writes and check which database served each one.
+        """
+        first_user, last_user = seed_users(20)
+        seed_events(8, 5, (first_user, last_user))
+        cache.clear()
+        event = Event.objects.filter(is_active=True, registered_count__lt=F('capacity')).order_by('id').first()
+        writer, reader = (
+            User.objects.exclude(event_registrations__event=event).order_by('id')[:2]
+        )
+        own_event = Event.objects.filter(organizer=reader).first() or event
+
+        def client(user: User) -> APIClient:
+            api_client = APIClient()
+            token = CustomTokenObtainPairSerializer.get_token(user).access_token
+            api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+            return api_client
+
+        clients = {'writer': client(writer), 'reader': client(reader)}
+        replica = replica_aliases()[0]
+        failures = []
+
+        def request(who: str, method: str, path: str, expected: str) -> None:
+            counts = {alias: 0 for alias in settings.DATABASES}
+
+            def counter(alias: str):
+                def wrapper(execute, sql, params, many, context):
+                    counts[alias] += 1
+                    return execute(sql, params, many, context)
+                return wrapper
+
+            with ExitStack() as stack:
+                for alias in counts:
+                    stack.enter_context(connections[alias].execute_wrapper(counter(alias)))
+                response = getattr(clients[who], method)(path)
+            used = sorted(alias for alias, count in counts.items() if count)
+            self.stdout.write(f'{who:<7}{method.upper():<5}{path:<45}{response.status_code}  {", ".join(used)}')
+            if response.status_code >= 500 or used != [expected]:
+                failures.append(f'{method.upper()} {path} by {who} used {used or "no database"}, expected {expected}')
+
+        request('reader', 'get', '/api/registrations/', replica)
+        request('reader', 'get', '/api/users/', replica)
+        request('reader', 'get', f'/api/events/{own_event.id}/registrations/', replica)
+        request('writer', 'post', f'/api/events/{event.id}/register/', DEFAULT_DB_ALIAS)
+        request('writer', 'get', '/api/registrations/', DEFAULT_DB_ALIAS)
+        request('reader', 'get', '/api/registrations/', replica)
+
+        registration = EventRegistration.objects.filter(user=writer, event=event).first()
+        if registration is None:
+            failures.append('the registration was not written')
+
+        replica_settings = connections[replica].settings_dict
+        replica_name, replica_options = replica_settings['NAME'], replica_settings.get('OPTIONS', {})
+        replica_settings['NAME'] = (
+            '/nonexistent/replica.sqlite3' if connections[replica].vendor == 'sqlite' else 'nonexistent_replica'
+        )
+        if 'pool' in replica_options:
+            replica_settings['OPTIONS'] = {**replica_options, 'pool': {**replica_options['pool'], 'timeout': 1}}
+        # SQLite keeps in-memory databases open, so close once the name is no longer one
+        self.close_connections([replica])
+        try:
+            request('reader', 'get', '/api/users/', DEFAULT_DB_ALIAS)
+        finally:
+            self.close_connections([replica])
+            replica_settings['NAME'], replica_settings['OPTIONS'] = replica_name, replica_options
+
+        if failures:
+            raise CommandError('; '.join(failures))
+        self.stdout.write(self.style.SUCCESS(
+            'OK: safe reads used the replica, writes and the writer\'s next read the primary, '
+            'and reads fell back to the primary with the replica down'
+        ))
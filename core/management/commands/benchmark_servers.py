@@ -0,0 +1,190 @@
+import asyncio
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from events.models import Event, EventRegistration
+from users.serializers import CustomTokenObtainPairSerializer
+from .benchmark_api import percentile
+
+User = get_user_model()
+
+PATHS = [
+    '/api/events/',
+    '/api/events/?pagination=cursor',
+    '/api/events/{event}/',
+    '/api/registrations/',
+    '/api/users/me/',
+]
+
+
+class Command(BaseCommand):
+    """
+    Compare WSGI and ASGI throughput of the read endpoints under concurrency.
+    """
+    help = (
+        'Start the project under gunicorn (WSGI) and uvicorn (ASGI) on local ports and load '
+        'both with the same number of concurrent keep-alive clients.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument(
+            '--concurrency', default='10,100,1000',
+            help='Comma separated numbers of concurrent clients.'
+        )
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per run.')
+        parser.add_argument('--workers', type=int, default=1, help='Worker processes per server.')
+        parser.add_argument('--threads', type=int, default=8, help='Threads per gunicorn worker.')
+        parser.add_argument('--port', type=int, default=8765, help='First local port to use.')
+        parser.add_argument(
+            '--user',
+            help='Email of the user making the requests (default: the latest registrant).'
+        )
+
+    def server_commands(self, options: dict) -> dict[str, list[str]]:
+        """
+        Return the command line of each server.
+        """
+        workers = str(options['workers'])
+        return {
+            'wsgi': [
+                sys.executable, '-m', 'gunicorn', 'event_management.wsgi:application',
+                '--worker-class', 'gthread', '--workers', workers, '--threads', str(options['threads']),
+                '--bind', f'127.0.0.1:{options["port"]}', '--log-level', 'warning',
+            ],
+            'asgi': [
+                sys.executable, '-m', 'uvicorn', 'event_management.asgi:application',
+                '--workers', workers, '--host', '127.0.0.1', '--port', str(options['port'] + 1),
+                '--log-level', 'warning', '--no-access-log',
+            ],
+        }
+
+    def wait_for_port(self, port: int, process: subprocess.Popen, timeout: float = 30.0) -> None:
+        """
+        Wait until a server accepts connections on port.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'Server on port {port} exited with code {process.returncode}.')
+            try:
+                with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f'Server on port {port} did not start within {timeout:.0f}s.')
+
+    async def client(self, port: int, requests: list[bytes], deadline: float, latencies: list[float], errors: list[int]) -> None:
+        """
+        Send requests over one keep-alive connection until the deadline.
+        """
+        reader = writer = None
+        index = 0
+        while time.perf_counter() < deadline:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            request = requests[index % len(requests)]
+            index += 1
+            start = time.perf_counter()
+            try:
+                writer.write(request)
+                status = int((await reader.readline()).split()[1])
+                length = 0
+                close = False
+                while (line := await reader.readline()) not in (b'\r\n', b''):
+                    name, _, value = line.decode('latin-1').partition(':')
+                    if name.lower() == 'content-length':
+                        length = int(value)
+                    elif name.lower() == 'connection' and value.strip().lower() == 'close':
+                        close = True
+                await reader.readexactly(length)
+            except (OSError, IndexError, ValueError, asyncio.IncompleteReadError):
+                errors.append(0)
+                writer.close()
+                writer = None
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status >= 400:
+                errors.append(status)
+            if close:
+                writer.close()
+                writer = None
+        if writer is not None:
+            writer.close()
+
+    async def load(self, port: int, concurrency: int, duration: float, requests: list[bytes]) -> tuple[list[float], list[int], float]:
+        """
+        Run concurrency clients against port for duration seconds.
+        """
+        latencies, errors = [], []
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            self.client(port, requests[offset:] + requests[:offset], start + duration, latencies, errors)
+            for offset in (index % len(requests) for index in range(concurrency))
+        ))
+        return latencies, errors, time.perf_counter() - start
+
+    def build_requests(self, email: str | None) -> list[bytes]:
+        """
+        Build the raw HTTP requests replayed by every client.
+        """
+        if email:
+            user = User.objects.filter(email=email).first()
+        else:
+            registration = EventRegistration.objects.order_by('-id').select_related('user').first()
+            user = registration.user if registration else None
+        event = Event.objects.order_by('-id').first()
+        if user is None or event is None:
+            raise CommandError('Needs a user and an event; run seed_benchmark_data first.')
+        host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS and settings.ALLOWED_HOSTS[0] != '*' else 'localhost'
+        token = CustomTokenObtainPairSerializer.get_token(user).access_token
+        return [
+            (
+                f'GET {path.format(event=event.id)} HTTP/1.1\r\n'
+                f'Host: {host}\r\nAuthorization: Bearer {token}\r\nAccept: application/json\r\n\r\n'
+            ).encode('latin-1')
+            for path in PATHS
+        ]
+
+    def handle(self, *args, **options) -> None:
+        """
+        Benchmark each server at each concurrency level.
+        """
+        for module in ('gunicorn', 'uvicorn'):
+            if importlib.util.find_spec(module) is None:
+                raise CommandError(f'{module} is not installed.')
+        requests = self.build_requests(options['user'])
+        levels = [int(level) for level in options['concurrency'].split(',')]
+        commands = self.server_commands(options)
+
+        self.stdout.write(
+            f'{"server":<8}{"clients":>9}{"requests":>10}{"req/s":>10}{"p50 ms":>10}{"p99 ms":>10}{"errors":>8}'
+        )
+        for offset, (name, command) in enumerate(commands.items()):
+            port = options['port'] + offset
+            process = subprocess.Popen(command, env=os.environ.copy())
+            try:
+                self.wait_for_port(port, process)
+                asyncio.run(self.load(port, 1, 1.0, requests))
+                for concurrency in levels:
+                    latencies, errors, elapsed = asyncio.run(
+                        self.load(port, concurrency, options['duration'], requests)
+                    )
+                    if not latencies:
+                        self.stdout.write(f'{name:<8}{concurrency:>9}{"no successful requests":>48}')
+                        continue
+                    self.stdout.write(
+                        f'{name:<8}{concurrency:>9}{len(latencies):>10}{len(latencies) / elapsed:>10.0f}'
+                        f'{percentile(latencies, 0.50):>10.1f}{percentile(latencies, 0.99):>10.1f}{len(errors):>8}'
+                    )
+            finally:
+                process.terminate()
+                process.wait()
@@ -0,0 +1,132 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+from events.models import Event, EventRegistration
+
+User = get_user_model()
+
+ENDPOINTS = [
+    '/api/events/',
+    '/api/events/?pagination=cursor',
+    '/api/events/?upcoming=true&is_active=true&pagination=cursor',
+    '/api/events/?has_available_seats=true&pagination=cursor',
+    '/api/events/?organizer={user}&pagination=cursor',
+    '/api/events/?q=music&pagination=cursor',
+    '/api/events/{event}/',
+    '/api/events/{event}/registrations/?pagination=cursor',
+    '/api/events/{event}/registrations/?status=confirmed&pagination=cursor',
+    '/api/registrations/',
+    '/api/registrations/?expand=event',
+    '/api/registrations/{registration}/',
+    '/api/users/me/',
+]
+
+
+class Command(BaseCommand):
+    """
+    EXPLAIN the SQL issued by each read endpoint and flag sequential scans.
+    """
+    help = (
+        'Request every read endpoint, EXPLAIN the queries it runs and flag full table scans. '
+        'Plans depend on the data, so run it against a realistically sized database.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument(
+            '--user',
+            help='Email of the user making the requests (default: the latest registrant).'
+        )
+        parser.add_argument(
+            '--fail-on-seq-scan', action='store_true',
+            help='Exit with an error if any query plan contains a sequential scan.'
+        )
+
+    def explain(self, sql: str) -> list[str]:
+        """
+        Return the plan lines of a query on the current database.
+        """
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'EXPLAIN {sql}')
+                return [row[0] for row in cursor.fetchall()]
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def is_seq_scan(self, line: str) -> bool:
+        """
+        Return True if a plan line reads a whole table without an index.
+        """
+        if connection.vendor == 'postgresql':
+            return 'Seq Scan on' in line
+        detail = line.strip()
+        return detail.startswith('SCAN ') and 'USING' not in detail and 'VIRTUAL TABLE' not in detail
+
+    def resolve_targets(self, email: str | None) -> dict:
+        """
+        Pick the user, event and registration substituted into the endpoints.
+        """
+        if email:
+            user = User.objects.filter(email=email).first()
+            if user is None:
+                raise CommandError(f'No user with email {email}.')
+            registration = EventRegistration.objects.filter(user=user).order_by('-id').first()
+        else:
+            registration = EventRegistration.objects.order_by('-id').first()
+            user = registration.user if registration else User.objects.order_by('id').first()
+        if user is None:
+            raise CommandError('The database has no users; seed some data first.')
+        event = registration.event if registration else Event.objects.order_by('-id').first()
+        return {
+            'user': user,
+            'event': event.id if event else None,
+            'registration': registration.id if registration else None,
+        }
+
+    def handle(self, *args, **options) -> None:
+        """
+        Request every endpoint and report the plans of its queries.
+        """
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            raise CommandError(f'EXPLAIN parsing is not supported on {connection.vendor}.')
+        targets = self.resolve_targets(options['user'])
+        client = APIClient()
+        client.force_authenticate(targets['user'])
+        params = {**targets, 'user': targets['user'].id}
+
+        flagged = 0
+        dummy_cache = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        with override_settings(CACHES=dummy_cache, ALLOWED_HOSTS=['*']):
+            for endpoint in ENDPOINTS:
+                if any(f'{{{name}}}' in endpoint and value is None for name, value in params.items()):
+                    self.stdout.write(self.style.WARNING(f'SKIP {endpoint} (no data to substitute)'))
+                    continue
+                url = endpoint.format(**params)
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(url)
+
+                selects = [query['sql'] for query in queries if query['sql'].lstrip().upper().startswith(('SELECT', 'WITH'))]
+                scans = []
+                for sql in selects:
+                    plan = self.explain(sql)
+                    scans.extend(line.strip() for line in plan if self.is_seq_scan(line))
+                    if options['verbosity'] > 1:
+                        self.stdout.write(f'  {sql}')
+                        for line in plan:
+                            self.stdout.write(f'    {line}')
+
+                summary = f'{url} -> {response.status_code}, {len(selects)} queries'
+                if scans:
+                    flagged += 1
+                    self.stdout.write(self.style.ERROR(f'SEQ  {summary}'))
+                    for line in scans:
+                        self.stdout.write(f'       {line}')
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'OK   {summary}'))
+
+        if flagged and options['fail_on_seq_scan']:
+            raise CommandError(f'{flagged} endpoint(s) run sequential scans.')
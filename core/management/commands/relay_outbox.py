@@ -0,0 +1,47 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from core.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    """
+    Publish queued outbox messages to the broker.
+    """
+    help = (
+        'Publish the task calls queued in the outbox to the broker, once or continuously. '
+        'A dedicated relay process delivers sooner than the periodic relay task.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.OUTBOX_RELAY_BATCH_SIZE,
+            help='Messages published per transaction.'
+        )
+        parser.add_argument('--loop', action='store_true', help='Keep relaying until interrupted.')
+        parser.add_argument(
+            '--interval', type=float, default=0.2,
+            help='Seconds to sleep while the outbox is empty (with --loop).'
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Drain the outbox, and with --loop keep polling it.
+        """
+        while True:
+            try:
+                relayed = drain_outbox(options['batch_size'])
+            except Exception as e:
+                if not options['loop']:
+                    raise
+                self.stderr.write(f"Error relaying outbox: {str(e)}")
+                relayed = 0
+            if relayed:
+                self.stdout.write(f'Relayed {relayed} messages')
+            if not options['loop']:
+                return
+            if not relayed:
+                time.sleep(options['interval'])
@@ -0,0 +1,106 @@
+import bisect
+import threading
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _escape(value: str) -> str:
+    """
+    Escape a label value for the Prometheus text format.
+    """
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class Histogram:
+    """
+    In-process cumulative histogram, with one series per label combination.
+
+    Observations only take a short lock, so a histogram can be shared by
+    all the threads of a worker. Each worker process keeps its own counts.
+    """
+    def __init__(self, name: str, documentation: str, buckets: tuple, labels: tuple[str, ...]) -> None:
+        """
+        Initialise an empty histogram.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labels = labels
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Record one observation in the series of the given labels.
+        """
+        key = tuple(labels[name] for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self) -> None:
+        """
+        Drop every recorded observation.
+        """
+        with self._lock:
+            self._series.clear()
+
+    def expose(self) -> list[str]:
+        """
+        Return the histogram in the Prometheus text exposition format.
+        """
+        with self._lock:
+            snapshot = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for key, (counts, total, count) in sorted(snapshot.items()):
+            labels = [f'{name}="{_escape(value)}"' for name, value in zip(self.labels, key)]
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += bucket_count
+                bucket_labels = ','.join([*labels, f'le="{bound}"'])
+                lines.append(f'{self.name}_bucket{{{bucket_labels}}} {cumulative}')
+            series_labels = '{' + ','.join(labels) + '}' if labels else ''
+            lines.append(f'{self.name}_sum{series_labels} {total}')
+            lines.append(f'{self.name}_count{series_labels} {count}')
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Wall time of sampled requests.',
+    DURATION_BUCKETS, ('view', 'method', 'status'),
+)
+DB_QUERIES = Histogram(
+    'http_request_db_queries', 'SQL queries issued by sampled requests.',
+    QUERY_COUNT_BUCKETS, ('view', 'method'),
+)
+DB_DURATION = Histogram(
+    'http_request_db_duration_seconds', 'Time spent in SQL queries by sampled requests.',
+    DURATION_BUCKETS, ('view', 'method'),
+)
+RENDER_DURATION = Histogram(
+    'http_response_render_seconds', 'Time spent rendering the response body of sampled requests.',
+    DURATION_BUCKETS, ('view', 'method'),
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Body size of sampled non-streaming responses.',
+    SIZE_BUCKETS, ('view', 'method'),
+)
+
+REGISTRY = [REQUEST_DURATION, DB_QUERIES, DB_DURATION, RENDER_DURATION, RESPONSE_SIZE]
+
+
+def render_metrics() -> str:
+    """
+    Return every registered histogram in the Prometheus text format.
+    """
+    lines = []
+    for histogram in REGISTRY:
+        lines.extend(histogram.expose())
+    return '\n'.join(lines) + '\n'
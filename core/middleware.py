@@ -0,0 +1,156 @@
+import random
+import time
+from contextlib import ExitStack
+from typing import Callable
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from . import metrics
+
+
+class RequestMetrics:
+    """
+    Timings collected for one sampled request.
+
+    Instances are installed as a database execute wrapper, so every query
+    of the request adds to the query count and database time.
+    """
+    def __init__(self) -> None:
+        """
+        Start with empty timings.
+        """
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_start = None
+        self.render_time = 0.0
+
+    def __call__(self, execute: Callable, sql: str, params, many: bool, context: dict):
+        """
+        Run one query and time it.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+    def rendered(self, response: HttpResponse) -> None:
+        """
+        Post-render callback recording the rendering time.
+        """
+        self.render_time = time.perf_counter() - self.render_start
+
+
+class RequestMetricsMiddleware:
+    """
+    Record per-view wall time, SQL queries, rendering time and response size.
+
+    Rendering is the encoding of the response body after the view returns.
+    DRF serializers run inside the view, so their time is part of the wall
+    time, not of the rendering time.
+
+    Only a REQUEST_METRICS_SAMPLE_RATE fraction of requests is measured;
+    the others cost a single random() call. Measurements feed the
+    in-process histograms of core.metrics and, with
+    REQUEST_METRICS_SERVER_TIMING, a Server-Timing response header.
+    Works in both the WSGI and the ASGI middleware chain; under ASGI the
+    queries run in the request's sync thread, whose connections are not
+    the event loop's, so the wrappers are installed from that thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """
+        Initialise the middleware.
+        """
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_METRICS_SAMPLE_RATE
+        self.server_timing = settings.REQUEST_METRICS_SERVER_TIMING
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def sampled(self) -> bool:
+        """
+        Return True if the current request should be measured.
+        """
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def wrap_queries(self, request_metrics: RequestMetrics) -> ExitStack:
+        """
+        Install request_metrics as execute wrapper of every database connection.
+        """
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(request_metrics))
+        return stack
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Measure a sampled request.
+        """
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        request_metrics = request.request_metrics = RequestMetrics()
+        start = time.perf_counter()
+        with self.wrap_queries(request_metrics):
+            response = self.get_response(request)
+        return self.finish(request, response, request_metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Measure a sampled request served by the ASGI handler.
+        """
+        if not self.sampled():
+            return await self.get_response(request)
+
+        request_metrics = request.request_metrics = RequestMetrics()
+        start = time.perf_counter()
+        queries = await sync_to_async(self.wrap_queries)(request_metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(queries.close)()
+        return self.finish(request, response, request_metrics, time.perf_counter() - start)
+
+    def finish(self, request: HttpRequest, response: HttpResponse, request_metrics: RequestMetrics, duration: float) -> HttpResponse:
+        """
+        Record the measurements and add the Server-Timing header.
+        """
+        self.record(request, response, request_metrics, duration)
+        if self.server_timing:
+            response['Server-Timing'] = (
+                f'app;dur={duration * 1000:.1f}, '
+                f'db;dur={request_metrics.db_time * 1000:.1f};desc="{request_metrics.queries} queries", '
+                f'render;dur={request_metrics.render_time * 1000:.1f}'
+            )
+        return response
+
+    def process_template_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        """
+        Time the rendering of DRF and template responses of sampled requests.
+        """
+        request_metrics = getattr(request, 'request_metrics', None)
+        if request_metrics is not None:
+            request_metrics.render_start = time.perf_counter()
+            response.add_post_render_callback(request_metrics.rendered)
+        return response
+
+    def record(self, request: HttpRequest, response: HttpResponse, request_metrics: RequestMetrics, duration: float) -> None:
+        """
+        Add the measurements of one request to the histograms.
+        """
+        match = request.resolver_match
+        labels = {'view': match.view_name if match else 'unresolved', 'method': request.method}
+        metrics.REQUEST_DURATION.observe(duration, status=str(response.status_code), **labels)
+        metrics.DB_QUERIES.observe(request_metrics.queries, **labels)
+        metrics.DB_DURATION.observe(request_metrics.db_time, **labels)
+        metrics.RENDER_DURATION.observe(request_metrics.render_time, **labels)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.observe(len(response.content), **labels)
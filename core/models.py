@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class OutboxMessage(models.Model):
+    """
+    A Celery task call recorded in the transaction that caused it.
+
+    The relay publishes messages to the broker in id order and deletes
+    them; see core.outbox.
+    """
+    task = models.CharField(max_length=200)
+    kwargs = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the message.
+        """
+        return f"{self.task} #{self.id}"
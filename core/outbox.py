@@ -0,0 +1,58 @@
+from celery import Task, current_app
+from django.db import transaction
+from .models import OutboxMessage
+
+
+def enqueue(task: Task, **kwargs) -> OutboxMessage:
+    """
+    Record a call of task for the relay to send to the broker.
+
+    The row commits or rolls back with the caller's transaction, so a
+    rolled-back change never sends a message and a broker outage never
+    fails the caller.
+    """
+    return OutboxMessage.objects.create(task=task.name, kwargs=kwargs)
+
+
+def enqueue_many(task: Task, kwargs_list: list[dict]) -> list[OutboxMessage]:
+    """
+    Record several calls of task with a single INSERT; see enqueue().
+    """
+    return OutboxMessage.objects.bulk_create([
+        OutboxMessage(task=task.name, kwargs=kwargs) for kwargs in kwargs_list
+    ])
+
+
+def relay_outbox(batch_size: int) -> int:
+    """
+    Publish one batch of outbox messages to the broker and delete them.
+
+    Rows are locked with SKIP LOCKED, so relays may run concurrently, and
+    deleted in the transaction that published them: if publishing fails
+    the batch stays for the next run. Delivery is therefore at least
+    once. Returns the number of messages relayed.
+    """
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True).order_by('id')[:batch_size]
+        )
+        for message in messages:
+            task = current_app.tasks.get(message.task)
+            if task is None:
+                current_app.send_task(message.task, kwargs=message.kwargs)
+            else:
+                task.apply_async(kwargs=message.kwargs)
+        OutboxMessage.objects.filter(id__in=[message.id for message in messages]).delete()
+    return len(messages)
+
+
+def drain_outbox(batch_size: int) -> int:
+    """
+    Relay batches until the outbox is empty. Returns the number of messages relayed.
+    """
+    relayed = 0
+    while True:
+        count = relay_outbox(batch_size)
+        relayed += count
+        if count < batch_size:
+            return relayed
@@ -0,0 +1,53 @@
+from typing import Iterable
+from rest_framework import permissions
+from rest_framework.request import Request
+
+FIELDS_QUERY_PARAM = 'fields'
+OMIT_QUERY_PARAM = 'omit'
+
+
+def _parse_field_list(value: str | None) -> set[str]:
+    """
+    Parse a comma separated list of field names.
+    """
+    if not value:
+        return set()
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def select_fields(request: Request | None, available: Iterable[str]) -> list[str]:
+    """
+    Return the available fields kept by the ``?fields=`` and ``?omit=`` parameters.
+
+    Unknown names are ignored and the declared field order is preserved.
+    """
+    available = list(available)
+    if request is None:
+        return available
+    only = _parse_field_list(request.query_params.get(FIELDS_QUERY_PARAM))
+    omit = _parse_field_list(request.query_params.get(OMIT_QUERY_PARAM))
+    return [
+        name for name in available
+        if (not only or name in only) and name not in omit
+    ]
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that lets read requests choose the top-level fields.
+
+    Nested serializers keep all their fields, and write requests are left
+    untouched so no writable field disappears.
+    """
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Drop the fields not selected by the request.
+        """
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return
+        keep = set(select_fields(request, self.fields))
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
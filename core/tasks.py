@@ -0,0 +1,15 @@
+from celery import shared_task
+from django.conf import settings
+from .outbox import drain_outbox
+
+
+@shared_task
+def relay_outbox() -> None:
+    """
+    Periodically publish the task calls waiting in the outbox.
+    """
+    try:
+        drain_outbox(settings.OUTBOX_RELAY_BATCH_SIZE)
+    except Exception as e:
+        print(f"Error relaying outbox: {str(e)}")
+        raise
@@ -0,0 +1,40 @@
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from events.models import Event
+from users.serializers import CustomTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+def create_user(name: str, **fields) -> User:
+    """
+    Create a user whose email and username derive from name.
+    """
+    return User.objects.create_user(username=name, email=f'{name}@example.com', password=None, **fields)
+
+
+def create_event(organizer: User, **fields) -> Event:
+    """
+    Create an active event a week from now, with fields overriding the defaults.
+    """
+    defaults = {
+        'title': 'Test event',
+        'description': 'Test event',
+        'date': timezone.now() + timedelta(days=7),
+        'location': 'Online',
+        'capacity': 10,
+    }
+    return Event.objects.create(organizer=organizer, **{**defaults, **fields})
+
+
+def api_client(user: User | None = None) -> APIClient:
+    """
+    Return an API client authenticated as user with a token from /api/token/.
+    """
+    client = APIClient()
+    if user is not None:
+        token = CustomTokenObtainPairSerializer.get_token(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
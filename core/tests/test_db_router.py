@@ -0,0 +1,127 @@
+from contextlib import ExitStack
+from typing import Any, Callable
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+from core.db_router import read_alias, replica_aliases
+from core.testing import api_client, create_event, create_user
+from events.models import Event
+
+# Alias of the replica added when none is configured
+TEST_REPLICA = 'replica_test'
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Safe API reads go to a replica, writes and a writer's next reads to the primary.
+
+    Replicas are TEST MIRRORs of the primary, so a TransactionTestCase is
+    used: the replica connection only sees committed rows.
+    """
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Add a replica mirroring the test database if none is configured.
+        """
+        cls.added_replica = not replica_aliases()
+        if cls.added_replica:
+            settings.DATABASES[TEST_REPLICA] = {
+                **connections[DEFAULT_DB_ALIAS].settings_dict, 'TEST': {'MIRROR': DEFAULT_DB_ALIAS},
+            }
+        for alias in replica_aliases():
+            connections[alias].close()
+            connections[alias].creation.set_as_test_mirror(connections[DEFAULT_DB_ALIAS].settings_dict)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Remove the replica added by setUpClass.
+        """
+        super().tearDownClass()
+        if cls.added_replica:
+            connections[TEST_REPLICA].close()
+            del connections[TEST_REPLICA]
+            settings.DATABASES.pop(TEST_REPLICA)
+
+    def setUp(self) -> None:
+        """
+        Create an event, a user who registers for it and one who only reads.
+        """
+        cache.clear()
+        self.event = create_event(create_user('organizer'))
+        self.writer = api_client(create_user('writer'))
+        self.reader = api_client(create_user('reader'))
+
+    def aliases_used(self, query: Callable[[], Any]) -> set[str]:
+        """
+        Run query and return the aliases that served it.
+        """
+        used = set()
+
+        def counter(alias: str):
+            def wrapper(execute, sql, params, many, context):
+                used.add(alias)
+                return execute(sql, params, many, context)
+            return wrapper
+
+        with ExitStack() as stack:
+            for alias in settings.DATABASES:
+                stack.enter_context(connections[alias].execute_wrapper(counter(alias)))
+            query()
+        return used
+
+    def request_aliases(self, client: APIClient, method: str, path: str) -> set[str]:
+        """
+        Send a request and return the aliases that served its queries.
+        """
+        response = None
+
+        def send() -> None:
+            nonlocal response
+            response = getattr(client, method)(path)
+
+        used = self.aliases_used(send)
+        self.assertLess(response.status_code, 500)
+        return used
+
+    def assertReadsReplica(self, used: set[str]) -> None:
+        """
+        Assert that only replicas served the queries.
+        """
+        self.assertTrue(used)
+        self.assertLessEqual(used, set(replica_aliases()))
+
+    def test_safe_reads_use_replica(self) -> None:
+        """
+        Listing registrations and users reads a replica; cached event
+        responses are built from the primary so they are never stale.
+        """
+        self.assertReadsReplica(self.request_aliases(self.reader, 'get', '/api/registrations/'))
+        self.assertReadsReplica(self.request_aliases(self.reader, 'get', '/api/users/'))
+        path = f'/api/events/{self.event.id}/'
+        self.assertEqual(self.request_aliases(self.reader, 'get', path), {DEFAULT_DB_ALIAS})
+
+    def test_writes_use_primary_and_stick(self) -> None:
+        """
+        Registering writes to the primary and keeps the writer's next read
+        there, while other users keep reading a replica.
+        """
+        path = f'/api/events/{self.event.id}/register/'
+        self.assertEqual(self.request_aliases(self.writer, 'post', path), {DEFAULT_DB_ALIAS})
+        self.assertEqual(self.request_aliases(self.writer, 'get', '/api/registrations/'), {DEFAULT_DB_ALIAS})
+        self.assertReadsReplica(self.request_aliases(self.reader, 'get', '/api/registrations/'))
+
+    def test_routing_is_reset_after_each_request(self) -> None:
+        """
+        Queries made after a replica read, or a failed one, go to the primary.
+        """
+        for path in ('/api/registrations/', '/api/registrations/0/'):
+            self.request_aliases(self.reader, 'get', path)
+            self.assertIsNone(read_alias.get())
+            self.assertEqual(self.aliases_used(Event.objects.count), {DEFAULT_DB_ALIAS})
@@ -0,0 +1,81 @@
+import re
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import AsyncClient, Client, TestCase, override_settings
+from core.testing import create_user
+from users.serializers import CustomTokenObtainPairSerializer
+
+
+@override_settings(METRICS_TOKEN='scrape-token', REQUEST_METRICS_SAMPLE_RATE=1.0)
+class MetricsEndpointTests(TestCase):
+    """
+    /metrics/ is only readable by the scraper and staff.
+    """
+    def test_anonymous_is_forbidden(self) -> None:
+        """
+        No token, no session: 403.
+        """
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+
+    def test_wrong_token_is_forbidden(self) -> None:
+        """
+        A different bearer token: 403.
+        """
+        response = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer other')
+        self.assertEqual(response.status_code, 403)
+
+    def test_scrape_token(self) -> None:
+        """
+        The METRICS_TOKEN bearer token reads the histograms.
+        """
+        response = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'http_request_duration_seconds', response.content)
+
+    def test_staff_session(self) -> None:
+        """
+        A logged in staff user reads the histograms; other users do not.
+        """
+        self.client.force_login(create_user('user'))
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+        self.client.force_login(create_user('staff', is_staff=True))
+        self.assertEqual(self.client.get('/metrics/').status_code, 200)
+
+    def test_server_timing_header(self) -> None:
+        """
+        Measured responses only carry Server-Timing when the setting is on.
+        """
+        for enabled in (False, True):
+            with self.subTest(enabled=enabled), override_settings(REQUEST_METRICS_SERVER_TIMING=enabled):
+                response = Client().get('/metrics/', HTTP_AUTHORIZATION='Bearer scrape-token')
+                self.assertEqual('Server-Timing' in response, enabled)
+
+
+@override_settings(ALLOWED_HOSTS=['*'], REQUEST_METRICS_SAMPLE_RATE=1.0, REQUEST_METRICS_SERVER_TIMING=True)
+class QueryMetricsTests(TestCase):
+    """
+    Queries are counted whichever handler serves the request.
+    """
+    def setUp(self) -> None:
+        """
+        Issue an access token for /api/users/.
+        """
+        cache.clear()
+        token = CustomTokenObtainPairSerializer.get_token(create_user('user')).access_token
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def query_count(self, response) -> int:
+        """
+        Return the query count of a response's Server-Timing header.
+        """
+        return int(re.search(r'desc="(\d+) queries"', response['Server-Timing']).group(1))
+
+    async def test_asgi_counts_queries(self) -> None:
+        """
+        The ASGI chain counts the queries of a sync view, as WSGI does.
+        """
+        response = await AsyncClient().get('/api/users/', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        wsgi_response = await sync_to_async(Client().get)('/api/users/', headers=self.headers)
+        self.assertGreater(self.query_count(response), 0)
+        self.assertEqual(self.query_count(response), self.query_count(wsgi_response))
@@ -0,0 +1,88 @@
+from unittest import mock
+from celery import Task
+from django.core import mail
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+from core.models import OutboxMessage
+from core.outbox import drain_outbox, relay_outbox
+from core.testing import create_event, create_user
+from event_management.celery import app as celery_app
+from events.models import EventRegistration
+from events.services import register_user
+
+SEND_REGISTRATION_EMAIL = 'notifications.tasks.send_event_registration_email'
+
+
+class Rollback(Exception):
+    """
+    Raised to roll back a registration on purpose.
+    """
+
+
+class OutboxTests(TestCase):
+    """
+    Task calls are recorded with the change that caused them and relayed to Celery.
+    """
+    def setUp(self) -> None:
+        """
+        Run relayed tasks eagerly and create an event with two attendees.
+        """
+        cache.clear()
+        eager = celery_app.conf.task_always_eager
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, 'task_always_eager', eager)
+        self.event = create_event(create_user('organizer'))
+        self.attendees = [create_user('first'), create_user('second')]
+
+    def test_registration_writes_message_without_publishing(self) -> None:
+        """
+        Registering records the email task in the outbox and publishes nothing.
+        """
+        with mock.patch.object(Task, 'apply_async') as apply_async:
+            registration = register_user(self.event, self.attendees[0])
+        apply_async.assert_not_called()
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.task, SEND_REGISTRATION_EMAIL)
+        self.assertEqual(message.kwargs, {
+            'user_id': self.attendees[0].id,
+            'event_id': self.event.id,
+            'registration_id': registration.id,
+        })
+
+    def test_rollback_writes_no_message(self) -> None:
+        """
+        A rolled-back registration leaves neither the registration nor its message.
+        """
+        with self.assertRaises(Rollback), transaction.atomic():
+            register_user(self.event, self.attendees[0])
+            raise Rollback()
+        self.assertFalse(EventRegistration.objects.exists())
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_relay_publishes_and_deletes(self) -> None:
+        """
+        The relay runs each message once, in batches, and deletes it.
+        """
+        for attendee in self.attendees:
+            register_user(self.event, attendee)
+        self.assertEqual(relay_outbox(batch_size=1), 1)
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+        self.assertEqual(drain_outbox(batch_size=10), 1)
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['first@example.com', 'second@example.com'])
+        self.assertFalse(EventRegistration.objects.filter(confirmation_sent_at=None).exists())
+
+    def test_failed_publish_is_retried(self) -> None:
+        """
+        A batch whose publish fails stays in the outbox and is relayed by the next run.
+        """
+        for attendee in self.attendees:
+            register_user(self.event, attendee)
+        with mock.patch.object(Task, 'apply_async', side_effect=[None, ConnectionError('broker down')]):
+            with self.assertRaises(ConnectionError):
+                relay_outbox(batch_size=10)
+        self.assertEqual(OutboxMessage.objects.count(), 2)
+        self.assertEqual(relay_outbox(batch_size=10), 2)
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertEqual(len(mail.outbox), 2)
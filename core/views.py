@@ -0,0 +1,24 @@
+import hmac
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+from .metrics import render_metrics
+
+
+def metrics_authorized(request: HttpRequest) -> bool:
+    """
+    Return True if request carries the METRICS_TOKEN bearer token or a staff session.
+    """
+    if settings.METRICS_TOKEN:
+        expected = f'Bearer {settings.METRICS_TOKEN}'.encode()
+        if hmac.compare_digest(request.headers.get('Authorization', '').encode(), expected):
+            return True
+    return request.user.is_staff
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Expose the request metrics of this worker process for Prometheus.
+    """
+    if not metrics_authorized(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
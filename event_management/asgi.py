@@ -0,0 +1,21 @@
+"""
+ASGI config for event_management project.
+
+It exposes the ASGI callable as a module-level variable named ``application``
+and serves the hot read endpoints with async views (``ASYNC_READ_VIEWS``).
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'event_management.settings')
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
+# Each ASGI request runs its sync code in a thread of its own, which would
+# strand a persistent connection per request; use DB_POOL_MAX_SIZE instead.
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+
+application = get_asgi_application()
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -54,14 +55,33 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Request metrics
+# Fraction of requests measured, and whether measured responses carry a Server-Timing header
+# (it tells clients the database time and query count, so it is off unless DEBUG)
+REQUEST_METRICS_SAMPLE_RATE = env.float('REQUEST_METRICS_SAMPLE_RATE', default=0.1)
+REQUEST_METRICS_SERVER_TIMING = env.bool('REQUEST_METRICS_SERVER_TIMING', default=DEBUG)
+# Bearer token the Prometheus scraper sends to /metrics/; without it only staff sessions may read it
+METRICS_TOKEN = env('METRICS_TOKEN', default='')
+
+# Serve the hot read endpoints with async views (asgi.py turns this on), and the
+# number of async requests per process allowed to hold a database connection at once
+ASYNC_READ_VIEWS = env.bool('ASYNC_READ_VIEWS', default=False)
+ASYNC_DB_CONCURRENCY = env.int('ASYNC_DB_CONCURRENCY', default=20)
+
 ROOT_URLCONF = 'event_management.urls'
 
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compiled templates are kept in memory for the life of the process
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -75,9 +95,87 @@ TEMPLATES = [
 WSGI_APPLICATION = 'event_management.wsgi.application'
 
 # Database
+# Seconds a connection is reused across requests (0 closes it after each request) and whether a
+# reused connection is checked before use. With DB_POOL_MAX_SIZE > 0, PostgreSQL connections come
+# from a psycopg pool of DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections per process instead, waiting at
+# most DB_POOL_TIMEOUT seconds for a free (or reachable) connection.
+DB_CONN_MAX_AGE = env.int('DB_CONN_MAX_AGE', default=60)
+DB_CONN_HEALTH_CHECKS = env.bool('DB_CONN_HEALTH_CHECKS', default=True)
+DB_POOL_MIN_SIZE = env.int('DB_POOL_MIN_SIZE', default=2)
+DB_POOL_MAX_SIZE = env.int('DB_POOL_MAX_SIZE', default=0)
+DB_POOL_TIMEOUT = env.float('DB_POOL_TIMEOUT', default=5.0)
+
+
+def database_config(url: str) -> dict:
+    """
+    Return the DATABASES entry of url with the connection settings applied.
+    """
+    config = env.db_url_config(url)
+    config['CONN_HEALTH_CHECKS'] = DB_CONN_HEALTH_CHECKS
+    if DB_POOL_MAX_SIZE and config['ENGINE'] == 'django.db.backends.postgresql':
+        config.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
+        config['CONN_MAX_AGE'] = 0
+    else:
+        config['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+    return config
+
+
 DATABASES = {
-    'default': env.db(),
+    'default': database_config(env('DATABASE_URL')),
 }
+# Comma separated URLs of read replicas of the default database; safe API reads are spread over them
+for index, replica_url in enumerate(env.list('REPLICA_DATABASE_URLS', default=[]), 1):
+    DATABASES[f'replica{index}'] = {**database_config(replica_url), 'TEST': {'MIRROR': 'default'}}
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+# Seconds a user's reads stay on the primary after a write, and seconds an unreachable replica is skipped
+REPLICA_STICKY_SECONDS = env.int('REPLICA_STICKY_SECONDS', default=10)
+REPLICA_RETRY_AFTER = env.int('REPLICA_RETRY_AFTER', default=30)
+
+# Cache
+# Redis in production, in-process memory when REDIS_URL is not set (tests, local runs)
+REDIS_URL = env('REDIS_URL', default=None)
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+
+# Seconds an event list/detail response stays cached; writes invalidate earlier
+EVENT_CACHE_TIMEOUT = env.int('EVENT_CACHE_TIMEOUT', default=60)
+# Seconds concurrent requests wait for another request to fill the same cache entry
+EVENT_COALESCE_TIMEOUT = env.int('EVENT_COALESCE_TIMEOUT', default=2)
+
+# Waitlisted users promoted per transaction when seats free up
+WAITLIST_PROMOTION_BATCH_SIZE = env.int('WAITLIST_PROMOTION_BATCH_SIZE', default=100)
+
+# Registrations fetched and written per chunk by the streaming export
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', default=2000)
+
+# Days after its date an event and its registrations move to the archive tables, events
+# archived per transaction, and seconds between celery-beat archiving runs
+EVENT_ARCHIVE_AFTER_DAYS = env.int('EVENT_ARCHIVE_AFTER_DAYS', default=365)
+EVENT_ARCHIVE_BATCH_SIZE = env.int('EVENT_ARCHIVE_BATCH_SIZE', default=100)
+EVENT_ARCHIVE_INTERVAL = env.int('EVENT_ARCHIVE_INTERVAL', default=86400)
+
+# Seconds a user row stays cached for authentication; profile updates invalidate earlier
+USER_CACHE_TIMEOUT = env.int('USER_CACHE_TIMEOUT', default=30)
+
+# Seconds between relay runs that publish queued outbox messages to the broker
+OUTBOX_RELAY_INTERVAL = env.float('OUTBOX_RELAY_INTERVAL', default=1.0)
+# Outbox messages published and deleted per relay transaction
+OUTBOX_RELAY_BATCH_SIZE = env.int('OUTBOX_RELAY_BATCH_SIZE', default=500)
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -111,7 +209,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -121,6 +219,9 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_RATES': {
+        'event_register': env('EVENT_REGISTER_THROTTLE_RATE', default='5/min'),
+    },
 }
 
 # CORS settings
@@ -130,7 +231,7 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 # Email settings
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = env('EMAIL_HOST')
 EMAIL_PORT = env.int('EMAIL_PORT')
 EMAIL_HOST_USER = env('EMAIL_HOST_USER')
@@ -138,6 +239,26 @@ EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD')
 EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS', default=True)
 DEFAULT_FROM_EMAIL = 'noreply@eventmanagement.com'
 
+# Notification batching
+# Confirmation emails sent per SMTP batch, and seconds between flushes of pending emails
+NOTIFICATION_BATCH_SIZE = env.int('NOTIFICATION_BATCH_SIZE', default=100)
+NOTIFICATION_FLUSH_INTERVAL = env.int('NOTIFICATION_FLUSH_INTERVAL', default=30)
+# Hours before an event its reminder emails go out, one reminder per entry
+EVENT_REMINDER_LEAD_HOURS = env.list('EVENT_REMINDER_LEAD_HOURS', cast=float, default=[24, 1])
+# Seconds between celery-beat runs that pick the events due a reminder
+EVENT_REMINDER_INTERVAL = env.int('EVENT_REMINDER_INTERVAL', default=60)
+# Registration ids streamed per database round trip while fanning a reminder out
+EVENT_REMINDER_CHUNK_SIZE = env.int('EVENT_REMINDER_CHUNK_SIZE', default=2000)
+# Seconds after its fan-out before an unsent reminder batch is queued again
+EVENT_REMINDER_RETRY_AFTER = env.int('EVENT_REMINDER_RETRY_AFTER', default=600)
+
+# Token blacklist
+# Refresh tokens written per bulk insert, seconds a written token may wait in the buffer,
+# and seconds between purges of expired tokens
+TOKEN_WRITE_BATCH_SIZE = env.int('TOKEN_WRITE_BATCH_SIZE', default=100)
+TOKEN_WRITE_INTERVAL = env.int('TOKEN_WRITE_INTERVAL', default=5)
+TOKEN_PURGE_INTERVAL = env.int('TOKEN_PURGE_INTERVAL', default=3600)
+
 # Celery settings
 CELERY_BROKER_URL = env('CELERY_BROKER_URL')
 CELERY_RESULT_BACKEND = env('CELERY_RESULT_BACKEND')
@@ -145,6 +266,28 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'flush-pending-registration-emails': {
+        'task': 'notifications.tasks.flush_pending_registration_emails',
+        'schedule': NOTIFICATION_FLUSH_INTERVAL,
+    },
+    'purge-expired-tokens': {
+        'task': 'users.tasks.purge_expired_tokens',
+        'schedule': TOKEN_PURGE_INTERVAL,
+    },
+    'schedule-event-reminders': {
+        'task': 'notifications.tasks.schedule_event_reminders',
+        'schedule': EVENT_REMINDER_INTERVAL,
+    },
+    'relay-outbox': {
+        'task': 'core.tasks.relay_outbox',
+        'schedule': OUTBOX_RELAY_INTERVAL,
+    },
+    'archive-past-events': {
+        'task': 'events.tasks.archive_past_events',
+        'schedule': EVENT_ARCHIVE_INTERVAL,
+    },
+}
 
 # JWT settings
 SIMPLE_JWT = {
@@ -3,6 +3,7 @@ from django.urls import path, include
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from core.views import metrics_view
 
 schema_view = get_schema_view(
    openapi.Info(
@@ -22,6 +23,7 @@ urlpatterns = [
     path('api/', include('events.urls')),
     path('api/', include('users.urls')),
     path('api/', include('notifications.urls')),
+    path('metrics/', metrics_view, name='metrics'),
     
     # API documentation
     path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
@@ -0,0 +1,181 @@
+from datetime import datetime, timedelta
+from itertools import chain
+from operator import itemgetter
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+from rest_framework.request import Request
+from .cache import invalidate_event
+from .models import ArchivedEvent, ArchivedRegistration, Event, EventRegistration
+
+# Columns of the "my registrations" feed rows, as read from RegistrationFeedEntry; id is
+# only read by the cursor paginator
+FEED_COLUMNS = [
+    'id', 'registration_id', 'event_id', 'event_title', 'event_date', 'event_location',
+    'event_is_active', 'registration_date', 'status', 'payment_status',
+]
+
+
+def includes_archived(request: Request | None) -> bool:
+    """
+    Return True if the request asked for ``?include_archived=true``.
+    """
+    if request is None:
+        return False
+    return request.query_params.get('include_archived', '').lower() in ('1', 'true')
+
+
+def archive_cutoff(now: datetime | None = None) -> datetime:
+    """
+    Return the date before which events are archived.
+    """
+    return (now or timezone.now()) - timedelta(days=settings.EVENT_ARCHIVE_AFTER_DAYS)
+
+
+def archivable_events(cutoff: datetime) -> QuerySet[Event]:
+    """
+    Return the events dated before cutoff, oldest first, a range scan of the date index.
+    """
+    return Event.objects.filter(date__lt=cutoff).order_by('date', 'id')
+
+
+def _copy_columns(archive_model: type[models.Model]) -> list[str]:
+    """
+    Return the columns an archive table shares with its hot table.
+    """
+    return [field.column for field in archive_model._meta.concrete_fields if field.name != 'archived_at']
+
+
+def _delete_cascade(cursor, model: type[models.Model], where: str, params: list) -> None:
+    """
+    Delete the rows of model matching where, and first every row that
+    cascades from them, following the models' CASCADE foreign keys.
+    """
+    quote = connection.ops.quote_name
+    table, pk = quote(model._meta.db_table), quote(model._meta.pk.column)
+    for relation in model._meta.related_objects:
+        if relation.on_delete is not models.CASCADE:
+            continue
+        column = quote(relation.field.column)
+        _delete_cascade(
+            cursor, relation.related_model,
+            f'{column} IN (SELECT {pk} FROM {table} WHERE {where})', params,
+        )
+    cursor.execute(f'DELETE FROM {table} WHERE {where}', params)
+
+
+def archive_event_batch(cutoff: datetime, batch_size: int | None = None) -> tuple[int, int]:
+    """
+    Move the oldest batch_size events dated before cutoff, and their
+    registrations, to the archive tables.
+
+    The rows are copied with INSERT ... SELECT and deleted, together with
+    everything cascading from them (feed entries, waitlists, reminders),
+    in one transaction, so an interrupted run leaves each event either
+    hot or archived and the next run carries on from the oldest event
+    left. Events locked by a concurrent run are skipped. Returns the
+    number of events and registrations archived.
+    """
+    batch_size = batch_size or settings.EVENT_ARCHIVE_BATCH_SIZE
+    quote = connection.ops.quote_name
+    with transaction.atomic():
+        event_ids = list(
+            archivable_events(cutoff).select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not event_ids:
+            return 0, 0
+
+        in_events = f'IN ({", ".join(["%s"] * len(event_ids))})'
+        event_columns = ', '.join(quote(column) for column in _copy_columns(ArchivedEvent))
+        registration_columns = ', '.join(quote(column) for column in _copy_columns(ArchivedRegistration))
+        archived_at = connection.ops.adapt_datetimefield_value(timezone.now())
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {quote(ArchivedEvent._meta.db_table)} ({event_columns}, {quote("archived_at")}) '
+                f'SELECT {event_columns}, %s FROM {quote(Event._meta.db_table)} WHERE {quote("id")} {in_events}',
+                [archived_at, *event_ids],
+            )
+            cursor.execute(
+                f'INSERT INTO {quote(ArchivedRegistration._meta.db_table)} ({registration_columns}) '
+                f'SELECT {registration_columns} FROM {quote(EventRegistration._meta.db_table)} '
+                f'WHERE {quote("event_id")} {in_events}',
+                event_ids,
+            )
+            registrations = cursor.rowcount
+            _delete_cascade(cursor, Event, f'{quote("id")} {in_events}', event_ids)
+
+        for event_id in event_ids:
+            invalidate_event(event_id)
+    return len(event_ids), registrations
+
+
+def archived_feed_rows(user_id: int) -> QuerySet[ArchivedRegistration]:
+    """
+    Return a user's archived registrations as feed rows (FEED_COLUMNS).
+    """
+    return ArchivedRegistration.objects.filter(user_id=user_id).values(
+        'id', 'event_id', 'registration_date', 'status', 'payment_status',
+        registration_id=F('id'),
+        event_title=F('event__title'),
+        event_date=F('event__date'),
+        event_location=F('event__location'),
+        event_is_active=F('event__is_active'),
+    )
+
+
+class MergedRows:
+    """
+    Read a hot and an archived ``.values()`` queryset with the same keys
+    as one ordered sequence, for the page number and cursor paginators.
+
+    Ordering and filters apply to both querysets. A slice reads up to its
+    stop from each, in order (an index range scan per table), and merges
+    them in Python, so every backend behaves the same and neither table
+    is sorted as a whole.
+    """
+    def __init__(self, hot: QuerySet, archived: QuerySet, ordering: tuple[str, ...]) -> None:
+        """
+        Wrap the two querysets, ordered by ordering.
+        """
+        self.ordering = tuple(ordering)
+        self.hot = hot.order_by(*self.ordering)
+        self.archived = archived.order_by(*self.ordering)
+
+    @property
+    def ordered(self) -> bool:
+        """
+        Return True: the rows always have an ordering.
+        """
+        return True
+
+    def order_by(self, *ordering: str) -> 'MergedRows':
+        """
+        Return the rows ordered by ordering.
+        """
+        return MergedRows(self.hot, self.archived, ordering)
+
+    def filter(self, *args, **kwargs) -> 'MergedRows':
+        """
+        Return the rows of both querysets matching the filters.
+        """
+        return MergedRows(self.hot.filter(*args, **kwargs), self.archived.filter(*args, **kwargs), self.ordering)
+
+    def count(self) -> int:
+        """
+        Return the number of rows of both querysets.
+        """
+        return self.hot.count() + self.archived.count()
+
+    def __getitem__(self, index: slice) -> list[dict]:
+        """
+        Return a slice of the merged rows.
+        """
+        if not isinstance(index, slice) or index.step is not None or index.stop is None:
+            raise TypeError('MergedRows only supports [start:stop] slices.')
+        rows = list(chain(self.hot[:index.stop], self.archived[:index.stop]))
+        # Stable sorts, least significant key first, honour mixed directions
+        for field in reversed(self.ordering):
+            rows.sort(key=itemgetter(field.lstrip('-')), reverse=field.startswith('-'))
+        return rows[index.start or 0:index.stop]
@@ -0,0 +1,80 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponse
+from rest_framework import exceptions
+from rest_framework.request import Request
+from core.async_views import authenticate, cached_json_response, database_slot, json_response
+from .archive import includes_archived
+from .cache import alist_cache_key, adetail_cache_key, aget_cached_response, aget_or_build_response, acache_response
+from .models import Event, RegistrationFeedEntry
+from .pagination import RegistrationCursorPagination
+from .serializers import EventSerializer, RegistrationFeedSerializer, expands_event
+
+
+async def event_list(request: HttpRequest) -> HttpResponse | None:
+    """
+    Serve a cached event list without blocking a thread.
+
+    Cache misses fall through to EventViewSet.list, which validates the
+    filters and fills the cache.
+    """
+    if await authenticate(request) is None:
+        return None
+    entry = await aget_cached_response(await alist_cache_key(Request(request)))
+    if entry is None:
+        return None
+    return cached_json_response(request, entry)
+
+
+async def event_detail(request: HttpRequest, pk: str) -> HttpResponse | None:
+    """
+    Serve an event from the cache, loading it with the async ORM on a miss.
+
+    Concurrent misses of one event share a single load, as in
+    EventViewSet.cached_response.
+    """
+    if await authenticate(request) is None or not pk.isdigit():
+        return None
+    drf_request = Request(request)
+    key = await adetail_cache_key(drf_request, pk)
+
+    async def build() -> dict | None:
+        async with database_slot():
+            event = await Event.objects.select_related('organizer').filter(pk=pk).afirst()
+        if event is None:
+            return None
+        data = EventSerializer(event, context={'request': drf_request}).data
+        return await acache_response(key, data)
+
+    entry = await aget_or_build_response(key, build)
+    if entry is None:
+        return None
+    return cached_json_response(request, entry)
+
+
+async def registration_list(request: HttpRequest) -> HttpResponse | None:
+    """
+    Serve the current user's registration feed.
+
+    Mirrors EventRegistrationViewSet.list; the page query runs in a worker
+    thread because DRF paginators evaluate querysets synchronously. Requests
+    including archived registrations fall through to it.
+    """
+    user = await authenticate(request)
+    if user is None:
+        return None
+    drf_request = Request(request)
+    if includes_archived(drf_request):
+        return None
+    queryset = RegistrationFeedEntry.objects.filter(user_id=user.id)
+    if expands_event(drf_request):
+        queryset = queryset.select_related('event__organizer')
+
+    paginator = RegistrationCursorPagination()
+    try:
+        async with database_slot():
+            page = await sync_to_async(paginator.paginate_queryset)(queryset, drf_request)
+    except exceptions.NotFound:
+        return None
+    serializer = RegistrationFeedSerializer(page, many=True, context={'request': drf_request})
+    response = paginator.get_paginated_response(serializer.data)
+    return json_response(response.data)
@@ -0,0 +1,235 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Awaitable, Callable
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+LIST_VERSION_KEY = 'events:list:version'
+DETAIL_VERSION_KEY = 'events:detail:{event_id}:version'
+
+# Seconds between cache polls of a request waiting for a concurrent build
+COALESCE_POLL_INTERVAL = 0.02
+
+
+def _new_version() -> int:
+    """
+    Return a version that cannot collide with one issued before an eviction.
+    """
+    return time.time_ns()
+
+
+def _get_version(key: str) -> int:
+    """
+    Return the current version stored under key, creating it if needed.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def _aget_version(key: str) -> int:
+    """
+    Async version of _get_version.
+    """
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, _new_version(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def _bump_version(key: str) -> None:
+    """
+    Move key to a new version, orphaning every entry built on the old one.
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), timeout=None)
+
+
+def invalidate_event(event_id: int | None = None) -> None:
+    """
+    Invalidate the cached event lists and, if given, one event's detail.
+
+    Runs after the surrounding transaction commits so a concurrent reader
+    cannot re-cache the pre-commit state.
+    """
+    def bump() -> None:
+        _bump_version(LIST_VERSION_KEY)
+        if event_id is not None:
+            _bump_version(DETAIL_VERSION_KEY.format(event_id=event_id))
+
+    transaction.on_commit(bump)
+
+
+def _digest(value: str) -> str:
+    """
+    Return a short stable digest of value.
+    """
+    return hashlib.md5(value.encode('utf-8')).hexdigest()
+
+
+def _request_digest(request: Request) -> str:
+    """
+    Digest the host and query parameters a cached response depends on.
+
+    Query parameters are sorted so equivalent filter/page/fields
+    combinations share one entry.
+    """
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    )
+    return _digest(json.dumps([request.get_host(), params]))
+
+
+def _list_key(request: Request, version: int) -> str:
+    """
+    Build the cache key of an event list request for a list version.
+    """
+    return f'events:list:{version}:{_request_digest(request)}'
+
+
+def _detail_key(request: Request, event_id: int | str, version: int) -> str:
+    """
+    Build the cache key of an event detail request for a detail version.
+
+    ``?fields=``/``?omit=`` change the response, so the query parameters
+    are part of the key, as for lists.
+    """
+    return f'events:detail:{event_id}:{version}:{_request_digest(request)}'
+
+
+def list_cache_key(request: Request) -> str:
+    """
+    Build the cache key of an event list request.
+    """
+    return _list_key(request, _get_version(LIST_VERSION_KEY))
+
+
+def detail_cache_key(request: Request, event_id: int | str) -> str:
+    """
+    Build the cache key of an event detail request.
+    """
+    version = _get_version(DETAIL_VERSION_KEY.format(event_id=event_id))
+    return _detail_key(request, event_id, version)
+
+
+async def alist_cache_key(request: Request) -> str:
+    """
+    Async version of list_cache_key.
+    """
+    return _list_key(request, await _aget_version(LIST_VERSION_KEY))
+
+
+async def adetail_cache_key(request: Request, event_id: int | str) -> str:
+    """
+    Async version of detail_cache_key.
+    """
+    version = await _aget_version(DETAIL_VERSION_KEY.format(event_id=event_id))
+    return _detail_key(request, event_id, version)
+
+
+def get_cached_response(key: str) -> dict | None:
+    """
+    Return the cached ``{'data', 'etag'}`` entry stored under key.
+    """
+    return cache.get(key)
+
+
+async def aget_cached_response(key: str) -> dict | None:
+    """
+    Async version of get_cached_response.
+    """
+    return await cache.aget(key)
+
+
+def _cache_entry(data: dict | list) -> dict:
+    """
+    Build the cache entry of serialized response data with its ETag.
+    """
+    body = json.dumps(data, cls=JSONEncoder, sort_keys=True)
+    return {'data': data, 'etag': f'"{_digest(body)}"'}
+
+
+def cache_response(key: str, data: dict | list) -> dict:
+    """
+    Cache serialized response data together with its ETag.
+    """
+    entry = _cache_entry(data)
+    cache.set(key, entry, timeout=settings.EVENT_CACHE_TIMEOUT)
+    return entry
+
+
+async def acache_response(key: str, data: dict | list) -> dict:
+    """
+    Async version of cache_response.
+    """
+    entry = _cache_entry(data)
+    await cache.aset(key, entry, timeout=settings.EVENT_CACHE_TIMEOUT)
+    return entry
+
+
+def get_or_build_response(key: str, build: Callable[[], dict | None]) -> dict | None:
+    """
+    Return the cache entry under key, letting one request at a time build it.
+
+    On a miss the first request takes a lock for EVENT_COALESCE_TIMEOUT
+    seconds and runs build, which caches and returns the entry (None for
+    responses that are not cached). Concurrent requests for the same key
+    poll the cache instead of repeating the queries; they only build
+    themselves if the lock goes away without an entry or times out.
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, timeout=settings.EVENT_COALESCE_TIMEOUT):
+        try:
+            return build()
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + settings.EVENT_COALESCE_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(COALESCE_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+        if cache.get(lock_key) is None:
+            break
+    return cache.get(key) or build()
+
+
+async def aget_or_build_response(key: str, build: Callable[[], Awaitable[dict | None]]) -> dict | None:
+    """
+    Async version of get_or_build_response.
+    """
+    entry = await cache.aget(key)
+    if entry is not None:
+        return entry
+    lock_key = f'{key}:lock'
+    if await cache.aadd(lock_key, 1, timeout=settings.EVENT_COALESCE_TIMEOUT):
+        try:
+            return await build()
+        finally:
+            await cache.adelete(lock_key)
+
+    deadline = time.monotonic() + settings.EVENT_COALESCE_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(COALESCE_POLL_INTERVAL)
+        entry = await cache.aget(key)
+        if entry is not None:
+            return entry
+        if await cache.aget(lock_key) is None:
+            break
+    return await cache.aget(key) or await build()
@@ -0,0 +1,58 @@
+from typing import Iterable
+from django.db.models import QuerySet
+from .models import Event, EventRegistration, RegistrationFeedEntry
+
+EVENT_FIELDS = {
+    'event_title': 'title',
+    'event_date': 'date',
+    'event_location': 'location',
+    'event_is_active': 'is_active',
+}
+REGISTRATION_FIELDS = ['registration_date', 'status', 'payment_status']
+
+
+def feed_entry_values(registration: EventRegistration) -> dict:
+    """
+    Return the feed columns of a registration with its event loaded.
+    """
+    values = {
+        'registration_id': registration.id,
+        'user_id': registration.user_id,
+        'event_id': registration.event_id,
+    }
+    values.update({field: getattr(registration, field) for field in REGISTRATION_FIELDS})
+    values.update({
+        column: getattr(registration.event, field)
+        for column, field in EVENT_FIELDS.items()
+    })
+    return values
+
+
+def upsert_feed_entries(registrations: Iterable[EventRegistration]) -> None:
+    """
+    Insert or refresh the feed rows of registrations with a single statement.
+    """
+    entries = [RegistrationFeedEntry(**feed_entry_values(registration)) for registration in registrations]
+    if entries:
+        RegistrationFeedEntry.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=['registration'],
+            update_fields=['status', 'payment_status', *EVENT_FIELDS],
+        )
+
+
+def sync_registrations(registrations: QuerySet[EventRegistration]) -> None:
+    """
+    Bring the feed rows of the given registrations up to date.
+    """
+    upsert_feed_entries(registrations.select_related('event'))
+
+
+def sync_event(event: Event) -> None:
+    """
+    Copy an event's changed fields into the feed rows of its registrations.
+    """
+    RegistrationFeedEntry.objects.filter(event=event).update(**{
+        column: getattr(event, field) for column, field in EVENT_FIELDS.items()
+    })
@@ -1,15 +1,18 @@
 import django_filters
 from django.utils import timezone
-from .models import Event
+from .models import ArchivedEvent, Event
+from .search import search_events, search_terms
 from django.db import models
-from typing import QuerySet
+from django.db.models import Q, QuerySet
 
 class EventFilter(django_filters.FilterSet):
     """
     Filter for events.
     """
+    q = django_filters.CharFilter(method='filter_search')
     title = django_filters.CharFilter(lookup_expr='icontains')
     location = django_filters.CharFilter(lookup_expr='icontains')
+    organizer = django_filters.NumberFilter(field_name='organizer')
     min_date = django_filters.DateTimeFilter(field_name='date', lookup_expr='gte')
     max_date = django_filters.DateTimeFilter(field_name='date', lookup_expr='lte')
     min_price = django_filters.NumberFilter(field_name='price', lookup_expr='gte')
@@ -24,7 +27,7 @@ class EventFilter(django_filters.FilterSet):
         """
         model = Event
         fields = [
-            'title', 'location', 'min_date', 'max_date',
+            'q', 'title', 'location', 'organizer', 'min_date', 'max_date',
             'min_price', 'max_price', 'is_active',
             'has_available_seats', 'upcoming'
         ]
@@ -34,9 +37,15 @@ class EventFilter(django_filters.FilterSet):
         Filter events with available seats.
         """
         if value:
-            return queryset.filter(registrations__isnull=True) | queryset.annotate(
-                registration_count=models.Count('registrations')
-            ).filter(registration_count__lt=models.F('capacity'))
+            return queryset.filter(registered_count__lt=models.F('capacity'))
+        return queryset
+
+    def filter_search(self, queryset: QuerySet[Event], name: str, value: str) -> QuerySet[Event]:
+        """
+        Full-text search events, ranked by relevance.
+        """
+        if value:
+            return search_events(queryset, value)
         return queryset
 
     def filter_upcoming(self, queryset: QuerySet[Event], name: str, value: bool) -> QuerySet[Event]:
@@ -45,4 +54,32 @@ class EventFilter(django_filters.FilterSet):
         """
         if value:
             return queryset.filter(date__gt=timezone.now())
-        return queryset.filter(date__lte=timezone.now()) 
\ No newline at end of file
+        return queryset.filter(date__lte=timezone.now())
+
+class ArchivedEventFilter(EventFilter):
+    """
+    EventFilter for archived events, applied with the same query parameters.
+    """
+    class Meta(EventFilter.Meta):
+        """
+        Meta class for the ArchivedEventFilter.
+        """
+        model = ArchivedEvent
+
+    def filter_search(self, queryset: QuerySet[ArchivedEvent], name: str, value: str) -> QuerySet[ArchivedEvent]:
+        """
+        Match every search word in the title, location or description.
+
+        The archive has no full-text index; it is only searched by
+        ``?include_archived=true`` requests.
+        """
+        if not value:
+            return queryset
+        terms = search_terms(value)
+        if not terms:
+            return queryset.none()
+        for term in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term) | Q(location__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset
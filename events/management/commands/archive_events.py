@@ -0,0 +1,71 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+from events.archive import archivable_events, archive_cutoff, archive_event_batch
+from events.models import EventRegistration
+
+
+class Command(BaseCommand):
+    """
+    Move events past the retention window, and their registrations, to the archive tables.
+    """
+    help = (
+        'Archive the events dated more than EVENT_ARCHIVE_AFTER_DAYS days ago, oldest first, '
+        'one transaction per batch. An interrupted run can simply be started again.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help='Archive events dated more than this many days ago (default EVENT_ARCHIVE_AFTER_DAYS).'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Number of events archived per transaction (default EVENT_ARCHIVE_BATCH_SIZE).'
+        )
+        parser.add_argument(
+            '--max-batches', type=int, default=None,
+            help='Stop after this many batches; the next run carries on.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report how many events and registrations would be archived.'
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Archive the events in date ordered batches.
+        """
+        now = timezone.now()
+        cutoff = (
+            archive_cutoff(now) if options['days'] is None
+            else now - timedelta(days=options['days'])
+        )
+        if options['dry_run']:
+            events = archivable_events(cutoff).count()
+            registrations = EventRegistration.objects.filter(event__date__lt=cutoff).count()
+            self.stdout.write(self.style.SUCCESS(
+                f'{events} event(s) and {registrations} registration(s) dated before '
+                f'{cutoff:%Y-%m-%d %H:%M} would be archived.'
+            ))
+            return
+
+        batch_size = options['batch_size'] or settings.EVENT_ARCHIVE_BATCH_SIZE
+        events = registrations = batches = 0
+        while options['max_batches'] is None or batches < options['max_batches']:
+            archived_events, archived_registrations = archive_event_batch(cutoff, batch_size)
+            if not archived_events:
+                break
+            batches += 1
+            events += archived_events
+            registrations += archived_registrations
+            self.stdout.write(f'Batch {batches}: {archived_events} event(s), {archived_registrations} registration(s)')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{events} event(s) and {registrations} registration(s) dated before '
+            f'{cutoff:%Y-%m-%d %H:%M} archived.'
+        ))
@@ -0,0 +1,67 @@
+import time
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import Q
+from events.filters import EventFilter
+from events.models import Event
+
+
+class Command(BaseCommand):
+    """
+    Compare the ``q`` full-text filter with the icontains filters.
+    """
+    help = 'Time the events full-text search against the icontains title/location filters.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument('terms', nargs='+', help='Search terms to benchmark.')
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Number of timed runs per query.'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=10,
+            help='Rows fetched per query, like one API page.'
+        )
+
+    def time_queryset(self, build, repeat: int, limit: int) -> tuple[float, int]:
+        """
+        Return the mean milliseconds to fetch one page and the match count.
+        """
+        build().count()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            list(build()[:limit])
+        elapsed = (time.perf_counter() - start) * 1000 / repeat
+        return elapsed, build().count()
+
+    def handle(self, *args, **options) -> None:
+        """
+        Run every strategy for every term and print a timing table.
+        """
+        repeat = options['repeat']
+        limit = options['limit']
+        self.stdout.write(f'{Event.objects.count()} events, {repeat} runs per query\n')
+        self.stdout.write(f'{"term":<20}{"strategy":<40}{"ms/page":>10}{"matches":>10}')
+
+        for term in options['terms']:
+            strategies = {
+                'title icontains': lambda: EventFilter(
+                    {'title': term}, queryset=Event.objects.all()
+                ).qs,
+                'location icontains': lambda: EventFilter(
+                    {'location': term}, queryset=Event.objects.all()
+                ).qs,
+                'title|location|description icontains': lambda: Event.objects.filter(
+                    Q(title__icontains=term)
+                    | Q(location__icontains=term)
+                    | Q(description__icontains=term)
+                ),
+                'q full-text': lambda: EventFilter(
+                    {'q': term}, queryset=Event.objects.all()
+                ).qs,
+            }
+            for name, build in strategies.items():
+                elapsed, matches = self.time_queryset(build, repeat, limit)
+                self.stdout.write(f'{term:<20}{name:<40}{elapsed:>10.2f}{matches:>10}')
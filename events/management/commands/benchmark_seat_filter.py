@@ -0,0 +1,82 @@
+import time
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DatabaseError, models
+from django.db.models import QuerySet
+from events.models import Event
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the has_available_seats filter on the current data.
+    """
+    help = 'Time the seat counter filter against aggregate based alternatives.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Number of runs per strategy; the fastest run is reported.'
+        )
+        parser.add_argument(
+            '--page-size', type=int, default=10,
+            help='Number of events fetched for the first page.'
+        )
+        parser.add_argument(
+            '--aggregates', action='store_true',
+            help='Also time the aggregate strategies (slow on large datasets).'
+        )
+
+    def strategies(self) -> dict[str, QuerySet[Event]]:
+        """
+        Return the querysets compared by the benchmark.
+        """
+        events = Event.objects.all()
+        strategies = {
+            'seat counter': events.filter(registered_count__lt=models.F('capacity')),
+        }
+        if self.aggregates:
+            strategies['filtered Count annotation'] = events.annotate(
+                active=models.Count('registrations', filter=~models.Q(registrations__status='cancelled'))
+            ).filter(active__lt=models.F('capacity'))
+            # The original filter: an OR over a LEFT JOIN that repeats events
+            # and counts cancelled registrations as taken seats.
+            strategies['legacy OR + Count'] = events.filter(registrations__isnull=True) | events.annotate(
+                registration_count=models.Count('registrations')
+            ).filter(registration_count__lt=models.F('capacity'))
+        return strategies
+
+    def best_of(self, repeat: int, run) -> tuple[float, object]:
+        """
+        Return the fastest time in milliseconds and the result of run.
+        """
+        best = None
+        result = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = run()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def handle(self, *args, **options) -> None:
+        """
+        Time count() and the first page of every strategy.
+        """
+        self.aggregates = options['aggregates']
+        repeat = options['repeat']
+        page_size = options['page_size']
+        self.stdout.write(f'{Event.objects.count():,} events, best of {repeat} runs\n')
+        self.stdout.write(f'{"strategy":<28}{"count ms":>10}{"page ms":>10}{"rows":>12}{"distinct":>12}')
+        for name, queryset in self.strategies().items():
+            try:
+                count_ms, count = self.best_of(repeat, queryset.count)
+                page_ms, _ = self.best_of(
+                    repeat, lambda: list(queryset.order_by('-date', '-id')[:page_size])
+                )
+                distinct = queryset.values('pk').distinct().count()
+            except DatabaseError as e:
+                self.stdout.write(self.style.ERROR(f'{name:<28}failed: {e}'))
+                continue
+            self.stdout.write(f'{name:<28}{count_ms:>10.1f}{page_ms:>10.1f}{count:>12,}{distinct:>12,}')
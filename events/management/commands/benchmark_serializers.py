@@ -0,0 +1,69 @@
+import time
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.test import RequestFactory
+from rest_framework.request import Request
+from events.models import Event
+from events.serializers import EventSerializer, EventRowSerializer
+
+
+class Command(BaseCommand):
+    """
+    Microbenchmark the per-item cost of event list serialization.
+    """
+    help = 'Compare EventSerializer on model instances with EventRowSerializer on .values() rows.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument(
+            '--limit', type=int, default=1000,
+            help='Number of events serialized per run.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Number of runs per strategy; the fastest run is reported.'
+        )
+        parser.add_argument(
+            '--fields', default='id,title,date,available_seats',
+            help='Sparse fieldset used for the ?fields= runs.'
+        )
+
+    def measure(self, name: str, serialize, repeat: int) -> None:
+        """
+        Run serialize repeat times and print the best per-item cost.
+        """
+        best = None
+        count = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            count = len(serialize())
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        self.stdout.write(f'{name:<55}{best / count * 1_000_000:>10.1f} us/item')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Serialize the same events with every strategy.
+        """
+        queryset = Event.objects.select_related('organizer').order_by('-date', '-id')[:options['limit']]
+        count = queryset.count()
+        if not count:
+            raise CommandError('No events to serialize; create some events first.')
+
+        factory = RequestFactory()
+        full = Request(factory.get('/api/events/'))
+        sparse = Request(factory.get('/api/events/', {'fields': options['fields']}))
+
+        def instances(request: Request) -> list:
+            return EventSerializer(list(queryset), many=True, context={'request': request}).data
+
+        def rows(request: Request) -> list:
+            serializer = EventRowSerializer(request)
+            return [serializer.to_representation(row) for row in queryset.values(*serializer.columns)]
+
+        self.stdout.write(f'{count} events, best of {options["repeat"]} runs (query included)\n')
+        self.measure('EventSerializer, all fields', lambda: instances(full), options['repeat'])
+        self.measure('EventRowSerializer, all fields', lambda: rows(full), options['repeat'])
+        self.measure(f'EventSerializer, ?fields={options["fields"]}', lambda: instances(sparse), options['repeat'])
+        self.measure(f'EventRowSerializer, ?fields={options["fields"]}', lambda: rows(sparse), options['repeat'])
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from events.models import Event, EventRegistration
+
+
+class Command(BaseCommand):
+    """
+    Backfill and reconcile Event.registered_count with the registrations table.
+    """
+    help = 'Recompute the registered seat counter of every event from its non-cancelled registrations.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of events updated per transaction.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report events whose counter is out of sync.'
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Reconcile the counters in primary key ordered batches.
+        """
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        actual_count = Coalesce(
+            Subquery(
+                EventRegistration.objects.filter(event=OuterRef('pk'))
+                .exclude(status='cancelled')
+                .order_by()
+                .values('event')
+                .annotate(total=Count('pk'))
+                .values('total'),
+                output_field=IntegerField(),
+            ),
+            Value(0),
+        )
+
+        last_id = 0
+        drifted = 0
+        while True:
+            ids = list(
+                Event.objects.filter(pk__gt=last_id)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+
+            batch = Event.objects.filter(pk__in=ids).annotate(actual_count=actual_count)
+            out_of_sync = batch.exclude(registered_count=F('actual_count'))
+            if dry_run:
+                for event_id, stored, actual in out_of_sync.values_list('pk', 'registered_count', 'actual_count'):
+                    self.stdout.write(f'Event {event_id}: stored {stored}, actual {actual}')
+                    drifted += 1
+                continue
+
+            with transaction.atomic():
+                drifted += out_of_sync.count()
+                Event.objects.filter(pk__in=ids).update(registered_count=actual_count)
+
+        verb = 'out of sync' if dry_run else 'reconciled'
+        self.stdout.write(self.style.SUCCESS(f'{drifted} event(s) {verb}.'))
@@ -0,0 +1,61 @@
+import time
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from events.seeding import seed_events, seed_users
+
+
+class Command(BaseCommand):
+    """
+    Seed a large synthetic dataset for query benchmarks.
+    """
+    help = 'Create seed users, events and registrations (default 1M events / 50M registrations).'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument(
+            '--events', type=int, default=1_000_000,
+            help='Number of events to create.'
+        )
+        parser.add_argument(
+            '--registrations-per-event', type=int, default=50,
+            help='Registrations created for each event, one in ten cancelled.'
+        )
+        parser.add_argument(
+            '--users', type=int, default=100_000,
+            help='Number of seed users registering and organizing.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=10_000,
+            help='Number of events inserted per transaction.'
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Seed users, then events with their registrations in batches.
+        """
+        start = time.perf_counter()
+        first_user, last_user = seed_users(options['users'])
+        if last_user - first_user + 1 != options['users']:
+            raise CommandError('Seed user ids are not contiguous; seed into an empty database.')
+
+        def progress(events: int, registrations: int) -> None:
+            self.stdout.write(
+                f'{events:,} events, {registrations:,} registrations '
+                f'({time.perf_counter() - start:.0f}s)'
+            )
+
+        try:
+            registrations = seed_events(
+                options['events'],
+                options['registrations_per_event'],
+                (first_user, last_user),
+                batch_size=options['batch_size'],
+                progress=progress,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {options["events"]:,} events and {registrations:,} registrations '
+            f'in {time.perf_counter() - start:.0f}s.'
+        ))
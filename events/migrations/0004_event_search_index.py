@@ -0,0 +1,95 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# Frozen copies of the events.search names and document as of this migration
+SEARCH_INDEX_NAME = 'events_event_search_idx'
+FTS_TABLE = 'events_event_fts'
+
+
+def search_vector() -> SearchVector:
+    """
+    Return the weighted document the GIN index is built from.
+    """
+    return (
+        SearchVector('title', weight='A', config='english')
+        + SearchVector('location', weight='B', config='english')
+        + SearchVector('description', weight='C', config='english')
+    )
+
+SQLITE_FTS_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, location, description,
+        content='events_event', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON events_event BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, location, description)
+        VALUES (new.id, new.title, new.location, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON events_event BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, location, description)
+        VALUES ('delete', old.id, old.title, old.location, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF title, location, description ON events_event BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, location, description)
+        VALUES ('delete', old.id, old.title, old.location, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, location, description)
+        VALUES (new.id, new.title, new.location, new.description);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_FTS_SQL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Create the backend specific full-text index over title, location and description.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        Event = apps.get_model('events', 'Event')
+        schema_editor.add_index(Event, GinIndex(search_vector(), name=SEARCH_INDEX_NAME))
+    elif vendor == 'sqlite':
+        for sql in SQLITE_FTS_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    """
+    Drop the backend specific full-text index.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        Event = apps.get_model('events', 'Event')
+        schema_editor.remove_index(Event, GinIndex(search_vector(), name=SEARCH_INDEX_NAME))
+    elif vendor == 'sqlite':
+        for sql in SQLITE_DROP_FTS_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    """
+    Full-text search index for the events ``q`` filter.
+    """
+
+    dependencies = [
+        ('events', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:00
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_existing_registrations_confirmed(apps, schema_editor):
+    """
+    Registrations made before batched sending already got their email.
+    """
+    EventRegistration = apps.get_model('events', 'EventRegistration')
+    EventRegistration.objects.update(confirmation_sent_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventregistration',
+            name='confirmation_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(mark_existing_registrations_confirmed, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(condition=models.Q(('confirmation_sent_at__isnull', True)), fields=['id'], name='events_reg_unconfirmed_idx'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# The feed columns as of this migration, frozen so later changes to events.feed
+# cannot break it
+EVENT_FIELDS = {
+    'event_title': 'title',
+    'event_date': 'date',
+    'event_location': 'location',
+    'event_is_active': 'is_active',
+}
+REGISTRATION_FIELDS = ['registration_date', 'status', 'payment_status']
+
+
+def backfill_registration_feed(apps, schema_editor):
+    """
+    Build the feed rows of the existing registrations in primary key batches.
+    """
+    EventRegistration = apps.get_model('events', 'EventRegistration')
+    RegistrationFeedEntry = apps.get_model('events', 'RegistrationFeedEntry')
+    last_id = 0
+    while True:
+        registrations = list(
+            EventRegistration.objects.filter(pk__gt=last_id)
+            .select_related('event')
+            .order_by('pk')[:1000]
+        )
+        if not registrations:
+            break
+        RegistrationFeedEntry.objects.bulk_create(
+            [
+                RegistrationFeedEntry(
+                    registration_id=registration.id,
+                    user_id=registration.user_id,
+                    event_id=registration.event_id,
+                    **{field: getattr(registration, field) for field in REGISTRATION_FIELDS},
+                    **{column: getattr(registration.event, field) for column, field in EVENT_FIELDS.items()},
+                )
+                for registration in registrations
+            ],
+            update_conflicts=True,
+            unique_fields=['registration'],
+            update_fields=['status', 'payment_status', *EVENT_FIELDS],
+        )
+        last_id = registrations[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_registration_confirmation_sent_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationFeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('registration_date', models.DateTimeField()),
+                ('status', models.CharField(max_length=20)),
+                ('payment_status', models.CharField(max_length=20)),
+                ('event_title', models.CharField(max_length=200)),
+                ('event_date', models.DateTimeField()),
+                ('event_location', models.CharField(max_length=200)),
+                ('event_is_active', models.BooleanField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='events.event')),
+                ('registration', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entry', to='events.eventregistration')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-registration_date'],
+                'indexes': [models.Index(fields=['user', 'registration_date', 'id'], name='events_feed_user_date_id_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_registration_feed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_registration_feed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('registered_count__lt', models.F('capacity'))), fields=['date', 'id'], name='events_event_open_date_idx'),
+        ),
+    ]
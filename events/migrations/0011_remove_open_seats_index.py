@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_archive'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='events_event_open_date_idx',
+        ),
+    ]
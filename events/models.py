@@ -5,6 +5,7 @@ from django.utils import timezone
 
 User = get_user_model()
 
+
 class Event(models.Model):
     """
     Model representing an event.
@@ -19,13 +20,22 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    registered_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['-date']
         indexes = [
-            models.Index(fields=['date']),
             models.Index(fields=['location']),
-            models.Index(fields=['is_active']),
+            models.Index(fields=['date', 'id'], name='events_event_date_id_idx'),
+            models.Index(
+                fields=['date', 'id'],
+                name='events_event_active_date_idx',
+                condition=models.Q(is_active=True)
+            ),
+            models.Index(
+                fields=['organizer', 'date', 'id'],
+                name='events_event_org_date_idx'
+            ),
         ]
 
     def __str__(self) -> str:
@@ -39,7 +49,7 @@ class Event(models.Model):
         """
         Return the number of available seats for the event.
         """
-        return self.capacity - self.registrations.count()
+        return self.capacity - self.registered_count
 
     def is_registration_open(self) -> bool:
         """
@@ -47,6 +57,7 @@ class Event(models.Model):
         """
         return self.is_active and self.date > timezone.now()
 
+
 class EventRegistration(models.Model):
     """
     Model representing an event registration.
@@ -72,6 +83,7 @@ class EventRegistration(models.Model):
         ],
         default='pending'
     )
+    confirmation_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     class Meta:
         unique_together = ['event', 'user']
@@ -79,10 +91,156 @@ class EventRegistration(models.Model):
         indexes = [
             models.Index(fields=['status']),
             models.Index(fields=['payment_status']),
+            models.Index(
+                fields=['user', 'registration_date', 'id'],
+                name='events_reg_user_date_id_idx'
+            ),
+            models.Index(
+                fields=['event', 'registration_date', 'id'],
+                name='events_reg_event_date_id_idx'
+            ),
+            models.Index(
+                fields=['event', 'status', 'registration_date', 'id'],
+                name='events_reg_event_status_idx'
+            ),
+            models.Index(
+                fields=['id'],
+                name='events_reg_unconfirmed_idx',
+                condition=models.Q(confirmation_sent_at__isnull=True)
+            ),
         ]
 
     def __str__(self) -> str:
         """
         Return a string representation of the event registration.
         """
-        return f"{self.user.email} - {self.event.title}" 
\ No newline at end of file
+        return f"{self.user.email} - {self.event.title}"
+
+
+class RegistrationFeedEntry(models.Model):
+    """
+    Flattened copy of a registration and its event, read by the "my registrations" feed.
+    """
+    registration = models.OneToOneField(EventRegistration, on_delete=models.CASCADE, related_name='feed_entry')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', db_index=False)
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='+')
+    registration_date = models.DateTimeField()
+    status = models.CharField(max_length=20)
+    payment_status = models.CharField(max_length=20)
+    event_title = models.CharField(max_length=200)
+    event_date = models.DateTimeField()
+    event_location = models.CharField(max_length=200)
+    event_is_active = models.BooleanField()
+
+    class Meta:
+        ordering = ['-registration_date']
+        indexes = [
+            models.Index(
+                fields=['user', 'registration_date', 'id'],
+                name='events_feed_user_date_id_idx'
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the feed entry.
+        """
+        return f"{self.user_id} - {self.event_title}"
+
+
+class WaitlistEntry(models.Model):
+    """
+    A user waiting for a seat at a full event.
+
+    Entries are promoted to registrations in id (FIFO) order and deleted
+    once promoted.
+    """
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='waitlist')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='waitlist_entries')
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['event', 'user']
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['event', 'id'], name='events_waitlist_event_id_idx'),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the waitlist entry.
+        """
+        return f"{self.user_id} waiting for {self.event_id}"
+
+
+class ArchivedEvent(models.Model):
+    """
+    An event moved out of Event by archive_events, under its original id.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    date = models.DateTimeField()
+    location = models.CharField(max_length=200)
+    organizer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_events')
+    capacity = models.PositiveIntegerField()
+    price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    is_active = models.BooleanField(default=True)
+    registered_count = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date', 'id'], name='events_archived_date_id_idx'),
+            models.Index(fields=['organizer', 'date', 'id'], name='events_archived_org_date_idx'),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the archived event.
+        """
+        return f"{self.title} - {self.date.strftime('%Y-%m-%d %H:%M')}"
+
+    @property
+    def available_seats(self) -> int:
+        """
+        Return the number of seats that were left when the event was archived.
+        """
+        return self.capacity - self.registered_count
+
+    def is_registration_open(self) -> bool:
+        """
+        Return False: archived events are past.
+        """
+        return False
+
+
+class ArchivedRegistration(models.Model):
+    """
+    A registration moved out of EventRegistration with its event, under its original id.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    event = models.ForeignKey(ArchivedEvent, on_delete=models.CASCADE, related_name='registrations')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_registrations', db_index=False)
+    registration_date = models.DateTimeField()
+    status = models.CharField(max_length=20)
+    payment_status = models.CharField(max_length=20)
+    confirmation_sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-registration_date']
+        indexes = [
+            models.Index(
+                fields=['user', 'registration_date', 'id'],
+                name='events_archreg_user_date_idx'
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the archived registration.
+        """
+        return f"{self.user_id} - {self.event_id}"
@@ -0,0 +1,77 @@
+from rest_framework import pagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.db.models import QuerySet
+
+
+class SelectableCursorPagination(pagination.CursorPagination):
+    """
+    Cursor pagination that clients opt into per request.
+
+    Requests with ``?pagination=cursor`` or a ``cursor`` token get keyset
+    pages (no OFFSET, no COUNT); all other requests keep the default page
+    number pagination and its response format. Cursor pages are always in
+    ``ordering``, so querysets ordered otherwise (search results ranked by
+    relevance) are refused rather than silently re-ordered.
+    """
+    pagination_query_param = 'pagination'
+    fallback_class = pagination.PageNumberPagination
+
+    def use_cursor(self, request: Request) -> bool:
+        """
+        Return True if the request asked for cursor pagination.
+        """
+        return (
+            request.query_params.get(self.pagination_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: APIView = None) -> list | None:
+        """
+        Paginate the queryset with the paginator selected by the request.
+        """
+        self.fallback = None
+        if not self.use_cursor(request):
+            self.fallback = self.fallback_class()
+            page = self.fallback.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self.fallback.display_page_controls
+            return page
+        explicit_ordering = getattr(getattr(queryset, 'query', None), 'order_by', ())
+        if explicit_ordering and tuple(explicit_ordering) != tuple(self.ordering):
+            raise ValidationError({
+                self.pagination_query_param: 'Cursor pagination is not available for results in this order '
+                '(e.g. ranked search results); use page numbers.'
+            })
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: list) -> Response:
+        """
+        Return the paginated response of the selected paginator.
+        """
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self) -> str:
+        """
+        Render the browsable API page controls of the selected paginator.
+        """
+        if self.fallback is not None:
+            return self.fallback.to_html()
+        return super().to_html()
+
+
+class EventCursorPagination(SelectableCursorPagination):
+    """
+    Pagination for events keyed on (date, id).
+    """
+    ordering = ('-date', '-id')
+
+
+class RegistrationCursorPagination(SelectableCursorPagination):
+    """
+    Pagination for registrations keyed on (registration_date, id).
+    """
+    ordering = ('-registration_date', '-id')
@@ -0,0 +1,88 @@
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import FloatField, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+SEARCH_CONFIG = 'english'
+SEARCH_INDEX_NAME = 'events_event_search_idx'
+FTS_TABLE = 'events_event_fts'
+
+
+def search_vector() -> SearchVector:
+    """
+    Return the weighted document searched by the ``q`` filter.
+
+    The PostgreSQL GIN index is built from this exact expression (frozen
+    in migration 0004), so a change needs a migration rebuilding the index
+    for the planner to keep using it.
+    """
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('location', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def search_terms(query: str) -> list[str]:
+    """
+    Split free text into search words, dropping any query syntax.
+    """
+    return re.findall(r'\w+', query)
+
+
+def tsquery_expression(query: str) -> str:
+    """
+    Turn free text into a raw tsquery matching every word as a prefix.
+    """
+    return ' & '.join(f'{term}:*' for term in search_terms(query))
+
+
+def fts5_match_expression(query: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression of quoted prefix terms.
+
+    Quoting every word keeps FTS5 operators in user input from being
+    interpreted as query syntax.
+    """
+    return ' '.join(f'"{term}"*' for term in search_terms(query))
+
+
+def search_events(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Full-text search events by title, location and description, best match first.
+
+    Every word must match the start of a word in the document. Uses the
+    GIN-indexed tsvector on PostgreSQL and the FTS5 table on SQLite; other
+    backends fall back to case-insensitive containment.
+    """
+    vendor = connections[queryset.db].vendor
+    if not search_terms(query):
+        return queryset.none()
+
+    if vendor == 'postgresql':
+        search_query = SearchQuery(tsquery_expression(query), config=SEARCH_CONFIG, search_type='raw')
+        return queryset.annotate(
+            search=search_vector(),
+            search_rank=SearchRank(search_vector(), search_query),
+        ).filter(search=search_query).order_by('-search_rank', '-date', '-id')
+
+    if vendor == 'sqlite':
+        match = fts5_match_expression(query)
+        table = queryset.model._meta.db_table
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}, 10.0, 5.0, 1.0) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+                [match],
+                output_field=FloatField(),
+            )
+        ).order_by('-search_rank', '-date', '-id')
+
+    return queryset.filter(
+        Q(title__icontains=query)
+        | Q(location__icontains=query)
+        | Q(description__icontains=query)
+    )
@@ -0,0 +1,135 @@
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import Event, EventRegistration, RegistrationFeedEntry
+
+User = get_user_model()
+
+SEED_EMAIL_DOMAIN = 'seed.invalid'
+LOCATIONS = ['City Center', 'Harbour Hall', 'North Campus', 'Riverside Park', 'Old Town']
+TOPICS = ['jazz concert', 'python meetup', 'food festival', 'design workshop', 'charity run']
+# One registration in ten is cancelled and one event in four is full.
+CANCELLED_EVERY = 10
+FULL_EVERY = 4
+SPARE_SEATS = 25
+
+REGISTRATIONS_SQL = """
+WITH RECURSIVE slots(j) AS (
+    SELECT 0 UNION ALL SELECT j + 1 FROM slots WHERE j + 1 < %(per_event)s
+)
+INSERT INTO {registrations} (event_id, user_id, registration_date, status, payment_status, confirmation_sent_at)
+SELECT
+    e.id,
+    %(first_user)s + ((e.id * 31 + slots.j) %% %(users)s),
+    %(now)s,
+    CASE WHEN slots.j %% {cancelled_every} = {cancelled_slot} THEN 'cancelled' ELSE 'confirmed' END,
+    CASE WHEN slots.j %% 2 = 0 THEN 'paid' ELSE 'pending' END,
+    %(now)s
+FROM {events} e CROSS JOIN slots
+WHERE e.id BETWEEN %(first_event)s AND %(last_event)s
+"""
+
+FEED_SQL = """
+INSERT INTO {feed} (
+    registration_id, user_id, event_id, registration_date, status, payment_status,
+    event_title, event_date, event_location, event_is_active
+)
+SELECT r.id, r.user_id, r.event_id, r.registration_date, r.status, r.payment_status,
+       e.title, e.date, e.location, e.is_active
+FROM {registrations} r JOIN {events} e ON e.id = r.event_id
+WHERE r.event_id BETWEEN %(first_event)s AND %(last_event)s
+"""
+
+
+def active_registrations(per_event: int) -> int:
+    """
+    Return the number of non-cancelled registrations seeded per event.
+    """
+    return per_event - per_event // CANCELLED_EVERY
+
+
+def seed_users(count: int, batch_size: int = 10000) -> tuple[int, int]:
+    """
+    Make sure count seed users exist and return their id range.
+
+    Users left by an earlier run are reused.
+    """
+    seeded = User.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}')
+    for start in range(seeded.count(), count, batch_size):
+        User.objects.bulk_create([
+            User(
+                username=f'seed{index}',
+                email=f'seed{index}@{SEED_EMAIL_DOMAIN}',
+                password='!',
+                first_name=f'Seed {index}',
+            )
+            for index in range(start, min(start + batch_size, count))
+        ], batch_size=batch_size)
+    ids = seeded.order_by('id').values_list('id', flat=True)[:count]
+    return ids[0], ids[count - 1]
+
+
+def build_event(index: int, organizer_id: int, per_event: int, now) -> Event:
+    """
+    Build the unsaved seed event number index.
+    """
+    registered = active_registrations(per_event)
+    full = index % FULL_EVERY == 0
+    return Event(
+        title=f'{TOPICS[index % len(TOPICS)].title()} #{index}',
+        description=f'Seeded {TOPICS[index % len(TOPICS)]} number {index} for benchmarks.',
+        date=now + timedelta(days=index % 365 + 1, seconds=index),
+        location=LOCATIONS[index % len(LOCATIONS)],
+        organizer_id=organizer_id,
+        capacity=registered if full else registered + SPARE_SEATS,
+        registered_count=registered,
+        price=index % 50,
+        is_active=index % 20 != 0,
+    )
+
+
+def seed_events(count: int, per_event: int, users: tuple[int, int], batch_size: int = 10000, progress=None) -> int:
+    """
+    Create count events with per_event registrations each, plus their feed rows.
+
+    Events are inserted with the ORM; registrations and feed rows are
+    generated by the database with one INSERT ... SELECT per batch, so a
+    50M registration fixture never goes through Python objects. Returns
+    the number of registrations created.
+    """
+    first_user, last_user = users
+    user_count = last_user - first_user + 1
+    if per_event > user_count:
+        raise ValueError('Cannot seed more registrations per event than there are users.')
+    tables = {
+        'events': connection.ops.quote_name(Event._meta.db_table),
+        'registrations': connection.ops.quote_name(EventRegistration._meta.db_table),
+        'feed': connection.ops.quote_name(RegistrationFeedEntry._meta.db_table),
+        'cancelled_every': CANCELLED_EVERY,
+        'cancelled_slot': CANCELLED_EVERY - 1,
+    }
+    now = timezone.now()
+    created = 0
+    for start in range(0, count, batch_size):
+        with transaction.atomic():
+            events = Event.objects.bulk_create([
+                build_event(index, first_user + index % user_count, per_event, now)
+                for index in range(start, min(start + batch_size, count))
+            ], batch_size=batch_size)
+            if per_event:
+                params = {
+                    'per_event': per_event,
+                    'first_user': first_user,
+                    'users': user_count,
+                    'now': connection.ops.adapt_datetimefield_value(now),
+                    'first_event': min(event.id for event in events),
+                    'last_event': max(event.id for event in events),
+                }
+                with connection.cursor() as cursor:
+                    cursor.execute(REGISTRATIONS_SQL.format(**tables), params)
+                    cursor.execute(FEED_SQL.format(**tables), params)
+                created += len(events) * per_event
+        if progress:
+            progress(start + len(events), created)
+    return created
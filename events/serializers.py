@@ -1,11 +1,12 @@
 from rest_framework import serializers
-from .models import Event, EventRegistration
+from .models import ArchivedEvent, Event, EventRegistration, RegistrationFeedEntry, WaitlistEntry
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from core.serializers import SparseFieldsetMixin, select_fields
 
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the User model.
     """
@@ -16,7 +17,7 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'email', 'first_name', 'last_name']
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the Event model.
     """
@@ -36,6 +37,79 @@ class EventSerializer(serializers.ModelSerializer):
             'is_registration_open'
         ]
 
+class ArchivedEventSerializer(EventSerializer):
+    """
+    Serializer for the ArchivedEvent model, with the output of EventSerializer.
+    """
+    class Meta(EventSerializer.Meta):
+        """
+        Meta class for the ArchivedEventSerializer.
+        """
+        model = ArchivedEvent
+
+class EventRowSerializer:
+    """
+    Read-only serializer building EventSerializer output from ``.values()`` rows.
+
+    No model or serializer is instantiated per row: stored fields are
+    copied from the row and only dates and decimals go through the
+    matching EventSerializer field for formatting.
+    """
+    formatted_fields = (serializers.DateTimeField, serializers.DecimalField)
+    organizer_fields = UserSerializer.Meta.fields
+    # The cursor paginator reads its ordering keys from every row.
+    key_columns = ('id', 'date')
+
+    def __init__(self, request=None) -> None:
+        """
+        Select the output fields of the request and their formatters.
+        """
+        template = EventSerializer()
+        self.field_names = select_fields(request, EventSerializer.Meta.fields)
+        self.formatters = {
+            name: field.to_representation
+            for name, field in template.fields.items()
+            if isinstance(field, self.formatted_fields)
+        }
+        self.now = timezone.now()
+
+    @property
+    def columns(self) -> list[str]:
+        """
+        Return the columns to pass to ``.values()``.
+        """
+        columns = set(self.key_columns)
+        for name in self.field_names:
+            if name == 'organizer':
+                columns.update(f'organizer__{field}' for field in self.organizer_fields)
+            elif name == 'available_seats':
+                columns.update(['capacity', 'registered_count'])
+            elif name == 'is_registration_open':
+                columns.update(['is_active', 'date'])
+            else:
+                columns.add(name)
+        return sorted(columns)
+
+    def to_representation(self, row: dict) -> dict:
+        """
+        Return the serialized representation of one row.
+        """
+        data = {}
+        for name in self.field_names:
+            if name == 'organizer':
+                data[name] = None if row['organizer__id'] is None else {
+                    field: row[f'organizer__{field}'] for field in self.organizer_fields
+                }
+            elif name == 'available_seats':
+                data[name] = row['capacity'] - row['registered_count']
+            elif name == 'is_registration_open':
+                data[name] = row['is_active'] and row['date'] > self.now
+            else:
+                value = row[name]
+                formatter = self.formatters.get(name)
+                data[name] = formatter(value) if formatter and value is not None else value
+        return data
+
 class EventCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating an Event.
@@ -55,7 +129,7 @@ class EventCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Event date cannot be in the past")
         return value
 
-class EventRegistrationSerializer(serializers.ModelSerializer):
+class EventRegistrationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the EventRegistration model.
     """
@@ -73,31 +147,92 @@ class EventRegistrationSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['user', 'registration_date']
 
-class EventRegistrationCreateSerializer(serializers.ModelSerializer):
+class WaitlistEntrySerializer(serializers.ModelSerializer):
     """
-    Serializer for creating an EventRegistration.
+    Serializer for the WaitlistEntry model.
     """
+    position = serializers.SerializerMethodField()
+
     class Meta:
         """
-        Meta class for the EventRegistrationCreateSerializer.
+        Meta class for the WaitlistEntrySerializer.
         """
-        model = EventRegistration
-        fields = ['event']
+        model = WaitlistEntry
+        fields = ['id', 'event', 'user', 'joined_at', 'position']
+        read_only_fields = fields
+
+    def get_position(self, obj: WaitlistEntry) -> int:
+        """
+        Return the 1-based place of the entry in the event's queue.
+        """
+        return WaitlistEntry.objects.filter(event_id=obj.event_id, id__lte=obj.id).count()
+
+class RegistrationFeedSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Compact serializer for the "my registrations" feed.
 
-    def validate(self, data: dict) -> dict:
+    The nested event is only included with ``?expand=event``.
+    """
+    id = serializers.IntegerField(source='registration_id', read_only=True)
+    event_id = serializers.IntegerField(read_only=True)
+    event = EventSerializer(read_only=True)
+
+    class Meta:
         """
-        Validate the data for the EventRegistrationCreateSerializer.
+        Meta class for the RegistrationFeedSerializer.
         """
-        event = data['event']
-        user = self.context['request'].user
+        model = RegistrationFeedEntry
+        fields = [
+            'id', 'event_id', 'event_title', 'event_date', 'event_location',
+            'event_is_active', 'registration_date', 'status', 'payment_status',
+            'event'
+        ]
 
-        if not event.is_registration_open():
-            raise serializers.ValidationError("Event registration is closed")
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Drop the nested event unless the request expands it.
+        """
+        super().__init__(*args, **kwargs)
+        if not expands_event(self.context.get('request')):
+            self.fields.pop('event', None)
 
-        if event.available_seats <= 0:
-            raise serializers.ValidationError("No available seats")
+def expands_event(request) -> bool:
+    """
+    Return True if the request asked for ``?expand=event``.
+    """
+    if request is None:
+        return False
+    return 'event' in request.query_params.get('expand', '').split(',')
+
+class BulkRegistrationSerializer(serializers.Serializer):
+    """
+    Serializer for registering several users for an event at once.
+    """
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000
+    )
 
-        if EventRegistration.objects.filter(event=event, user=user).exists():
-            raise serializers.ValidationError("You are already registered for this event")
+    def validate_user_ids(self, value: list[int]) -> list[int]:
+        """
+        Deduplicate the user ids and check that every user exists.
+        """
+        user_ids = list(dict.fromkeys(value))
+        found = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True))
+        missing = [user_id for user_id in user_ids if user_id not in found]
+        if missing:
+            raise serializers.ValidationError(
+                f"Unknown users: {', '.join(map(str, missing))}"
+            )
+        return user_ids
 
-        return data 
\ No newline at end of file
+class BulkCancelSerializer(serializers.Serializer):
+    """
+    Serializer for cancelling several registrations at once.
+    """
+    registration_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000
+    )
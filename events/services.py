@@ -0,0 +1,370 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, F, OuterRef, QuerySet
+from django.utils import timezone
+from .models import Event, EventRegistration, WaitlistEntry
+from .cache import invalidate_event
+from .feed import sync_registrations
+from core.outbox import enqueue
+from notifications.tasks import send_event_registration_email, send_event_registration_emails
+
+
+class RegistrationError(Exception):
+    """
+    Base class for errors raised while registering for an event.
+    """
+    message = 'Registration failed'
+
+    def __init__(self, message: str | None = None) -> None:
+        """
+        Initialise the error with an optional custom message.
+        """
+        super().__init__(message or self.message)
+        self.message = message or self.message
+
+
+class RegistrationClosed(RegistrationError):
+    """
+    Raised when the event is inactive or already started.
+    """
+    message = 'Event registration is closed'
+
+
+class EventFull(RegistrationError):
+    """
+    Raised when no seat could be claimed.
+    """
+    message = 'No available seats'
+
+
+class AlreadyRegistered(RegistrationError):
+    """
+    Raised when the user already holds a registration for the event.
+    """
+    message = 'You are already registered for this event'
+
+
+class AlreadyWaitlisted(RegistrationError):
+    """
+    Raised when the user is already on the event's waitlist.
+    """
+    message = 'You are already on the waitlist for this event'
+
+
+class SeatsAvailable(RegistrationError):
+    """
+    Raised when joining the waitlist of an event that has a seat to claim.
+    """
+    message = 'Seats are still available, register for the event instead'
+
+
+def claim_seats(event_id: int, seats: int = 1) -> bool:
+    """
+    Claim seats with a single conditional UPDATE.
+
+    The row is only updated while registration is open and enough seats
+    remain, so concurrent callers can never push registered_count past
+    capacity. While users wait on the event's waitlist no seat is claimed:
+    freed seats go to them first, in order. Must run inside the caller's
+    transaction so a later failure releases the claim.
+    """
+    updated = Event.objects.filter(
+        ~Exists(WaitlistEntry.objects.filter(event_id=OuterRef('pk'))),
+        pk=event_id,
+        is_active=True,
+        date__gt=timezone.now(),
+        registered_count__lte=F('capacity') - seats,
+    ).update(registered_count=F('registered_count') + seats)
+    return updated == 1
+
+
+def _unavailable_error(event: Event, seats: int = 1) -> RegistrationError:
+    """
+    Explain why a seat claim failed.
+    """
+    event.refresh_from_db(fields=['is_active', 'date', 'registered_count', 'capacity'])
+    if not event.is_registration_open():
+        return RegistrationClosed()
+    if seats > 1:
+        return EventFull(f'Not enough available seats for {seats} registrations')
+    return EventFull()
+
+
+def register_user(event: Event, user) -> EventRegistration:
+    """
+    Register a user for an event without overbooking it.
+
+    A previously cancelled registration is re-activated instead of
+    inserting a second row for the same user and event. The confirmation
+    email is queued through the outbox in the same transaction.
+    """
+    if EventRegistration.objects.filter(event=event, user=user).exclude(status='cancelled').exists():
+        raise AlreadyRegistered()
+
+    try:
+        with transaction.atomic():
+            if not claim_seats(event.pk):
+                raise _unavailable_error(event)
+
+            registration = (
+                EventRegistration.objects.select_for_update()
+                .filter(event=event, user=user)
+                .first()
+            )
+            if registration is None:
+                registration = EventRegistration.objects.create(event=event, user=user)
+            elif registration.status == 'cancelled':
+                registration.status = 'pending'
+                registration.confirmation_sent_at = None
+                registration.save(update_fields=['status', 'confirmation_sent_at'])
+            else:
+                raise AlreadyRegistered()
+            sync_registrations(EventRegistration.objects.filter(pk=registration.pk))
+            invalidate_event(event.pk)
+            enqueue(
+                send_event_registration_email,
+                user_id=user.id,
+                event_id=event.pk,
+                registration_id=registration.pk,
+            )
+    except IntegrityError:
+        raise AlreadyRegistered()
+
+    event.refresh_from_db(fields=['registered_count'])
+    return registration
+
+
+def register_users(event: Event, user_ids: list[int]) -> list[EventRegistration]:
+    """
+    Register several users for an event in one transaction.
+
+    Capacity is claimed once for the whole batch, so either every user
+    gets a seat or none does. Cancelled registrations are re-activated and
+    the rest inserted with a single bulk_create.
+    """
+    existing = dict(
+        EventRegistration.objects.filter(event=event, user_id__in=user_ids)
+        .values_list('user_id', 'status')
+    )
+    registered = sorted(user_id for user_id, status in existing.items() if status != 'cancelled')
+    if registered:
+        raise AlreadyRegistered(
+            f"Users already registered for this event: {', '.join(map(str, registered))}"
+        )
+    cancelled = [user_id for user_id in user_ids if user_id in existing]
+    new = [user_id for user_id in user_ids if user_id not in existing]
+
+    try:
+        with transaction.atomic():
+            if not claim_seats(event.pk, len(user_ids)):
+                raise _unavailable_error(event, len(user_ids))
+
+            reactivated = EventRegistration.objects.filter(
+                event=event, user_id__in=cancelled, status='cancelled'
+            ).update(status='pending', confirmation_sent_at=None)
+            if reactivated != len(cancelled):
+                raise AlreadyRegistered()
+
+            EventRegistration.objects.bulk_create([
+                EventRegistration(event=event, user_id=user_id) for user_id in new
+            ])
+            registrations = EventRegistration.objects.filter(event=event, user_id__in=user_ids)
+            sync_registrations(registrations)
+            invalidate_event(event.pk)
+            registration_list = list(registrations.select_related('user', 'event__organizer'))
+            enqueue(
+                send_event_registration_emails,
+                event_id=event.pk,
+                registration_ids=[registration.id for registration in registration_list],
+            )
+    except IntegrityError:
+        raise AlreadyRegistered()
+
+    event.refresh_from_db(fields=['registered_count'])
+    return registration_list
+
+
+def cancel_registration(registration: EventRegistration) -> bool:
+    """
+    Cancel a registration and release its seat.
+
+    The status flip is a conditional UPDATE, so concurrent cancels of the
+    same registration release the seat only once. Returns False if the
+    registration was already cancelled. Nested in a caller's transaction
+    it joins it without a savepoint.
+    """
+    with transaction.atomic(savepoint=False):
+        updated = (
+            EventRegistration.objects.filter(pk=registration.pk)
+            .exclude(status='cancelled')
+            .update(status='cancelled')
+        )
+        if updated:
+            Event.objects.filter(pk=registration.event_id, registered_count__gt=0).update(
+                registered_count=F('registered_count') - 1
+            )
+            sync_registrations(EventRegistration.objects.filter(pk=registration.pk))
+            invalidate_event(registration.event_id)
+    registration.status = 'cancelled'
+    return bool(updated)
+
+
+def change_registration_status(registration: EventRegistration, status: str) -> bool:
+    """
+    Move a registration to status, releasing or claiming its seat.
+
+    Cancelling goes through cancel_registration. Moving a cancelled
+    registration back is a conditional UPDATE on its status, and the seat
+    is claimed only if that UPDATE changed the row, so concurrent requests
+    release or claim a seat once. Returns True if a seat was released;
+    raises a RegistrationError if no seat could be claimed. Nested in a
+    caller's transaction it joins it without a savepoint.
+    """
+    if status == 'cancelled':
+        return cancel_registration(registration)
+    with transaction.atomic(savepoint=False):
+        reactivated = (
+            EventRegistration.objects.filter(pk=registration.pk, status='cancelled')
+            .update(status=status)
+        )
+        if reactivated:
+            if not claim_seats(registration.event_id):
+                raise _unavailable_error(registration.event)
+            invalidate_event(registration.event_id)
+        else:
+            EventRegistration.objects.filter(pk=registration.pk).exclude(status='cancelled').update(status=status)
+        sync_registrations(EventRegistration.objects.filter(pk=registration.pk))
+    registration.refresh_from_db(fields=['status'])
+    return False
+
+
+def cancel_registrations(registrations: QuerySet[EventRegistration]) -> list[int]:
+    """
+    Cancel every active, upcoming registration in the queryset.
+
+    Seats are released with one UPDATE per affected event. Returns the ids
+    of the registrations that were cancelled. Nested in a caller's
+    transaction it joins it without a savepoint.
+    """
+    with transaction.atomic(savepoint=False):
+        cancellable = (
+            registrations.select_for_update(of=('self',))
+            .exclude(status='cancelled')
+            .filter(event__date__gt=timezone.now())
+        )
+        registration_ids = list(cancellable.values_list('pk', flat=True))
+        seats_per_event = list(
+            EventRegistration.objects.filter(pk__in=registration_ids)
+            .order_by()
+            .values('event')
+            .annotate(seats=Count('pk'))
+        )
+
+        EventRegistration.objects.filter(pk__in=registration_ids).update(status='cancelled')
+        sync_registrations(EventRegistration.objects.filter(pk__in=registration_ids))
+        for row in seats_per_event:
+            Event.objects.filter(pk=row['event'], registered_count__gte=row['seats']).update(
+                registered_count=F('registered_count') - row['seats']
+            )
+            invalidate_event(row['event'])
+    return registration_ids
+
+
+def join_waitlist(event: Event, user) -> WaitlistEntry:
+    """
+    Put a user at the end of an event's waitlist.
+
+    Only events a registration cannot get into (no free seat, or users
+    already waiting for the free ones) take new entries, otherwise the
+    entry would block claim_seats for everyone until a promotion ran. The
+    event row is locked so a seat freed concurrently either is seen here
+    or sees the new entry and queues its promotion.
+    """
+    if not event.is_registration_open():
+        raise RegistrationClosed()
+    if EventRegistration.objects.filter(event=event, user=user).exclude(status='cancelled').exists():
+        raise AlreadyRegistered()
+    try:
+        with transaction.atomic():
+            locked = Event.objects.select_for_update().get(pk=event.pk)
+            if (
+                locked.registered_count < locked.capacity
+                and not WaitlistEntry.objects.filter(event_id=event.pk).exists()
+            ):
+                raise SeatsAvailable()
+            return WaitlistEntry.objects.create(event=event, user=user)
+    except IntegrityError:
+        raise AlreadyWaitlisted()
+
+
+def leave_waitlist(event: Event, user) -> bool:
+    """
+    Take a user off an event's waitlist. Returns False if they were not on it.
+    """
+    deleted, _ = WaitlistEntry.objects.filter(event=event, user=user).delete()
+    return bool(deleted)
+
+
+def _promote_batch(event_id: int, batch_size: int) -> tuple[int, list[int]]:
+    """
+    Promote the next waitlisted users of an event into its free seats.
+
+    Runs in one transaction holding the event row lock, so concurrent
+    cancellations, registrations and promoters all see one seat count.
+    The promoted users' confirmation emails are queued through the outbox
+    in the same transaction. Returns the number of waitlist entries consumed and the ids of the
+    registrations created or re-activated.
+    """
+    with transaction.atomic():
+        event = Event.objects.select_for_update().filter(pk=event_id).first()
+        if event is None or not event.is_registration_open():
+            return 0, []
+        free_seats = event.capacity - event.registered_count
+        if free_seats <= 0:
+            return 0, []
+        entries = list(
+            WaitlistEntry.objects.filter(event_id=event_id)
+            .order_by('id')
+            .values_list('id', 'user_id')[:min(free_seats, batch_size)]
+        )
+        if not entries:
+            return 0, []
+
+        user_ids = [user_id for _, user_id in entries]
+        existing = dict(
+            EventRegistration.objects.filter(event_id=event_id, user_id__in=user_ids)
+            .values_list('user_id', 'status')
+        )
+        cancelled = [user_id for user_id in user_ids if existing.get(user_id) == 'cancelled']
+        new = [user_id for user_id in user_ids if user_id not in existing]
+        promoted = cancelled + new
+
+        EventRegistration.objects.filter(
+            event_id=event_id, user_id__in=cancelled, status='cancelled'
+        ).update(status='pending', confirmation_sent_at=None)
+        EventRegistration.objects.bulk_create([
+            EventRegistration(event_id=event_id, user_id=user_id) for user_id in new
+        ])
+        Event.objects.filter(pk=event_id).update(registered_count=F('registered_count') + len(promoted))
+        WaitlistEntry.objects.filter(id__in=[entry_id for entry_id, _ in entries]).delete()
+
+        registrations = EventRegistration.objects.filter(event_id=event_id, user_id__in=promoted)
+        sync_registrations(registrations)
+        invalidate_event(event_id)
+        registration_ids = list(registrations.values_list('id', flat=True))
+        enqueue(send_event_registration_emails, event_id=event_id, registration_ids=registration_ids)
+        return len(entries), registration_ids
+
+
+def promote_waitlisted_users(event_id: int, batch_size: int) -> list[int]:
+    """
+    Fill an event's free seats from its waitlist in FIFO order.
+
+    Each batch of at most batch_size users is promoted in its own short
+    transaction. Returns the ids of the promoted registrations.
+    """
+    registration_ids = []
+    while True:
+        consumed, promoted = _promote_batch(event_id, batch_size)
+        if not consumed:
+            return registration_ids
+        registration_ids.extend(promoted)
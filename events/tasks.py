@@ -0,0 +1,50 @@
+from typing import Iterable
+from celery import shared_task
+from django.conf import settings
+from core.outbox import enqueue
+from .archive import archive_cutoff, archive_event_batch
+from .models import WaitlistEntry
+from .services import promote_waitlisted_users
+
+
+@shared_task
+def promote_waitlist(event_id: int) -> None:
+    """
+    Fill an event's free seats from its waitlist and email the promoted users.
+    """
+    try:
+        promote_waitlisted_users(event_id, settings.WAITLIST_PROMOTION_BATCH_SIZE)
+    except Exception as e:
+        print(f"Error promoting waitlist of event {event_id}: {str(e)}")
+        raise
+
+
+@shared_task
+def archive_past_events() -> None:
+    """
+    Periodically move the events past the retention window to the archive.
+    """
+    try:
+        cutoff = archive_cutoff()
+        while archive_event_batch(cutoff)[0]:
+            pass
+    except Exception as e:
+        print(f"Error archiving past events: {str(e)}")
+        raise
+
+
+def schedule_waitlist_promotion(event_ids: Iterable[int]) -> None:
+    """
+    Queue a promotion run, through the outbox, for each event with users waiting.
+
+    Call it in the transaction that freed the seats so the run is queued
+    if and only if that transaction commits.
+    """
+    waiting = (
+        WaitlistEntry.objects.filter(event_id__in=event_ids)
+        .order_by()
+        .values_list('event_id', flat=True)
+        .distinct()
+    )
+    for event_id in waiting:
+        enqueue(promote_waitlist, event_id=event_id)
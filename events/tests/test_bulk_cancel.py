@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from core.testing import api_client, create_event, create_user
+from events.models import EventRegistration
+from events.services import register_user
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class OrganizerBulkCancelTests(TestCase):
+    """
+    Organizers cancel, in bulk, registrations of their event they made with bulk_register.
+    """
+    def setUp(self) -> None:
+        """
+        Bulk register a team for an event of the organizer.
+        """
+        cache.clear()
+        self.organizer = create_user('organizer')
+        self.event = create_event(self.organizer)
+        self.team = [create_user(f'member{i}') for i in range(3)]
+        self.client = api_client(self.organizer)
+        response = self.client.post(
+            f'/api/events/{self.event.id}/bulk_register/', {'user_ids': [user.id for user in self.team]}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.registration_ids = sorted(registration['id'] for registration in response.data)
+        self.path = f'/api/events/{self.event.id}/bulk_cancel/'
+
+    def test_organizer_cancels_team(self) -> None:
+        """
+        Registrations of the event are cancelled and their seats released;
+        ids of other events' registrations are reported as not cancelled.
+        """
+        other = register_user(create_event(create_user('other')), self.team[0])
+        requested = [*self.registration_ids[:2], other.id]
+        response = self.client.post(self.path, {'registration_ids': requested}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'cancelled': self.registration_ids[:2], 'not_cancelled': [other.id]})
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered_count, 1)
+        self.assertEqual(EventRegistration.objects.get(pk=other.pk).status, 'pending')
+
+    def test_other_users_are_forbidden(self) -> None:
+        """
+        Only the organizer may bulk cancel, even the registrants themselves.
+        """
+        response = api_client(self.team[0]).post(
+            self.path, {'registration_ids': self.registration_ids}, format='json'
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(EventRegistration.objects.filter(status='cancelled').exists())
@@ -0,0 +1,38 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from core.testing import api_client, create_event, create_user
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class ResponseCacheTests(TestCase):
+    """
+    Cached event responses are keyed on everything that changes them.
+    """
+    def setUp(self) -> None:
+        """
+        Create an event and a reader.
+        """
+        cache.clear()
+        self.event = create_event(create_user('organizer'))
+        self.client = api_client(create_user('reader'))
+
+    def test_sparse_detail_does_not_leak_into_full_detail(self) -> None:
+        """
+        A ?fields= response is not served to a plain detail request.
+        """
+        path = f'/api/events/{self.event.id}/'
+        sparse = self.client.get(f'{path}?fields=title')
+        full = self.client.get(path)
+        self.assertEqual(set(sparse.data), {'title'})
+        self.assertIn('organizer', full.data)
+        self.assertNotEqual(sparse['ETag'], full['ETag'])
+        self.assertEqual(self.client.get(f'{path}?fields=title').data, sparse.data)
+
+    def test_sparse_list_does_not_leak_into_full_list(self) -> None:
+        """
+        A ?omit= list is not served to a plain list request.
+        """
+        omitted = self.client.get('/api/events/?omit=organizer')
+        full = self.client.get('/api/events/')
+        self.assertNotIn('organizer', omitted.data['results'][0])
+        self.assertIn('organizer', full.data['results'][0])
@@ -0,0 +1,104 @@
+import threading
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase, override_settings, skipUnlessDBFeature
+from core.testing import api_client, create_event, create_user
+from events.models import Event, EventRegistration
+from events.services import RegistrationError, register_user
+
+# Concurrent requests per test
+THREADS = 24
+
+
+def run_concurrently(target, arguments: list) -> list:
+    """
+    Call target with each argument in its own thread, all released at once,
+    and return the results (or raised exceptions) in argument order.
+    """
+    barrier = threading.Barrier(len(arguments))
+    results = [None] * len(arguments)
+
+    def worker(index: int, argument) -> None:
+        try:
+            barrier.wait()
+            results[index] = target(argument)
+        except Exception as e:
+            results[index] = e
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=(index, argument)) for index, argument in enumerate(arguments)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@skipUnlessDBFeature('test_db_allows_multiple_connections')
+@override_settings(ALLOWED_HOSTS=['*'])
+class SeatConcurrencyTests(TransactionTestCase):
+    """
+    Hammer one event from parallel connections and check it is never overbooked.
+    """
+    def setUp(self) -> None:
+        """
+        Create an organizer, THREADS users and a 5 seat event.
+        """
+        cache.clear()
+        self.organizer = create_user('organizer')
+        self.users = [create_user(f'user{index}') for index in range(THREADS)]
+        self.event = create_event(self.organizer, capacity=5)
+
+    def assert_seats(self, registered: int) -> None:
+        """
+        Assert the counter and the active registrations both equal registered.
+        """
+        self.event.refresh_from_db()
+        active = EventRegistration.objects.filter(event=self.event).exclude(status='cancelled').count()
+        self.assertEqual(self.event.registered_count, registered)
+        self.assertEqual(active, registered)
+
+    def test_parallel_registrations_never_overbook(self) -> None:
+        """
+        Only capacity registrations succeed; the rest fail cleanly.
+        """
+        event_id = self.event.id
+        results = run_concurrently(
+            lambda user: register_user(Event.objects.get(pk=event_id), user), self.users
+        )
+        registered = [result for result in results if isinstance(result, EventRegistration)]
+        errors = [result for result in results if not isinstance(result, EventRegistration)]
+        self.assertEqual(len(registered), 5)
+        self.assertTrue(all(isinstance(error, RegistrationError) for error in errors), errors)
+        self.assert_seats(5)
+
+    def test_parallel_register_requests_answer_409(self) -> None:
+        """
+        Parallel POST /register/ requests get 201 up to capacity and 409 after.
+        """
+        path = f'/api/events/{self.event.id}/register/'
+        statuses = run_concurrently(lambda user: api_client(user).post(path).status_code, self.users)
+        self.assertEqual(statuses.count(201), 5, statuses)
+        self.assertEqual(statuses.count(409), THREADS - 5, statuses)
+        self.assert_seats(5)
+
+    def test_parallel_cancels_release_one_seat(self) -> None:
+        """
+        PATCH status=cancelled and POST /cancel/ racing on one registration
+        release its seat once.
+        """
+        for user in self.users[:3]:
+            register_user(self.event, user)
+        registration = EventRegistration.objects.get(event=self.event, user=self.users[0])
+        client = api_client(self.users[0])
+        detail = f'/api/registrations/{registration.id}/'
+
+        def cancel(index: int) -> int:
+            if index % 2:
+                return client.post(f'{detail}cancel/').status_code
+            return client.patch(detail, {'status': 'cancelled'}, format='json').status_code
+
+        statuses = run_concurrently(cancel, list(range(THREADS)))
+        self.assertNotIn(500, statuses)
+        self.assert_seats(2)
@@ -0,0 +1,90 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from core.testing import api_client, create_event, create_user
+from events.services import register_user
+
+# Data sizes every endpoint is measured at: below one page and above it
+SIZES = (2, 15)
+
+
+@override_settings(ALLOWED_HOSTS=['*'], REQUEST_METRICS_SAMPLE_RATE=0)
+class QueryCountTests(TestCase):
+    """
+    The list and detail endpoints run a fixed number of queries, whatever
+    the number of rows on the page.
+    """
+    def seed(self, size: int) -> None:
+        """
+        Create size events by distinct organizers and register the reader for each.
+        """
+        self.reader = create_user(f'reader{size}')
+        self.events = [
+            create_event(create_user(f'organizer{size}_{index}'), title=f'Event {index}', capacity=50)
+            for index in range(size)
+        ]
+        for event in self.events:
+            register_user(event, self.reader)
+        self.client = api_client(self.reader)
+
+    def assert_queries(self, queries: int, path: str) -> None:
+        """
+        Assert that an uncached GET of path at every size runs queries queries.
+        """
+        for size in SIZES:
+            with self.subTest(size=size, path=path):
+                self.seed(size)
+                cache.clear()
+                with self.assertNumQueries(queries):
+                    response = self.client.get(path.format(event=self.events[-1]))
+                self.assertEqual(response.status_code, 200)
+
+    def test_event_list(self) -> None:
+        """
+        Count and page queries, organizers joined.
+        """
+        self.assert_queries(2, '/api/events/')
+
+    def test_event_list_cursor(self) -> None:
+        """
+        One page query, no count.
+        """
+        self.assert_queries(1, '/api/events/?pagination=cursor')
+
+    def test_event_detail(self) -> None:
+        """
+        One query, organizer joined.
+        """
+        self.assert_queries(1, '/api/events/{event.id}/')
+
+    def test_event_registrations(self) -> None:
+        """
+        The event, then count and page queries joining users and events.
+        """
+        for size in SIZES:
+            with self.subTest(size=size):
+                self.seed(size)
+                event = self.events[0]
+                for index in range(size):
+                    register_user(event, create_user(f'attendee{size}_{index}'))
+                client = api_client(event.organizer)
+                with self.assertNumQueries(3):
+                    response = client.get(f'/api/events/{event.id}/registrations/')
+                self.assertEqual(response.status_code, 200)
+
+    def test_registration_list(self) -> None:
+        """
+        Count and page queries on the flattened feed.
+        """
+        self.assert_queries(2, '/api/registrations/')
+
+    def test_registration_list_expanded(self) -> None:
+        """
+        Expanding the event joins it and its organizer.
+        """
+        self.assert_queries(2, '/api/registrations/?expand=event')
+
+    def test_user_list(self) -> None:
+        """
+        Count and page queries.
+        """
+        self.assert_queries(2, '/api/users/')
@@ -0,0 +1,54 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from core.testing import api_client, create_event, create_user
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class SearchPaginationTests(TestCase):
+    """
+    Search results keep their relevance order, which cursor pages cannot.
+    """
+    def setUp(self) -> None:
+        """
+        Create a title match dated after a description-only match.
+        """
+        cache.clear()
+        organizer = create_user('organizer')
+        now = timezone.now()
+        self.title_match = create_event(organizer, title='Jazz night', date=now + timedelta(days=2))
+        self.description_match = create_event(
+            organizer, title='Open air', description='Some jazz later on', date=now + timedelta(days=9)
+        )
+        self.client = api_client(create_user('reader'))
+
+    def test_pages_are_ranked(self) -> None:
+        """
+        Page number results put the best match first, whatever its date.
+        """
+        response = self.client.get('/api/events/?q=jazz')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [event['id'] for event in response.data['results']],
+            [self.title_match.id, self.description_match.id],
+        )
+
+    def test_cursor_is_refused(self) -> None:
+        """
+        A cursor over ranked results is refused instead of re-ordered by date.
+        """
+        response = self.client.get('/api/events/?q=jazz&pagination=cursor')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('pagination', response.data)
+
+    def test_cursor_without_search(self) -> None:
+        """
+        Unranked lists still page by cursor, newest first.
+        """
+        response = self.client.get('/api/events/?pagination=cursor')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [event['id'] for event in response.data['results']],
+            [self.description_match.id, self.title_match.id],
+        )
@@ -0,0 +1,145 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from core.models import OutboxMessage
+from core.testing import api_client, create_event, create_user
+from events.models import EventRegistration, WaitlistEntry
+from events.services import _promote_batch, cancel_registration, register_user
+
+PROMOTE_WAITLIST = 'events.tasks.promote_waitlist'
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class WaitlistPromotionTests(TestCase):
+    """
+    Every way of releasing a seat queues a promotion of the event's waitlist.
+    """
+    def setUp(self) -> None:
+        """
+        Fill a one-seat event and put a second user on its waitlist.
+        """
+        cache.clear()
+        self.attendee = create_user('attendee')
+        self.event = create_event(create_user('organizer'), capacity=1)
+        self.registration = register_user(self.event, self.attendee)
+        WaitlistEntry.objects.create(event=self.event, user=create_user('waiting'))
+        self.client = api_client(self.attendee)
+        self.path = f'/api/registrations/{self.registration.id}/'
+
+    def promotions(self) -> list[dict]:
+        """
+        Return the kwargs of the queued promotion runs.
+        """
+        return list(OutboxMessage.objects.filter(task=PROMOTE_WAITLIST).values_list('kwargs', flat=True))
+
+    def test_cancel_action_queues_promotion(self) -> None:
+        """
+        POST /cancel/ queues a promotion run.
+        """
+        self.assertEqual(self.client.post(f'{self.path}cancel/').status_code, 200)
+        self.assertEqual(self.promotions(), [{'event_id': self.event.id}])
+
+    def test_patch_cancel_queues_promotion(self) -> None:
+        """
+        PATCH status=cancelled queues one promotion run, and repeating it none.
+        """
+        self.assertEqual(self.client.patch(self.path, {'status': 'cancelled'}).status_code, 200)
+        self.assertEqual(self.promotions(), [{'event_id': self.event.id}])
+        self.client.patch(self.path, {'status': 'cancelled'})
+        self.assertEqual(len(self.promotions()), 1)
+
+    def test_delete_queues_promotion(self) -> None:
+        """
+        DELETE queues a promotion run.
+        """
+        self.attendee.is_staff = True
+        self.attendee.save(update_fields=['is_staff'])
+        self.assertEqual(self.client.delete(self.path).status_code, 204)
+        self.assertEqual(self.promotions(), [{'event_id': self.event.id}])
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class JoinWaitlistTests(TestCase):
+    """
+    Only events a registration cannot get into take waitlist entries.
+    """
+    def setUp(self) -> None:
+        """
+        Create an empty one-seat event.
+        """
+        cache.clear()
+        self.event = create_event(create_user('organizer'), capacity=1)
+        self.waitlist_path = f'/api/events/{self.event.id}/waitlist/'
+
+    def test_open_event_rejects_waitlist(self) -> None:
+        """
+        Joining the waitlist of an event with a free seat is refused and
+        does not block registrations.
+        """
+        response = api_client(create_user('early')).post(self.waitlist_path)
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(WaitlistEntry.objects.exists())
+        response = api_client(create_user('attendee')).post(f'/api/events/{self.event.id}/register/')
+        self.assertEqual(response.status_code, 201)
+
+    def test_full_event_accepts_waitlist(self) -> None:
+        """
+        Once the seat is taken, users queue on the waitlist.
+        """
+        register_user(self.event, create_user('attendee'))
+        self.assertEqual(api_client(create_user('waiting')).post(self.waitlist_path).status_code, 201)
+
+    def test_waiting_users_keep_freed_seats(self) -> None:
+        """
+        A seat freed while users wait is not open for registration, so
+        newcomers join the queue behind them.
+        """
+        registration = register_user(self.event, create_user('attendee'))
+        WaitlistEntry.objects.create(event=self.event, user=create_user('waiting'))
+        cancel_registration(registration)
+        newcomer = api_client(create_user('newcomer'))
+        self.assertEqual(newcomer.post(f'/api/events/{self.event.id}/register/').status_code, 409)
+        self.assertEqual(newcomer.post(self.waitlist_path).status_code, 201)
+
+
+class PromoteBatchTests(TestCase):
+    """
+    Freed seats go to waiting users in joining order, batch_size at a time.
+    """
+    def setUp(self) -> None:
+        """
+        Fill a three-seat event, queue four users and free every seat.
+        """
+        cache.clear()
+        self.event = create_event(create_user('organizer'), capacity=3)
+        registrations = [register_user(self.event, create_user(f'attendee{i}')) for i in range(3)]
+        self.waiting = [create_user(f'waiting{i}') for i in range(4)]
+        for user in self.waiting:
+            WaitlistEntry.objects.create(event=self.event, user=user)
+        for registration in registrations:
+            cancel_registration(registration)
+
+    def registered(self) -> list[int]:
+        """
+        Return the ids of the waiting users holding an active registration.
+        """
+        return sorted(
+            EventRegistration.objects.filter(event=self.event, user__in=self.waiting)
+            .exclude(status='cancelled').values_list('user_id', flat=True)
+        )
+
+    def test_promotes_in_joining_order_by_batch(self) -> None:
+        """
+        Each batch takes at most batch_size entries, oldest first, and
+        stops when the seats run out.
+        """
+        consumed, registration_ids = _promote_batch(self.event.id, batch_size=2)
+        self.assertEqual((consumed, len(registration_ids)), (2, 2))
+        self.assertEqual(self.registered(), [user.id for user in self.waiting[:2]])
+
+        self.assertEqual(_promote_batch(self.event.id, batch_size=2)[0], 1)
+        self.assertEqual(self.registered(), [user.id for user in self.waiting[:3]])
+        self.assertEqual(_promote_batch(self.event.id, batch_size=2), (0, []))
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered_count, self.event.capacity)
+        self.assertEqual(list(WaitlistEntry.objects.values_list('user_id', flat=True)), [self.waiting[3].id])
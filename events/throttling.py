@@ -0,0 +1,54 @@
+from rest_framework.request import Request
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework.views import APIView
+
+
+class EventRegisterThrottle(SimpleRateThrottle):
+    """
+    Limit how often one user may try to register for one event.
+
+    Counts attempts in fixed windows with an atomic cache increment, so
+    concurrent requests of a burst cannot all read the same history and
+    slip through, as they can with SimpleRateThrottle's read-modify-write
+    of a timestamp list.
+    """
+    scope = 'event_register'
+
+    def get_cache_key(self, request: Request, view: APIView) -> str | None:
+        """
+        Key the counter on the user and the event.
+        """
+        if not request.user or not request.user.is_authenticated:
+            return None
+        event_id = view.kwargs.get(view.lookup_url_kwarg or view.lookup_field)
+        return f'throttle:{self.scope}:{request.user.id}:{event_id}'
+
+    def allow_request(self, request: Request, view: APIView) -> bool:
+        """
+        Count the attempt and return False once the window's rate is exceeded.
+        """
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.window_end = (window + 1) * self.duration
+        self.key = f'{key}:{window}'
+        if self.cache.add(self.key, 1, timeout=self.duration):
+            return True
+        try:
+            attempts = self.cache.incr(self.key)
+        except ValueError:
+            # The window's counter expired between add() and incr()
+            self.cache.add(self.key, 1, timeout=self.duration)
+            return True
+        return attempts <= self.num_requests
+
+    def wait(self) -> float:
+        """
+        Return the seconds until the current window ends.
+        """
+        return max(self.window_end - self.now, 0)
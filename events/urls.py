@@ -1,11 +1,22 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from core.async_views import with_async_reads
+from . import async_views
 from .views import EventViewSet, EventRegistrationViewSet
 
 router = DefaultRouter()
 router.register(r'events', EventViewSet, basename='event')
 router.register(r'registrations', EventRegistrationViewSet, basename='registration')
 
+router_urls = router.urls
+if settings.ASYNC_READ_VIEWS:
+    router_urls = with_async_reads(router_urls, {
+        'event-list': async_views.event_list,
+        'event-detail': async_views.event_detail,
+        'registration-list': async_views.registration_list,
+    })
+
 urlpatterns = [
-    path('', include(router.urls)),
-] 
\ No newline at end of file
+    path('', include(router_urls)),
+]
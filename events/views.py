@@ -1,28 +1,73 @@
 from rest_framework import viewsets, status
 from rest_framework import permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.request import Request
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from .models import Event, EventRegistration
+from .models import ArchivedEvent, Event, EventRegistration, RegistrationFeedEntry
+from .archive import FEED_COLUMNS, MergedRows, archived_feed_rows, includes_archived
+from .export import EXPORT_CONTENT_TYPES, EXPORT_RENDERERS, registration_rows
+from .feed import sync_event, sync_registrations
 from .serializers import (
-    EventSerializer, EventCreateSerializer,
-    EventRegistrationSerializer, EventRegistrationCreateSerializer
+    EventSerializer, EventRowSerializer, ArchivedEventSerializer, EventCreateSerializer,
+    EventRegistrationSerializer, BulkRegistrationSerializer, BulkCancelSerializer,
+    RegistrationFeedSerializer, WaitlistEntrySerializer, expands_event
 )
 from .permissions import IsEventOrganizer
-from .filters import EventFilter
-from notifications.tasks import send_event_registration_email
-from typing import QuerySet
+from .throttling import EventRegisterThrottle
+from .filters import ArchivedEventFilter, EventFilter
+from .pagination import EventCursorPagination, RegistrationCursorPagination
+from .cache import (
+    list_cache_key, detail_cache_key,
+    get_or_build_response, cache_response, invalidate_event
+)
+from .services import (
+    register_user, register_users, cancel_registration, cancel_registrations,
+    change_registration_status, join_waitlist, leave_waitlist,
+    RegistrationError, RegistrationClosed, EventFull, AlreadyRegistered, AlreadyWaitlisted,
+    SeatsAvailable
+)
+from .tasks import schedule_waitlist_promotion
+from core.async_views import streaming_content
+from core.db_router import ReplicaReadsMixin, reads_from
+from typing import Callable
+
+def bulk_cancel_response(registrations: QuerySet[EventRegistration], requested: list[int]) -> Response:
+    """
+    Cancel the requested registrations among registrations, queue the
+    promotion of the freed seats and report which were cancelled.
+    """
+    with transaction.atomic():
+        cancelled = cancel_registrations(registrations.filter(id__in=requested))
+        if cancelled:
+            schedule_waitlist_promotion(
+                EventRegistration.objects.filter(id__in=cancelled).values('event_id')
+            )
+    return Response(
+        {
+            'cancelled': sorted(cancelled),
+            'not_cancelled': sorted(set(requested) - set(cancelled)),
+        },
+        status=status.HTTP_200_OK
+    )
+
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ReplicaReadsMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing events.
     """
-    queryset = Event.objects.all()
+    queryset = Event.objects.select_related('organizer')
     filter_backends = [DjangoFilterBackend]
     filterset_class = EventFilter
+    pagination_class = EventCursorPagination
 
     def get_serializer_class(self) -> EventCreateSerializer | EventSerializer:
         """
@@ -36,66 +81,265 @@ class EventViewSet(viewsets.ModelViewSet):
         """
         Get the permissions for the event view set.
         """
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk_register', 'bulk_cancel']:
             permission_classes = [IsAuthenticated, IsEventOrganizer]
         else:
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
 
+    def cached_response(self, key: str, handler: Callable[..., Response], request: Request, *args, **kwargs) -> Response:
+        """
+        Serve a read from the response cache, answering If-None-Match with 304.
+
+        Concurrent misses of one key are coalesced: a single request runs
+        handler and fills the cache while the others wait for the entry.
+        The cache is shared by every user, so it is filled from the
+        primary: a lagging replica could otherwise cache rows a write has
+        just invalidated.
+        """
+        response = None
+
+        def build() -> dict | None:
+            nonlocal response
+            with reads_from(None):
+                response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return None
+            return cache_response(key, response.data)
+
+        entry = get_or_build_response(key, build)
+        if entry is None:
+            return response
+
+        headers = {'ETag': entry['etag']}
+        if request.headers.get('If-None-Match') == entry['etag']:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(entry['data'], headers=headers)
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        """
+        List events, served from the cache when possible.
+        """
+        return self.cached_response(list_cache_key(request), self.list_rows, request, *args, **kwargs)
+
+    def list_rows(self, request: Request, *args, **kwargs) -> Response:
+        """
+        List events from ``.values()`` rows, skipping model instantiation.
+
+        With ``?include_archived=true`` the archived events matching the
+        same filters are merged in, ordered by date.
+        """
+        serializer = EventRowSerializer(request)
+        queryset = self.filter_queryset(self.get_queryset()).values(*serializer.columns)
+        if includes_archived(request):
+            archived = ArchivedEventFilter(
+                request.query_params, queryset=ArchivedEvent.objects.all(), request=request
+            ).qs.values(*serializer.columns)
+            queryset = MergedRows(queryset, archived, self.paginator.ordering)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response([serializer.to_representation(row) for row in page])
+        return Response([serializer.to_representation(row) for row in queryset])
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        """
+        Retrieve an event, served from the cache when possible.
+
+        With ``?include_archived=true`` an event missing from the hot table
+        is looked up in the archive; archived events are not cached.
+        """
+        key = detail_cache_key(request, kwargs[self.lookup_field])
+        try:
+            return self.cached_response(key, super().retrieve, request, *args, **kwargs)
+        except Http404:
+            if not includes_archived(request):
+                raise
+        archived = get_object_or_404(
+            ArchivedEvent.objects.select_related('organizer'), pk=kwargs[self.lookup_field]
+        )
+        return Response(ArchivedEventSerializer(archived, context=self.get_serializer_context()).data)
+
     def perform_create(self, serializer: EventCreateSerializer) -> None:
         """
         Perform the create action for the event view set.
         """
-        serializer.save(organizer=self.request.user)
+        event = serializer.save(organizer=self.request.user)
+        invalidate_event(event.id)
 
-    @action(detail=True, methods=['post'])
+    def perform_update(self, serializer: EventCreateSerializer) -> None:
+        """
+        Perform the update action for the event view set.
+        """
+        with transaction.atomic():
+            event = serializer.save()
+            sync_event(event)
+            schedule_waitlist_promotion([event.id])
+        invalidate_event(event.id)
+
+    def perform_destroy(self, instance: Event) -> None:
+        """
+        Perform the destroy action for the event view set.
+        """
+        event_id = instance.id
+        instance.delete()
+        invalidate_event(event_id)
+
+    @action(detail=True, methods=['post'], throttle_classes=[EventRegisterThrottle])
     def register(self, request: Request, pk: int = None) -> Response:
         """
         Register for an event.
         """
         event = self.get_object()
-        serializer = EventRegistrationCreateSerializer(
-            data={'event': event.id},
-            context={'request': request}
+
+        try:
+            registration = register_user(event, request.user)
+        except RegistrationClosed as e:
+            return Response({'error': e.message}, status=status.HTTP_400_BAD_REQUEST)
+        except (EventFull, AlreadyRegistered) as e:
+            return Response({'error': e.message}, status=status.HTTP_409_CONFLICT)
+
+        return Response(
+            EventRegistrationSerializer(registration).data,
+            status=status.HTTP_201_CREATED
         )
-        
-        if serializer.is_valid():
-            registration = serializer.save(user=request.user)
-            
-            send_event_registration_email.delay(
-                user_id=request.user.id,
-                event_id=event.id,
-                registration_id=registration.id
-            )
-            
-            return Response(
-                EventRegistrationSerializer(registration).data,
-                status=status.HTTP_201_CREATED
-            )
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    @action(detail=True, methods=['get'])
+    @action(detail=True, methods=['post', 'delete'])
+    def waitlist(self, request: Request, pk: int = None) -> Response:
+        """
+        Join (POST) or leave (DELETE) the event's waitlist.
+
+        Waiting users are promoted to registrations in joining order as
+        seats free up, and get the usual confirmation email.
+        """
+        event = self.get_object()
+        if request.method == 'DELETE':
+            if not leave_waitlist(event, request.user):
+                return Response(
+                    {'error': 'You are not on the waitlist for this event'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        try:
+            with transaction.atomic():
+                entry = join_waitlist(event, request.user)
+                schedule_waitlist_promotion([event.id])
+        except RegistrationClosed as e:
+            return Response({'error': e.message}, status=status.HTTP_400_BAD_REQUEST)
+        except (AlreadyRegistered, AlreadyWaitlisted, SeatsAvailable) as e:
+            return Response({'error': e.message}, status=status.HTTP_409_CONFLICT)
+
+        return Response(WaitlistEntrySerializer(entry).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def bulk_register(self, request: Request, pk: int = None) -> Response:
+        """
+        Register a list of users for an event in one request.
+        """
+        event = self.get_object()
+        serializer = BulkRegistrationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            registrations = register_users(event, serializer.validated_data['user_ids'])
+        except RegistrationClosed as e:
+            return Response({'error': e.message}, status=status.HTTP_400_BAD_REQUEST)
+        except (EventFull, AlreadyRegistered) as e:
+            return Response({'error': e.message}, status=status.HTTP_409_CONFLICT)
+
+        return Response(
+            EventRegistrationSerializer(registrations, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=True, methods=['post'])
+    def bulk_cancel(self, request: Request, pk: int = None) -> Response:
+        """
+        Cancel a list of the event's registrations in one request.
+        """
+        event = self.get_object()
+        serializer = BulkCancelSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        return bulk_cancel_response(event.registrations.all(), serializer.validated_data['registration_ids'])
+
+    @action(detail=True, methods=['get'], pagination_class=RegistrationCursorPagination)
     def registrations(self, request: Request, pk: int = None) -> Response:
         """
-        Get the registrations for an event.
+        Get the registrations for an event, optionally filtered by ``?status=``.
+        """
+        event = self.get_object()
+        registrations = event.registrations.select_related('user', 'event__organizer')
+        if request.query_params.get('status'):
+            registrations = registrations.filter(status=request.query_params['status'])
+        page = self.paginate_queryset(registrations)
+        serializer = EventRegistrationSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'], url_path='registrations/export')
+    def export_registrations(self, request: Request, pk: int = None) -> StreamingHttpResponse | Response:
+        """
+        Stream every registration of an event as CSV or NDJSON (``?file_format=``).
+
+        Only the organizer may export. Rows are streamed as they are read,
+        so memory stays flat whatever the number of attendees.
         """
         event = self.get_object()
-        registrations = event.registrations.all()
-        serializer = EventRegistrationSerializer(registrations, many=True)
-        return Response(serializer.data)
+        if event.organizer_id != request.user.id:
+            return Response(
+                {'error': 'Only the organizer can export registrations.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in EXPORT_RENDERERS:
+            return Response(
+                {'error': f'file_format must be one of: {", ".join(EXPORT_RENDERERS)}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        chunk_size = settings.EXPORT_CHUNK_SIZE
+        chunks = EXPORT_RENDERERS[file_format](registration_rows(event, chunk_size), chunk_size)
+        return StreamingHttpResponse(
+            streaming_content(request._request, chunks),
+            content_type=EXPORT_CONTENT_TYPES[file_format],
+            headers={
+                'Content-Disposition': f'attachment; filename="event-{event.id}-registrations.{file_format}"'
+            }
+        )
 
-class EventRegistrationViewSet(viewsets.ModelViewSet):
+class EventRegistrationViewSet(ReplicaReadsMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing event registrations.
     """
     serializer_class = EventRegistrationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = RegistrationCursorPagination
 
-    def get_queryset(self) -> QuerySet[EventRegistration]:
+    def get_queryset(self) -> QuerySet[EventRegistration] | QuerySet[RegistrationFeedEntry]:
         """
         Get the queryset for the event registration view set.
+
+        Listing reads the flattened feed table with one indexed query on
+        the user; the event is only joined when it is expanded.
+        """
+        if self.action == 'list':
+            queryset = RegistrationFeedEntry.objects.filter(user_id=self.request.user.id)
+            if expands_event(self.request):
+                queryset = queryset.select_related('event__organizer')
+            return queryset
+        return EventRegistration.objects.filter(
+            user_id=self.request.user.id
+        ).select_related('user', 'event__organizer')
+
+    def get_serializer_class(self) -> RegistrationFeedSerializer | EventRegistrationSerializer:
         """
-        return EventRegistration.objects.filter(user=self.request.user)
+        Get the serializer class for the event registration view set.
+        """
+        if self.action == 'list':
+            return RegistrationFeedSerializer
+        return EventRegistrationSerializer
 
     def get_permissions(self) -> list[permissions.BasePermission]:
         """
@@ -107,6 +351,60 @@ class EventRegistrationViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
 
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        """
+        List the user's registrations, with ``?include_archived=true``
+        merged with those of archived events.
+        """
+        if not includes_archived(request):
+            return super().list(request, *args, **kwargs)
+        if expands_event(request):
+            return Response(
+                {'error': 'expand=event cannot be combined with include_archived'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        rows = MergedRows(
+            self.get_queryset().values(*FEED_COLUMNS),
+            archived_feed_rows(request.user.id),
+            self.paginator.ordering,
+        )
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    def perform_update(self, serializer: EventRegistrationSerializer) -> None:
+        """
+        Update a registration and keep the event seat counter in sync.
+
+        The status goes through change_registration_status, so concurrent
+        cancels (PATCH or /cancel/) release the seat once, and a released
+        seat queues a waitlist promotion; the other fields are saved with
+        update_fields and never write the status back.
+        """
+        registration = serializer.instance
+        fields = dict(serializer.validated_data)
+        new_status = fields.pop('status', None)
+        with transaction.atomic():
+            if new_status is not None:
+                try:
+                    if change_registration_status(registration, new_status):
+                        schedule_waitlist_promotion([registration.event_id])
+                except RegistrationError as e:
+                    raise ValidationError(e.message)
+            if fields:
+                for field, value in fields.items():
+                    setattr(registration, field, value)
+                registration.save(update_fields=list(fields))
+                sync_registrations(EventRegistration.objects.filter(pk=registration.pk))
+
+    def perform_destroy(self, instance: EventRegistration) -> None:
+        """
+        Delete a registration, release its seat and queue a waitlist promotion.
+        """
+        with transaction.atomic():
+            if cancel_registration(instance):
+                schedule_waitlist_promotion([instance.event_id])
+            instance.delete()
+
     @action(detail=True, methods=['post'])
     def cancel(self, request: Request, pk: int = None) -> Response:
         """
@@ -126,10 +424,28 @@ class EventRegistrationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        registration.status = 'cancelled'
-        registration.save()
-        
+        with transaction.atomic():
+            cancelled = cancel_registration(registration)
+            if cancelled:
+                schedule_waitlist_promotion([registration.event_id])
+        if not cancelled:
+            return Response(
+                {'error': 'Registration is already cancelled'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         return Response(
             EventRegistrationSerializer(registration).data,
             status=status.HTTP_200_OK
-        ) 
\ No newline at end of file
+        )
+
+    @action(detail=False, methods=['post'])
+    def bulk_cancel(self, request: Request) -> Response:
+        """
+        Cancel a list of registrations in one request.
+        """
+        serializer = BulkCancelSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        return bulk_cancel_response(self.get_queryset(), serializer.validated_data['registration_ids'])
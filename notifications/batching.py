@@ -0,0 +1,100 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+from events.models import EventRegistration
+from .rendering import RegistrationEmailRenderer
+
+
+def claim_pending_registrations(limit: int) -> list[int]:
+    """
+    Mark up to limit registrations still waiting for their confirmation
+    email as sent and return their ids.
+
+    Rows locked by another worker are skipped, so concurrent senders each
+    claim a disjoint batch and no email goes out twice.
+    """
+    with transaction.atomic():
+        registration_ids = list(
+            EventRegistration.objects.filter(confirmation_sent_at__isnull=True)
+            .exclude(status='cancelled')
+            .select_for_update(skip_locked=True)
+            .order_by('id')
+            .values_list('id', flat=True)[:limit]
+        )
+        EventRegistration.objects.filter(
+            id__in=registration_ids, confirmation_sent_at__isnull=True
+        ).update(confirmation_sent_at=timezone.now())
+    return registration_ids
+
+
+def release_registrations(registration_ids: list[int]) -> None:
+    """
+    Put claimed registrations back in the pending pool after a failed send.
+    """
+    EventRegistration.objects.filter(id__in=registration_ids).update(confirmation_sent_at=None)
+
+
+def build_registration_email(registration: EventRegistration, renderer: RegistrationEmailRenderer) -> EmailMultiAlternatives:
+    """
+    Build the confirmation email of one registration.
+    """
+    html_message = renderer.render(registration)
+    message = EmailMultiAlternatives(
+        subject=renderer.subject,
+        body='',
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[registration.user.email],
+    )
+    message.attach_alternative(html_message, 'text/html')
+    return message
+
+
+def send_registration_batch(registration_ids: list[int], connection=None) -> int:
+    """
+    Send the confirmation emails of claimed registrations over one connection.
+
+    Registrations, users and events are loaded with a single query and
+    the event part of the email is rendered once per event. Returns the
+    number of emails sent.
+    """
+    registrations = EventRegistration.objects.filter(
+        id__in=registration_ids
+    ).select_related('user', 'event')
+    renderers = {}
+    messages = []
+    for registration in registrations:
+        renderer = renderers.get(registration.event_id)
+        if renderer is None:
+            renderer = renderers[registration.event_id] = RegistrationEmailRenderer(registration.event)
+        messages.append(build_registration_email(registration, renderer))
+    if not messages:
+        return 0
+    connection = connection or get_connection(fail_silently=False)
+    return connection.send_messages(messages) or 0
+
+
+def send_pending_registration_emails(batch_size: int | None = None, max_batches: int | None = 1) -> int:
+    """
+    Coalesce pending confirmation emails into batches and send them.
+
+    All batches share one SMTP connection. A batch that fails to send is
+    released so a later run retries it. Pass max_batches=None to drain
+    everything pending. Returns the number of emails sent.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    sent = 0
+    batches = 0
+    connection = get_connection(fail_silently=False)
+    with connection:
+        while max_batches is None or batches < max_batches:
+            registration_ids = claim_pending_registrations(batch_size)
+            if not registration_ids:
+                break
+            try:
+                sent += send_registration_batch(registration_ids, connection)
+            except Exception:
+                release_registrations(registration_ids)
+                raise
+            batches += 1
+    return sent
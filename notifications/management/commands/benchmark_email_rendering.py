@@ -0,0 +1,97 @@
+import time
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.template import engines
+from django.template.engine import Engine
+from django.template.loader import render_to_string
+from django.utils import timezone
+from events.models import Event, EventRegistration
+from notifications.rendering import REGISTRATION_TEMPLATE, RegistrationEmailRenderer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Microbenchmark registration email rendering.
+    """
+    help = 'Compare emails/second of uncached, cached and pre-rendered registration emails.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument(
+            '--recipients', type=int, default=2000,
+            help='Number of registrations rendered per strategy.'
+        )
+
+    def build_registrations(self, count: int) -> list[EventRegistration]:
+        """
+        Build unsaved registrations to one event, without touching the database.
+        """
+        organizer = User(id=1, email='organizer@example.com', first_name='Olga')
+        event = Event(
+            id=1, title='Benchmark Conference', description='Rendering benchmark',
+            date=timezone.now() + timedelta(days=30), location='Main hall',
+            organizer=organizer, capacity=count,
+        )
+        return [
+            EventRegistration(
+                id=index, event=event, status='confirmed', payment_status='paid',
+                user=User(id=index + 1, email=f'user{index}@example.com', first_name=f'User <{index}>'),
+            )
+            for index in range(count)
+        ]
+
+    def measure(self, name: str, render, registrations: list[EventRegistration]) -> None:
+        """
+        Render every registration with render and print the throughput.
+        """
+        start = time.perf_counter()
+        for registration in registrations:
+            render(registration)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f'{name:<40}{len(registrations) / elapsed:>14,.0f} emails/s')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Run every rendering strategy over the same registrations.
+        """
+        registrations = self.build_registrations(options['recipients'])
+        event = registrations[0].event
+
+        def context(registration: EventRegistration) -> dict:
+            return {'user': registration.user, 'event': event, 'registration': registration}
+
+        django_engine = engines['django'].engine
+        uncached_engine = Engine(
+            dirs=django_engine.dirs,
+            loaders=[
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ],
+        )
+        renderer = RegistrationEmailRenderer(event)
+
+        expected = render_to_string(REGISTRATION_TEMPLATE, context(registrations[0]))
+        if renderer.render(registrations[0]) != expected:
+            raise CommandError('Pre-rendered output differs from render_to_string output.')
+
+        self.stdout.write(f'{len(registrations)} recipients\n')
+        self.measure(
+            'render_to_string, uncached loader',
+            lambda r: uncached_engine.render_to_string(REGISTRATION_TEMPLATE, context(r)),
+            registrations,
+        )
+        self.measure(
+            'render_to_string, cached loader',
+            lambda r: render_to_string(REGISTRATION_TEMPLATE, context(r)),
+            registrations,
+        )
+        self.measure(
+            'pre-rendered per event',
+            renderer.render,
+            registrations,
+        )
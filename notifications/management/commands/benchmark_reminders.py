@@ -0,0 +1,90 @@
+import time
+import tracemalloc
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from core.models import OutboxMessage
+from events.models import Event, EventRegistration
+from events.seeding import seed_events, seed_users
+from notifications.models import EventReminder, ReminderBatch
+from notifications.reminders import create_due_reminders, send_reminder_batch
+from notifications.tasks import fan_out_event_reminder
+
+
+class Command(BaseCommand):
+    """
+    Run the reminder pipeline over one large event and check it is idempotent.
+    """
+    help = (
+        'Seed a test database with one event of --attendees registrations starting in 12 hours, '
+        'run the reminder fan-out and sends twice, and report time, peak memory and emails sent.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add the command line arguments.
+        """
+        parser.add_argument('--attendees', type=int, default=100000, help='Registrations of the event.')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Run the pipeline in a test database that is destroyed afterwards.
+        """
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(EMAIL_BACKEND='django.core.mail.backends.dummy.EmailBackend'):
+                self.run_pipeline(options['attendees'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def run_pipeline(self, attendees: int) -> None:
+        """
+        Seed the event, then schedule, fan out and send its reminder twice.
+        """
+        self.stdout.write('Seeding...')
+        users = seed_users(attendees)
+        seed_events(1, attendees, users)
+        now = timezone.now()
+        Event.objects.update(date=now + timedelta(hours=12), is_active=True)
+        recipients = EventRegistration.objects.exclude(status='cancelled').count()
+
+        created = create_due_reminders(now)
+        created_again = create_due_reminders(now)
+        reminder = EventReminder.objects.get()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        fan_out_event_reminder(reminder.id)
+        fan_out_seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        batches = ReminderBatch.objects.count()
+        fan_out_event_reminder(reminder.id)
+
+        batch_ids = list(ReminderBatch.objects.order_by('id').values_list('id', flat=True))
+        start = time.perf_counter()
+        sent = sum(send_reminder_batch(batch_id) for batch_id in batch_ids)
+        send_seconds = time.perf_counter() - start
+        sent_again = sum(send_reminder_batch(batch_id) for batch_id in batch_ids)
+
+        self.stdout.write(
+            f'fan-out: {batches} batches for {recipients} recipients in {fan_out_seconds:.2f} s, '
+            f'peak {peak / 1024 / 1024:.1f} MB traced'
+        )
+        self.stdout.write(f'send: {sent} emails in {send_seconds:.2f} s ({sent / send_seconds:,.0f} emails/s)')
+
+        failures = []
+        if (created, created_again) != (1, 0):
+            failures.append(f'created {created} then {created_again} reminders instead of 1 then 0')
+        if ReminderBatch.objects.count() != batches or OutboxMessage.objects.count() != batches:
+            failures.append('a repeated fan-out created batches or send tasks')
+        if sent != recipients:
+            failures.append(f'sent {sent} emails to {recipients} recipients')
+        if sent_again:
+            failures.append(f'repeated sends emailed {sent_again} recipients again')
+        if failures:
+            raise CommandError('; '.join(failures))
+        self.stdout.write(self.style.SUCCESS('OK: every recipient reminded once, reruns sent nothing'))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('events', '0009_waitlist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lead_time', models.DurationField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('fanned_out_at', models.DateTimeField(blank=True, null=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='events.event')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReminderBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_registration_id', models.BigIntegerField()),
+                ('last_registration_id', models.BigIntegerField()),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('reminder', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batches', to='notifications.eventreminder')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='eventreminder',
+            index=models.Index(condition=models.Q(('fanned_out_at__isnull', True)), fields=['id'], name='notif_reminder_pending_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='eventreminder',
+            unique_together={('event', 'lead_time')},
+        ),
+        migrations.AddIndex(
+            model_name='reminderbatch',
+            index=models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['id'], name='notif_batch_unsent_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='reminderbatch',
+            unique_together={('reminder', 'first_registration_id')},
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.db import models
+from events.models import Event
+
+
+class EventReminder(models.Model):
+    """
+    A reminder of an event sent lead_time before it starts.
+
+    fanned_out_at is set in the transaction that splits the event's
+    registrants into ReminderBatch rows, so a reminder is fanned out once.
+    """
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='reminders')
+    lead_time = models.DurationField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    fanned_out_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['event', 'lead_time']
+        indexes = [
+            models.Index(
+                fields=['id'],
+                name='notif_reminder_pending_idx',
+                condition=models.Q(fanned_out_at__isnull=True)
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the reminder.
+        """
+        return f"{self.event.title} - {self.lead_time} before"
+
+
+class ReminderBatch(models.Model):
+    """
+    The registrations of a reminder in one id range, emailed by one task.
+
+    sent_at is the sent marker: a send task claims the batch by setting
+    it, so reruns and duplicate tasks never email a batch twice.
+    """
+    reminder = models.ForeignKey(EventReminder, on_delete=models.CASCADE, related_name='batches')
+    first_registration_id = models.BigIntegerField()
+    last_registration_id = models.BigIntegerField()
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['reminder', 'first_registration_id']
+        indexes = [
+            models.Index(
+                fields=['id'],
+                name='notif_batch_unsent_idx',
+                condition=models.Q(sent_at__isnull=True)
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the batch.
+        """
+        return f"Reminder {self.reminder_id}: registrations {self.first_registration_id}-{self.last_registration_id}"
@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta
+from typing import Callable, Iterator
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from events.models import Event, EventRegistration
+from .batching import build_registration_email
+from .models import EventReminder, ReminderBatch
+from .rendering import ReminderEmailRenderer
+
+
+def reminder_lead_times() -> list[timedelta]:
+    """
+    Return the configured reminder lead times, shortest first.
+    """
+    return sorted(timedelta(hours=hours) for hours in settings.EVENT_REMINDER_LEAD_HOURS)
+
+
+def create_due_reminders(now: datetime | None = None) -> int:
+    """
+    Create the reminders of the events that have entered a lead time.
+
+    Each lead time takes the active events starting between the next
+    shorter lead time and itself from now, a range scan of the date index,
+    so an event created an hour before it starts only gets the last
+    reminder. Returns the number of reminders created.
+    """
+    now = now or timezone.now()
+    created = 0
+    shorter = timedelta(0)
+    for lead_time in reminder_lead_times():
+        due = (
+            Event.objects.filter(is_active=True, date__gt=now + shorter, date__lte=now + lead_time)
+            .exclude(Exists(EventReminder.objects.filter(event=OuterRef('pk'), lead_time=lead_time)))
+            .order_by()
+            .values_list('id', flat=True)
+        )
+        reminders = EventReminder.objects.bulk_create(
+            [EventReminder(event_id=event_id, lead_time=lead_time) for event_id in due],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        created += len(reminders)
+        shorter = lead_time
+    return created
+
+
+def pending_reminder_ids(now: datetime | None = None) -> list[int]:
+    """
+    Return the ids of the reminders of upcoming events not fanned out yet.
+    """
+    return list(
+        EventReminder.objects.filter(fanned_out_at__isnull=True, event__date__gt=now or timezone.now())
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+
+
+def unsent_batch_ids(now: datetime | None = None) -> list[int]:
+    """
+    Return the ids of the batches still unsent EVENT_REMINDER_RETRY_AFTER
+    seconds after their fan-out, for upcoming events.
+    """
+    now = now or timezone.now()
+    return list(
+        ReminderBatch.objects.filter(
+            sent_at__isnull=True,
+            reminder__fanned_out_at__lte=now - timedelta(seconds=settings.EVENT_REMINDER_RETRY_AFTER),
+            reminder__event__date__gt=now,
+        )
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+
+
+def batch_ranges(registration_ids: Iterator[int], batch_size: int) -> Iterator[tuple[int, int]]:
+    """
+    Cut ascending registration ids into (first id, last id) ranges of batch_size ids.
+    """
+    first = last = None
+    count = 0
+    for registration_id in registration_ids:
+        if first is None:
+            first = registration_id
+        last = registration_id
+        count += 1
+        if count == batch_size:
+            yield first, last
+            first, count = None, 0
+    if first is not None:
+        yield first, last
+
+
+def fan_out_reminder(
+    reminder_id: int,
+    dispatch: Callable[[list[int]], None],
+    batch_size: int | None = None,
+    chunk_size: int | None = None,
+) -> int:
+    """
+    Split the registrants of a reminder's event into ReminderBatch rows.
+
+    Registration ids are streamed in id order, chunk_size per round trip
+    (a server-side cursor on PostgreSQL), and the batch rows of each
+    chunk are inserted in bulk and handed to dispatch, so memory stays
+    flat however many attend. Everything commits with fanned_out_at under
+    the reminder's row lock: a concurrent or repeated fan-out returns
+    without doing anything and a failed one leaves nothing behind.
+    Returns the number of batches created.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    chunk_size = chunk_size or settings.EVENT_REMINDER_CHUNK_SIZE
+    batches_per_write = max(chunk_size // batch_size, 1)
+    created = 0
+    with transaction.atomic():
+        reminder = (
+            EventReminder.objects.select_for_update(skip_locked=True)
+            .filter(id=reminder_id, fanned_out_at__isnull=True)
+            .first()
+        )
+        if reminder is None:
+            return 0
+
+        registration_ids = (
+            EventRegistration.objects.filter(event_id=reminder.event_id)
+            .exclude(status='cancelled')
+            .order_by('id')
+            .values_list('id', flat=True)
+            .iterator(chunk_size=chunk_size)
+        )
+        pending = []
+        for first, last in batch_ranges(registration_ids, batch_size):
+            pending.append(ReminderBatch(reminder=reminder, first_registration_id=first, last_registration_id=last))
+            if len(pending) == batches_per_write:
+                dispatch([batch.id for batch in ReminderBatch.objects.bulk_create(pending)])
+                created += len(pending)
+                pending = []
+        if pending:
+            dispatch([batch.id for batch in ReminderBatch.objects.bulk_create(pending)])
+            created += len(pending)
+
+        reminder.fanned_out_at = timezone.now()
+        reminder.save(update_fields=['fanned_out_at'])
+    return created
+
+
+def send_reminder_batch(batch_id: int) -> int:
+    """
+    Send the reminder emails of one batch over one connection.
+
+    The batch is claimed by setting its sent marker first, so a repeated
+    or duplicate task sends nothing; a failed send clears the marker for
+    the retry sweep. Registrations cancelled since the fan-out are
+    skipped. Returns the number of emails sent.
+    """
+    claimed = ReminderBatch.objects.filter(id=batch_id, sent_at__isnull=True).update(sent_at=timezone.now())
+    if not claimed:
+        return 0
+    try:
+        batch = ReminderBatch.objects.select_related('reminder__event').get(id=batch_id)
+        event = batch.reminder.event
+        if not event.is_active:
+            return 0
+        registrations = (
+            EventRegistration.objects.filter(
+                event_id=event.id,
+                id__gte=batch.first_registration_id,
+                id__lte=batch.last_registration_id,
+            )
+            .exclude(status='cancelled')
+            .select_related('user')
+        )
+        renderer = ReminderEmailRenderer(event)
+        messages = [build_registration_email(registration, renderer) for registration in registrations]
+        if not messages:
+            return 0
+        return get_connection(fail_silently=False).send_messages(messages) or 0
+    except Exception:
+        ReminderBatch.objects.filter(id=batch_id).update(sent_at=None)
+        raise
@@ -0,0 +1,96 @@
+from django.template.loader import get_template
+from django.utils.html import conditional_escape
+from events.models import Event, EventRegistration
+
+REGISTRATION_TEMPLATE = 'emails/event_registration.html'
+REMINDER_TEMPLATE = 'emails/event_reminder.html'
+
+
+class _RecipientPlaceholder:
+    """
+    Stand-in for a per-recipient template object.
+
+    Every attribute the template reads resolves to a unique marker string
+    and is recorded as a slot, so the rendered output can later be split
+    around the per-recipient values.
+    """
+    def __init__(self, name: str, slots: list[tuple[str, str]]) -> None:
+        """
+        Initialise the placeholder for the context variable name.
+        """
+        self._name = name
+        self._slots = slots
+
+    def __getitem__(self, key: str):
+        """
+        Refuse dictionary lookups so the template falls back to attributes.
+        """
+        raise KeyError(key)
+
+    def __getattr__(self, attr: str) -> str:
+        """
+        Return the marker of the attribute, registering it as a slot.
+        """
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        marker = f'\x00{len(self._slots)}\x00'
+        self._slots.append((self._name, attr))
+        return marker
+
+
+class RegistrationEmailRenderer:
+    """
+    Render the registration email of one event for many recipients.
+
+    The template is rendered once per event with placeholders for the
+    ``user`` and ``registration`` variables. Each recipient then only
+    costs a string join of the pre-rendered chunks with their escaped
+    values, so per-recipient variables must be output without filters.
+    """
+    template_name = REGISTRATION_TEMPLATE
+    subject_format = 'Event Registration Confirmation: {title}'
+
+    def __init__(self, event: Event) -> None:
+        """
+        Pre-render the event specific part of the email.
+        """
+        self.event = event
+        self.subject = self.subject_format.format(title=event.title)
+        self.slots: list[tuple[str, str]] = []
+        rendered = get_template(self.template_name).render({
+            'event': event,
+            'user': _RecipientPlaceholder('user', self.slots),
+            'registration': _RecipientPlaceholder('registration', self.slots),
+        })
+        self.chunks = rendered.split('\x00')
+
+    def _value(self, registration: EventRegistration, name: str, attr: str) -> str:
+        """
+        Resolve one per-recipient value the way the template would.
+        """
+        obj = registration.user if name == 'user' else registration
+        value = getattr(obj, attr)
+        if callable(value):
+            value = value()
+        return conditional_escape('' if value is None else value)
+
+    def render(self, registration: EventRegistration) -> str:
+        """
+        Return the HTML email for one registration to this event.
+        """
+        parts = []
+        for index, chunk in enumerate(self.chunks):
+            if index % 2:
+                name, attr = self.slots[int(chunk)]
+                parts.append(self._value(registration, name, attr))
+            else:
+                parts.append(chunk)
+        return ''.join(parts)
+
+
+class ReminderEmailRenderer(RegistrationEmailRenderer):
+    """
+    Render the reminder email of one event for many recipients.
+    """
+    template_name = REMINDER_TEMPLATE
+    subject_format = 'Event Reminder: {title}'
@@ -1,37 +1,100 @@
+import math
 from celery import shared_task
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from django.conf import settings
-from django.contrib.auth import get_user_model
-from events.models import Event, EventRegistration
+from core.outbox import enqueue_many
+from .batching import send_pending_registration_emails
+from .reminders import (
+    create_due_reminders, fan_out_reminder, pending_reminder_ids, send_reminder_batch,
+    unsent_batch_ids,
+)
 
-User = get_user_model()
 
 @shared_task
 def send_event_registration_email(user_id: int, event_id: int, registration_id: int) -> None:
     """
     Send an email to the user when they register for an event.
+
+    The email goes out with the next batch of pending confirmations, so a
+    burst of registrations is coalesced by whichever task runs first and
+    the remaining tasks find nothing left to send.
     """
     try:
-        user = User.objects.get(id=user_id)
-        event = Event.objects.get(id=event_id)
-        registration = EventRegistration.objects.get(id=registration_id)
-
-        subject = f'Event Registration Confirmation: {event.title}'
-        message = render_to_string('emails/event_registration.html', {
-            'user': user,
-            'event': event,
-            'registration': registration,
-        })
-
-        send_mail(
-            subject=subject,
-            message='',
-            html_message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
+        send_pending_registration_emails()
     except Exception as e:
         print(f"Error sending registration email: {str(e)}")
-        raise 
\ No newline at end of file
+        raise
+
+
+@shared_task
+def send_event_registration_emails(event_id: int, registration_ids: list[int]) -> None:
+    """
+    Send registration emails for a batch of registrations to one event.
+    """
+    try:
+        batches = math.ceil(len(registration_ids) / settings.NOTIFICATION_BATCH_SIZE)
+        send_pending_registration_emails(max_batches=max(batches, 1))
+    except Exception as e:
+        print(f"Error sending registration emails: {str(e)}")
+        raise
+
+
+@shared_task
+def flush_pending_registration_emails() -> None:
+    """
+    Periodically send every confirmation email still pending.
+    """
+    try:
+        send_pending_registration_emails(max_batches=None)
+    except Exception as e:
+        print(f"Error flushing registration emails: {str(e)}")
+        raise
+
+
+@shared_task
+def schedule_event_reminders() -> None:
+    """
+    Periodically create the reminders of events entering a lead time and
+    queue the fan-out of every reminder, and the send of every batch, still
+    outstanding.
+    """
+    try:
+        create_due_reminders()
+        for reminder_id in pending_reminder_ids():
+            fan_out_event_reminder.delay(reminder_id=reminder_id)
+        for batch_id in unsent_batch_ids():
+            send_event_reminder_batch.delay(batch_id=batch_id)
+    except Exception as e:
+        print(f"Error scheduling event reminders: {str(e)}")
+        raise
+
+
+@shared_task
+def fan_out_event_reminder(reminder_id: int) -> None:
+    """
+    Split a reminder's registrants into batches and queue a send task per batch.
+
+    The send tasks go through the outbox in the fan-out transaction, so
+    they are queued exactly when the batches are committed.
+    """
+    try:
+        fan_out_reminder(
+            reminder_id,
+            lambda batch_ids: enqueue_many(
+                send_event_reminder_batch, [{'batch_id': batch_id} for batch_id in batch_ids]
+            ),
+        )
+    except Exception as e:
+        print(f"Error fanning out reminder {reminder_id}: {str(e)}")
+        raise
+
+
+@shared_task
+def send_event_reminder_batch(batch_id: int) -> None:
+    """
+    Send the reminder emails of one batch of registrations.
+    """
+    try:
+        send_reminder_batch(batch_id)
+    except Exception as e:
+        print(f"Error sending reminder batch {batch_id}: {str(e)}")
+        raise
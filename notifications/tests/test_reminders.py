@@ -0,0 +1,91 @@
+import math
+from datetime import timedelta
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from core.models import OutboxMessage
+from core.testing import create_event, create_user
+from events.models import EventRegistration
+from notifications.batching import send_pending_registration_emails
+from notifications.models import EventReminder, ReminderBatch
+from notifications.reminders import create_due_reminders, send_reminder_batch
+from notifications.tasks import fan_out_event_reminder
+
+SEND_REMINDER_BATCH = 'notifications.tasks.send_event_reminder_batch'
+BATCH_SIZE = 4
+
+
+@override_settings(NOTIFICATION_BATCH_SIZE=BATCH_SIZE, EVENT_REMINDER_CHUNK_SIZE=8, EVENT_REMINDER_LEAD_HOURS=[24])
+class NotificationTests(TestCase):
+    """
+    Reminders fan out in batches, and every email goes out once, to active registrations only.
+    """
+    ATTENDEES = 10
+
+    def setUp(self) -> None:
+        """
+        Register ATTENDEES users and one cancelled user for an event starting in 12 hours.
+        """
+        cache.clear()
+        self.event = create_event(create_user('organizer'), date=timezone.now() + timedelta(hours=12), capacity=20)
+        self.registrations = [
+            EventRegistration.objects.create(event=self.event, user=create_user(f'attendee{i}'))
+            for i in range(self.ATTENDEES)
+        ]
+        EventRegistration.objects.create(event=self.event, user=create_user('cancelled'), status='cancelled')
+
+    def fan_out(self) -> EventReminder:
+        """
+        Create the event's reminder and fan it out.
+        """
+        self.assertEqual(create_due_reminders(), 1)
+        reminder = EventReminder.objects.get(event=self.event)
+        fan_out_event_reminder(reminder.id)
+        return reminder
+
+    def test_fan_out_queues_one_task_per_batch(self) -> None:
+        """
+        The fan-out writes ceil(n / batch size) batches and queues one send task for each.
+        """
+        reminder = self.fan_out()
+        batches = math.ceil(self.ATTENDEES / BATCH_SIZE)
+        batch_ids = list(reminder.batches.values_list('id', flat=True))
+        self.assertEqual(len(batch_ids), batches)
+        queued = OutboxMessage.objects.filter(task=SEND_REMINDER_BATCH).values_list('kwargs', flat=True)
+        self.assertEqual(sorted(kwargs['batch_id'] for kwargs in queued), sorted(batch_ids))
+
+    def test_repeated_fan_out_does_nothing(self) -> None:
+        """
+        A second fan-out of the same reminder creates no batches and queues no tasks.
+        """
+        reminder = self.fan_out()
+        fan_out_event_reminder(reminder.id)
+        self.assertEqual(create_due_reminders(), 0)
+        self.assertEqual(reminder.batches.count(), math.ceil(self.ATTENDEES / BATCH_SIZE))
+        self.assertEqual(OutboxMessage.objects.filter(task=SEND_REMINDER_BATCH).count(), reminder.batches.count())
+
+    def test_batches_are_sent_once_and_skip_cancelled(self) -> None:
+        """
+        Each batch is emailed once, leaving out registrations cancelled before or after the fan-out.
+        """
+        self.fan_out()
+        EventRegistration.objects.filter(pk=self.registrations[0].pk).update(status='cancelled')
+        batch_ids = ReminderBatch.objects.values_list('id', flat=True)
+        self.assertEqual(sum(send_reminder_batch(batch_id) for batch_id in batch_ids), self.ATTENDEES - 1)
+        self.assertEqual(sum(send_reminder_batch(batch_id) for batch_id in batch_ids), 0)
+        recipients = {message.to[0] for message in mail.outbox}
+        self.assertEqual(len(mail.outbox), self.ATTENDEES - 1)
+        self.assertNotIn('attendee0@example.com', recipients)
+        self.assertNotIn('cancelled@example.com', recipients)
+
+    def test_confirmations_are_sent_once_and_skip_cancelled(self) -> None:
+        """
+        Confirmation emails are marked sent, so a second run sends nothing, and skip cancelled registrations.
+        """
+        self.assertEqual(send_pending_registration_emails(max_batches=None), self.ATTENDEES)
+        self.assertEqual(send_pending_registration_emails(max_batches=None), 0)
+        self.assertNotIn('cancelled@example.com', {message.to[0] for message in mail.outbox})
+        self.assertFalse(
+            EventRegistration.objects.exclude(status='cancelled').filter(confirmation_sent_at=None).exists()
+        )
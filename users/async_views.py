@@ -0,0 +1,19 @@
+from django.http import HttpRequest, HttpResponse
+from rest_framework.request import Request
+from core.async_views import authenticate, database_slot, json_response
+from .cache import aget_cached_user
+from .serializers import UserSerializer
+
+
+async def me(request: HttpRequest) -> HttpResponse | None:
+    """
+    Serve the current user's profile without blocking a thread.
+    """
+    user = await authenticate(request)
+    if user is None:
+        return None
+    async with database_slot():
+        user = await aget_cached_user(user.id)
+    if user is None:
+        return None
+    return json_response(UserSerializer(user, context={'request': Request(request)}).data)
@@ -0,0 +1,120 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from .cache import get_cached_user
+
+User = get_user_model()
+
+# Claims CustomTokenObtainPairSerializer adds to every token; ClaimsUser reads them
+USER_CLAIMS = ('email', 'username', 'is_staff')
+
+
+def add_user_claims(token: Token, user: User) -> Token:
+    """
+    Add the claims a ClaimsUser is built from to token.
+    """
+    token['email'] = user.email
+    token['username'] = user.username
+    token['is_staff'] = user.is_staff
+    return token
+
+
+class ClaimsUser(TokenUser):
+    """
+    A user built from the claims of a validated access token.
+
+    Compares equal to the User row with the same id, so ownership checks
+    such as ``obj.user == request.user`` keep working. Claims are only as
+    fresh as the token, which lives ACCESS_TOKEN_LIFETIME.
+    """
+    @cached_property
+    def id(self) -> int:
+        """
+        Return the user id claim as a User primary key.
+
+        The claim is a string in the token; converting it keeps
+        ``request.user.id`` comparable with foreign key values.
+        """
+        return User._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def email(self) -> str:
+        """
+        Return the email claim.
+        """
+        return self.token.get('email', '')
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compare by user id with other ClaimsUsers and User rows.
+        """
+        if isinstance(other, User):
+            return self.id == other.pk
+        return super().__eq__(other)
+
+    __hash__ = TokenUser.__hash__
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that skips the user query where it can.
+
+    Safe requests get a ClaimsUser built from the token, or with tokens
+    issued without the user claims the User row from a short-lived cache
+    (USER_CACHE_TIMEOUT). Writes always load the User row from the
+    database: a cached row could be up to USER_CACHE_TIMEOUT old, and
+    saving it would undo changes made elsewhere (deactivation, password).
+    """
+    def authenticate(self, request: Request) -> tuple[User | ClaimsUser, Token] | None:
+        """
+        Authenticate the request from its Authorization header.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if request.method not in SAFE_METHODS:
+            return self.get_user(validated_token, cached=False), validated_token
+        user = self.get_claims_user(validated_token)
+        if user is not None:
+            return user, validated_token
+        return self.get_user(validated_token), validated_token
+
+    def get_claims_user(self, validated_token: Token) -> ClaimsUser | None:
+        """
+        Return a ClaimsUser if validated_token carries every user claim.
+        """
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            return None
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return None
+        return ClaimsUser(validated_token)
+
+    def get_user(self, validated_token: Token, cached: bool = True) -> User:
+        """
+        Return the User row the token was issued for, from the user cache
+        unless cached is False.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        user = get_cached_user(user_id) if cached else User.objects.filter(pk=user_id).first()
+        if user is None:
+            raise exceptions.AuthenticationFailed(_('User not found'), code='user_not_found')
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
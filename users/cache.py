@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+User = get_user_model()
+
+USER_KEY = 'users:{user_id}'
+
+
+def get_cached_user(user_id: int | str) -> User | None:
+    """
+    Return the user row with user_id, loading and caching it on a miss.
+    """
+    key = USER_KEY.format(user_id=user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.filter(pk=user_id).first()
+        if user is not None:
+            cache.set(key, user, timeout=settings.USER_CACHE_TIMEOUT)
+    return user
+
+
+async def aget_cached_user(user_id: int | str) -> User | None:
+    """
+    Async version of get_cached_user.
+    """
+    key = USER_KEY.format(user_id=user_id)
+    user = await cache.aget(key)
+    if user is None:
+        user = await User.objects.filter(pk=user_id).afirst()
+        if user is not None:
+            await cache.aset(key, user, timeout=settings.USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Drop the cached row of a user once the surrounding transaction commits.
+    """
+    transaction.on_commit(lambda: cache.delete(USER_KEY.format(user_id=user_id)))
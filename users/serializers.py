@@ -1,10 +1,16 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from core.serializers import SparseFieldsetMixin
+from .authentication import add_user_claims
+from .cache import get_cached_user
+from .tokens import CachedBlacklistRefreshToken
 
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the User model.
     """
@@ -50,12 +56,45 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return user
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = CachedBlacklistRefreshToken
+
     @classmethod
     def get_token(cls, user) -> dict:
         """
         Get a token for the user.
         """
-        token = super().get_token(user)
-        token['email'] = user.email
-        token['username'] = user.username
-        return token 
\ No newline at end of file
+        return add_user_claims(super().get_token(user), user)
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Rotate a refresh token with cached blacklist and user lookups.
+    """
+    token_class = CachedBlacklistRefreshToken
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Blacklist the refresh token and issue a new access/refresh pair.
+        """
+        refresh = self.token_class(attrs['refresh'])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None:
+            user = get_cached_user(user_id)
+            if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+                raise AuthenticationFailed(
+                    self.error_messages['no_active_account'],
+                    'no_active_account',
+                )
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+
+        return data
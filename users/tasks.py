@@ -0,0 +1,14 @@
+from celery import shared_task
+from .tokens import purge_expired_tokens as purge_tokens
+
+
+@shared_task
+def purge_expired_tokens() -> None:
+    """
+    Periodically delete expired outstanding and blacklisted tokens.
+    """
+    try:
+        purge_tokens()
+    except Exception as e:
+        print(f"Error purging expired tokens: {str(e)}")
+        raise
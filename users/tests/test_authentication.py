@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+from core.testing import api_client, create_user
+from users.authentication import ClaimsJWTAuthentication, ClaimsUser
+from users.serializers import CustomTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class ClaimsAuthenticationTests(TestCase):
+    """
+    Reads authenticate from token claims, writes from the current user row.
+    """
+    def setUp(self) -> None:
+        """
+        Create a user and cache their row through /api/users/me/.
+        """
+        cache.clear()
+        self.user = create_user('user', bio='Original bio')
+        self.client = api_client(self.user)
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 200)
+
+    def request(self, method: str):
+        """
+        Return a request of method carrying an access token of the user.
+        """
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        return getattr(APIRequestFactory(), method)('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def authenticate(self, request) -> User | ClaimsUser:
+        """
+        Return the user ClaimsJWTAuthentication resolves for request.
+        """
+        user, _ = ClaimsJWTAuthentication().authenticate(request)
+        return user
+
+    def test_reads_use_claims(self) -> None:
+        """
+        A read gets a ClaimsUser whose id is the integer primary key.
+        """
+        request = self.request('get')
+        with self.assertNumQueries(0):
+            user = self.authenticate(request)
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.id, self.user.pk)
+        self.assertEqual(user, self.user)
+
+    def test_writes_load_the_current_row(self) -> None:
+        """
+        A write sees changes made outside the API since the row was cached.
+        """
+        User.objects.filter(pk=self.user.pk).update(bio='Changed elsewhere')
+        user = self.authenticate(self.request('put'))
+        self.assertIsInstance(user, User)
+        self.assertEqual(user.bio, 'Changed elsewhere')
+
+    def test_deactivated_user_cannot_write(self) -> None:
+        """
+        A user deactivated outside the API is refused on writes at once.
+        """
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.put('/api/users/update_profile/', {'first_name': 'New'}, format='json')
+        self.assertEqual(response.status_code, 401)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+
+    def test_profile_update_keeps_changes_made_elsewhere(self) -> None:
+        """
+        Updating one field does not write back stale values of the others.
+        """
+        self.user.set_password('changed-password')
+        self.user.bio = 'Changed elsewhere'
+        self.user.save()
+        response = self.client.put('/api/users/update_profile/', {'first_name': 'New'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'New')
+        self.assertEqual(self.user.bio, 'Changed elsewhere')
+        self.assertTrue(self.user.check_password('changed-password'))
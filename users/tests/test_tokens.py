@@ -0,0 +1,66 @@
+from unittest import mock
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import TestCase
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from core.testing import create_user
+from users.tokens import CachedBlacklistRefreshToken, OutstandingTokenWriter, is_blacklisted
+
+
+class TokenStateTests(TestCase):
+    """
+    Blacklist checks and the bulk outstanding token writer.
+    """
+    def setUp(self) -> None:
+        """
+        Issue a refresh token, cached as outstanding.
+        """
+        cache.clear()
+        self.user = create_user('user')
+        self.token = CachedBlacklistRefreshToken.for_user(self.user)
+        self.jti = self.token[api_settings.JTI_CLAIM]
+
+    def blacklist_elsewhere(self) -> None:
+        """
+        Blacklist the token as another process would, leaving this cache stale.
+        """
+        state = cache.get(f'tokens:{self.jti}')
+        CachedBlacklistRefreshToken(str(self.token)).blacklist()
+        cache.set(f'tokens:{self.jti}', state)
+
+    def test_outstanding_rechecked_with_local_cache(self) -> None:
+        """
+        A per-process cache saying outstanding is checked against the blacklist table.
+        """
+        self.blacklist_elsewhere()
+        self.assertTrue(is_blacklisted(self.jti, self.token['exp']))
+
+    def test_outstanding_trusted_with_shared_cache(self) -> None:
+        """
+        A shared cache saying outstanding answers without a query.
+        """
+        with mock.patch('users.tokens.cache_is_shared', return_value=True), self.assertNumQueries(0):
+            self.assertFalse(is_blacklisted(self.jti, self.token['exp']))
+
+    def test_blacklisted_answered_from_cache(self) -> None:
+        """
+        A cached blacklisted state answers without a query.
+        """
+        CachedBlacklistRefreshToken(str(self.token)).blacklist()
+        with self.assertNumQueries(0):
+            self.assertTrue(is_blacklisted(self.jti, self.token['exp']))
+
+    def test_failed_flush_is_retried(self) -> None:
+        """
+        Rows that fail to insert stay buffered and are written by the next flush.
+        """
+        writer = OutstandingTokenWriter()
+        writer.add(self.token)
+        with mock.patch.object(OutstandingToken.objects, 'bulk_create', side_effect=DatabaseError('down')), \
+                mock.patch('builtins.print'):
+            writer.flush()
+        self.assertEqual(len(writer.pending), 1)
+        writer.flush()
+        self.assertEqual(writer.pending, [])
+        self.assertTrue(OutstandingToken.objects.filter(jti=self.jti).exists())
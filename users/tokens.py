@@ -0,0 +1,208 @@
+import atexit
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DatabaseError, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_from_epoch
+
+TOKEN_STATE_KEY = 'tokens:{jti}'
+OUTSTANDING = 'outstanding'
+BLACKLISTED = 'blacklisted'
+
+
+def _state_timeout(exp: int) -> int:
+    """
+    Return the seconds until a token expiring at exp can no longer be used.
+    """
+    return max(int(exp - time.time()), 1)
+
+
+def remember_token_state(jti: str, exp: int, state: str) -> None:
+    """
+    Record the blacklist state of a token in the cache until it expires.
+    """
+    cache.set(TOKEN_STATE_KEY.format(jti=jti), state, timeout=_state_timeout(exp))
+
+
+def cache_is_shared() -> bool:
+    """
+    Return True if the default cache is shared by every worker process.
+    """
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def is_blacklisted(jti: str, exp: int) -> bool:
+    """
+    Return True if the token with jti is blacklisted.
+
+    A cached blacklisted state answers without a query. A cached
+    outstanding state does too, but only when the cache is shared (Redis):
+    a per-process cache would not see a token rotated in another worker,
+    so there the blacklist table is checked. Misses (token issued before
+    the cache existed, evicted entry) are answered by the table, whose
+    answer is only cached with add(), so it cannot overwrite the state a
+    concurrent blacklist() has just written.
+    """
+    key = TOKEN_STATE_KEY.format(jti=jti)
+    state = cache.get(key)
+    if state == BLACKLISTED or (state == OUTSTANDING and cache_is_shared()):
+        return state == BLACKLISTED
+    if BlacklistedToken.objects.filter(token__jti=jti).exists():
+        cache.set(key, BLACKLISTED, timeout=_state_timeout(exp))
+        return True
+    cache.add(key, OUTSTANDING, timeout=_state_timeout(exp))
+    return False
+
+
+class OutstandingTokenWriter:
+    """
+    Buffer OutstandingToken rows and insert them in bulk.
+
+    Rows are written once TOKEN_WRITE_BATCH_SIZE are pending or the oldest
+    has waited TOKEN_WRITE_INTERVAL seconds, and at process exit. A batch
+    that fails to insert goes back to the buffer for the next flush. A row
+    lost with its process only drops the token from the admin listing:
+    blacklisting creates the row of a token it cannot find.
+    """
+    def __init__(self) -> None:
+        """
+        Start with an empty buffer.
+        """
+        self.pending = []
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+
+    def add(self, token: RefreshToken) -> None:
+        """
+        Queue the row of an issued refresh token.
+        """
+        row = OutstandingToken(
+            jti=token[api_settings.JTI_CLAIM],
+            user_id=token.get(api_settings.USER_ID_CLAIM),
+            token=str(token),
+            created_at=token.current_time,
+            expires_at=datetime_from_epoch(token['exp']),
+        )
+        with self.lock:
+            self.pending.append(row)
+            due = (
+                len(self.pending) >= settings.TOKEN_WRITE_BATCH_SIZE
+                or time.monotonic() - self.last_flush >= settings.TOKEN_WRITE_INTERVAL
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Insert every pending row.
+        """
+        with self.lock:
+            rows, self.pending = self.pending, []
+            self.last_flush = time.monotonic()
+        if not rows:
+            return
+        try:
+            with transaction.atomic():
+                OutstandingToken.objects.bulk_create(rows, ignore_conflicts=True)
+        except DatabaseError as e:
+            print(f"Error writing {len(rows)} outstanding tokens, retrying on the next flush: {str(e)}")
+            with self.lock:
+                self.pending[:0] = rows
+
+
+outstanding_tokens = OutstandingTokenWriter()
+atexit.register(outstanding_tokens.flush)
+
+
+class CachedBlacklistRefreshToken(RefreshToken):
+    """
+    Refresh token whose blacklist lookups go through the cache.
+
+    Rotation (blacklist the old token, outstand the new one) costs one
+    lookup and one insert instead of three user lookups and seven queries
+    on the token tables; the new token's row is written in bulk later.
+    """
+    @classmethod
+    def for_user(cls, user) -> 'CachedBlacklistRefreshToken':
+        """
+        Issue a token for user and record it as outstanding.
+        """
+        token = super().for_user(user)
+        remember_token_state(token[api_settings.JTI_CLAIM], token['exp'], OUTSTANDING)
+        return token
+
+    def check_blacklist(self) -> None:
+        """
+        Raise TokenError if this token is blacklisted.
+        """
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM], self.payload['exp']):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self) -> None:
+        """
+        Add this token to the blacklist.
+
+        The outstanding row is fetched, or created if the bulk writer has
+        not written it yet, and the blacklist row is inserted with ON
+        CONFLICT DO NOTHING, so blacklisting twice is a no-op.
+        """
+        jti = self.payload[api_settings.JTI_CLAIM]
+        exp = self.payload['exp']
+        token, _ = OutstandingToken.objects.get_or_create(
+            jti=jti,
+            defaults={
+                'user_id': self.payload.get(api_settings.USER_ID_CLAIM),
+                'created_at': self.current_time,
+                'token': str(self),
+                'expires_at': datetime_from_epoch(exp),
+            },
+        )
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token)], ignore_conflicts=True)
+        remember_token_state(jti, exp, BLACKLISTED)
+
+    def outstand(self) -> None:
+        """
+        Record this (newly rotated) token as outstanding.
+        """
+        remember_token_state(self.payload[api_settings.JTI_CLAIM], self.payload['exp'], OUTSTANDING)
+        outstanding_tokens.add(self)
+
+
+def purge_expired_tokens(batch_size: int = 1000) -> int:
+    """
+    Delete expired outstanding tokens and their blacklist entries.
+
+    Tokens are issued in id order with a fixed lifetime, so the expired
+    rows are the ones before the oldest live token. Only that range is
+    walked, in id chunks that each delete in a short transaction. Returns
+    the number of outstanding tokens deleted.
+    """
+    now = aware_utcnow()
+    expired = OutstandingToken.objects.filter(expires_at__lte=now)
+    oldest_live = (
+        OutstandingToken.objects.filter(expires_at__gt=now)
+        .order_by('id').values_list('id', flat=True).first()
+    )
+    if oldest_live is not None:
+        expired = expired.filter(id__lt=oldest_live)
+
+    deleted = last_id = 0
+    while True:
+        token_ids = list(
+            expired.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not token_ids:
+            return deleted
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=token_ids).delete()
+            OutstandingToken.objects.filter(id__in=token_ids).delete()
+        deleted += len(token_ids)
+        last_id = token_ids[-1]
@@ -2,23 +2,26 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.contrib.auth import get_user_model
 from rest_framework import permissions
 from rest_framework.request import Request
+from core.db_router import ReplicaReadsMixin
+from .cache import get_cached_user, invalidate_user
 from .serializers import (
     UserSerializer, 
     UserRegistrationSerializer,
-    CustomTokenObtainPairSerializer
+    CustomTokenObtainPairSerializer,
+    CustomTokenRefreshSerializer
 )
 
 User = get_user_model()
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ReplicaReadsMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing users.
     """
-    queryset = User.objects.all()
+    queryset = User.objects.order_by('id')
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
 
@@ -40,12 +43,30 @@ class UserViewSet(viewsets.ModelViewSet):
             return UserRegistrationSerializer
         return UserSerializer
 
+    def perform_update(self, serializer: UserSerializer) -> None:
+        """
+        Save the user and drop its cached row.
+        """
+        user = serializer.save()
+        invalidate_user(user.id)
+
+    def perform_destroy(self, instance: User) -> None:
+        """
+        Delete the user and drop its cached row.
+        """
+        user_id = instance.id
+        instance.delete()
+        invalidate_user(user_id)
+
     @action(detail=False, methods=['get'])
     def me(self, request: Request) -> Response:
         """
         Get the current user's profile.
+
+        request.user only carries the token claims on reads, so the full
+        row comes from the user cache.
         """
-        serializer = self.get_serializer(request.user)
+        serializer = self.get_serializer(get_cached_user(request.user.id))
         return Response(serializer.data)
 
     @action(detail=False, methods=['put'])
@@ -55,7 +76,7 @@ class UserViewSet(viewsets.ModelViewSet):
         """
         serializer = self.get_serializer(request.user, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            self.perform_update(serializer)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -63,4 +84,10 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     """
     View for obtaining a token pair.
     """
-    serializer_class = CustomTokenObtainPairSerializer 
\ No newline at end of file
+    serializer_class = CustomTokenObtainPairSerializer
+
+class CustomTokenRefreshView(TokenRefreshView):
+    """
+    View for refreshing a token pair.
+    """
+    serializer_class = CustomTokenRefreshSerializer